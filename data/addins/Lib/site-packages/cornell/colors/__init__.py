@@ -9,4 +9,5 @@ Date:   July 13, 2017 (Python 3 version)
 """
 from .models import RGB, HSV, CMYK
 from .constants import *
-from .tkcolor import is_tkcolor
\ No newline at end of file
+from .tkcolor import is_tkcolor
+from .glcolor import glcolor
\ No newline at end of file
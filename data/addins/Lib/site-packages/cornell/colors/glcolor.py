@@ -0,0 +1,71 @@
+"""
+Fast conversion of color values to OpenGL colors.
+
+Graphics libraries like Kivy want colors as 4 floats between 0 and 1.  Converting a
+color name means looking up its web color, parsing the hexadecimal string, building an
+RGB object and converting that.  The function in this module does this once per value
+and remembers the answer, so converting the same name (or tuple) again is a dictionary
+lookup.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+from .models import RGB, HSV
+from .tkcolor import TK_COLOR_MAP
+
+# The OpenGL colors of the strings and tuples converted so far
+_GLCOLOR_CACHE = {}
+
+# The most values to remember before starting over
+_GLCOLOR_CACHE_SIZE = 1024
+
+
+def glcolor(value):
+    """
+    Returns the OpenGL version of a color value.
+
+    The value may be the name of a TKinter color, a web color string (such as
+    ``'#FF0000'``), an :class:`RGB` or :class:`HSV` object, or a sequence of 3 or 4
+    numbers between 0 and 1.  A sequence of 3 numbers gets an alpha of 1.
+
+    Strings and sequences are only converted the first time they are seen.  RGB and
+    HSV objects are converted every time, since they can change.
+
+    :param value: the color value
+    :type value:  ``str``, :class:`RGB`, :class:`HSV`, or a sequence of numbers
+
+    :raise: ``ValueError`` if ``value`` is not a valid color.
+
+    :return: a 4 element tuple of the attributes in the range 0 to 1
+    :rtype:  ``tuple``
+    """
+    if type(value) in [RGB, HSV]:
+        return tuple(value.glColor())
+
+    try:
+        key = value if type(value) == str else tuple(value)
+        return _GLCOLOR_CACHE[key]
+    except KeyError:
+        pass
+    except TypeError:
+        raise ValueError('%s is not a valid color' % repr(value))
+
+    if type(key) == str:
+        web = key if key[:1] == '#' else TK_COLOR_MAP.get(key)
+        try:
+            assert len(web) == 7
+            result = tuple(int(web[pos:pos+2],16)/255.0 for pos in (1,3,5))+(1.0,)
+        except:
+            raise ValueError('%s is not a valid color' % repr(value))
+    else:
+        if not (3 <= len(key) <= 4 and
+                all(type(x) in [int, float] and 0 <= x <= 1 for x in key)):
+            raise ValueError('%s is not a valid color' % repr(value))
+        result = tuple(float(x) for x in key)
+        if len(result) == 3:
+            result += (1.0,)
+
+    if len(_GLCOLOR_CACHE) >= _GLCOLOR_CACHE_SIZE:
+        _GLCOLOR_CACHE.clear()
+    _GLCOLOR_CACHE[key] = result
+    return result
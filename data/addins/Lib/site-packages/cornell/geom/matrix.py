@@ -8,6 +8,7 @@ Author: Walker M. White (wmw2)
 Date:   July 13, 2017 (Python 3 version)
 """
 import numpy as np
+import math
 
 
 class Matrix(object):
@@ -84,6 +85,60 @@ class Matrix(object):
         result.scale(x,y,z)
         return result
     
+    @classmethod
+    def CreateTRS(cls,x=0,y=0,ang=0,sx=1,sy=1):
+        """
+        Creates the matrix that scales, then rotates, then translates.
+        
+        This is the same as ``CreateTranslation(x,y).rotate(ang).scale(sx,sy)``, but it 
+        is computed directly.  The rotation is about the z-axis.  See :meth:`set_trs`.
+        
+        :param x: x-coordinate of translation (default 0)
+        :type x:  ``int`` or ``float``
+        
+        :param y: y-coordinate of translation (default 0)
+        :type y:  ``int`` or ``float``
+        
+        :param ang: angle of rotation in degrees (default 0)
+        :type ang:  ``int`` or ``float``
+        
+        :param sx: x-coordinate of the scale (default 1)
+        :type sx:  ``int`` or ``float``
+        
+        :param sy: y-coordinate of the scale (default 1)
+        :type sy:  ``int`` or ``float``
+        """
+        result = cls()
+        result.set_trs(x,y,ang,sx,sy)
+        return result
+    
+    @classmethod
+    def CreateTRSInverse(cls,x=0,y=0,ang=0,sx=1,sy=1):
+        """
+        Creates the inverse of the matrix made by :meth:`CreateTRS`.
+        
+        The inverse is computed directly, without a general matrix inversion.  See 
+        :meth:`set_trs_inverse`.
+        
+        :param x: x-coordinate of translation (default 0)
+        :type x:  ``int`` or ``float``
+        
+        :param y: y-coordinate of translation (default 0)
+        :type y:  ``int`` or ``float``
+        
+        :param ang: angle of rotation in degrees (default 0)
+        :type ang:  ``int`` or ``float``
+        
+        :param sx: x-coordinate of the scale (default 1)
+        :type sx:  ``int`` or ``float`` != 0
+        
+        :param sy: y-coordinate of the scale (default 1)
+        :type sy:  ``int`` or ``float`` != 0
+        """
+        result = cls()
+        result.set_trs_inverse(x,y,ang,sx,sy)
+        return result
+    
     def __str__(self):
         """
         :return: A readable string representation of this matrix.
@@ -188,12 +243,9 @@ class Matrix(object):
         
         :return: This object, newly modified
         """
-        r = np.identity(4, dtype=np.float32)
-        r[0,3] = x
-        r[1,3] = y
-        r[2,3] = z
-        tmp = np.dot(self._data,r)
-        np.copyto(self._data,tmp)
+        # Only the last column changes
+        d = self._data
+        d[:,3] += d[:,0]*x+d[:,1]*y+d[:,2]*z
         return self
     
     def rotate(self,ang=0,x=0,y=0,z=1):
@@ -250,12 +302,83 @@ class Matrix(object):
         
         :return: This object, newly modified
         """
-        s = np.identity(4, dtype=np.float32)
-        s[0,0] = x
-        s[1,1] = y
-        s[2,2] = z
-        tmp = np.dot(self._data,s)
-        np.copyto(self._data,tmp)
+        # Each of the first three columns is scaled by its own amount
+        d = self._data
+        d[:,0] *= x
+        d[:,1] *= y
+        d[:,2] *= z
+        return self
+    
+    def set_trs(self,x=0,y=0,ang=0,sx=1,sy=1):
+        """
+        Sets this matrix (in place) to scale, then rotate, then translate.
+        
+        The result is the same as resetting to the identity and calling 
+        ``translate(x,y)``, ``rotate(ang)`` and ``scale(sx,sy)`` in that order.  But it 
+        is a single write into this matrix, with no temporary matrices.  This is the 
+        common transform of a 2d graphics object.  The rotation is about the z-axis.
+        
+        This method will modify the attributes of this oject. This method returns this
+        object for chaining.
+        
+        :param x: x-coordinate of translation (default 0)
+        :type x:  ``int`` or ``float``
+        
+        :param y: y-coordinate of translation (default 0)
+        :type y:  ``int`` or ``float``
+        
+        :param ang: angle of rotation in degrees (default 0)
+        :type ang:  ``int`` or ``float``
+        
+        :param sx: x-coordinate of the scale (default 1)
+        :type sx:  ``int`` or ``float``
+        
+        :param sy: y-coordinate of the scale (default 1)
+        :type sy:  ``int`` or ``float``
+        
+        :return: This object, newly modified
+        """
+        c = math.cos(math.radians(ang))
+        s = math.sin(math.radians(ang))
+        self._data[:] = ((c*sx, -s*sy, 0, x),
+                         (s*sx,  c*sy, 0, y),
+                         (0, 0, 1, 0),
+                         (0, 0, 0, 1))
+        return self
+    
+    def set_trs_inverse(self,x=0,y=0,ang=0,sx=1,sy=1):
+        """
+        Sets this matrix (in place) to the inverse of :meth:`set_trs`.
+        
+        The inverse undoes the translation, then the rotation, then the scale.  It is
+        computed directly, which is much faster than :meth:`invert`.
+        
+        This method will modify the attributes of this oject. This method returns this
+        object for chaining.
+        
+        :param x: x-coordinate of translation (default 0)
+        :type x:  ``int`` or ``float``
+        
+        :param y: y-coordinate of translation (default 0)
+        :type y:  ``int`` or ``float``
+        
+        :param ang: angle of rotation in degrees (default 0)
+        :type ang:  ``int`` or ``float``
+        
+        :param sx: x-coordinate of the scale (default 1)
+        :type sx:  ``int`` or ``float`` != 0
+        
+        :param sy: y-coordinate of the scale (default 1)
+        :type sy:  ``int`` or ``float`` != 0
+        
+        :return: This object, newly modified
+        """
+        c = math.cos(math.radians(ang))
+        s = math.sin(math.radians(ang))
+        self._data[:] = (( c/sx, s/sx, 0, -(c*x+s*y)/sx),
+                         (-s/sy, c/sy, 0,  (s*x-c*y)/sy),
+                         (0, 0, 1, 0),
+                         (0, 0, 0, 1))
         return self
     
     def _transform(self,x=0,y=0,z=0):
@@ -278,7 +401,49 @@ class Matrix(object):
         """
         b = np.array([x,y,z,1], dtype=np.float32)
         tmp = np.dot(self._data,b)
-        return map(float,tuple(tmp[:-1]))
+        return tuple(map(float,tmp[:-1]))
+    
+    def transform_points(self,points,out=None):
+        """
+        Transforms many points by this matrix at once.
+        
+        The points may be given as an (N,2) or (N,3) NumPy array, with one point per row.
+        They may also be given as a flat sequence (list, tuple or 1-dimensional array)
+        of 2d coordinates ``x0, y0, x1, y1, ...``, such as the points of a path.  Points
+        in 2d are assumed to have a z-coordinate of 0.
+        
+        The result is an array with the same shape as ``points``.  If ``out`` is given, 
+        the result is written into it and no new array is made.  The array ``out`` may
+        be ``points`` itself, which transforms the points in place.
+        
+        :param points: the points to transform
+        :type points:  NumPy array or sequence of ``int`` or ``float``
+        
+        :param out: an array for the result (default None)
+        :type out:  NumPy float array with the same shape as ``points``, or ``None``
+        
+        :return: The points transformed by this matrix
+        :rtype:  NumPy array
+        """
+        points = np.asarray(points)
+        if points.ndim == 1:
+            assert len(points) % 2 == 0, '%s does not have an even length' % repr(points)
+            coords = points.reshape(-1,2)
+        else:
+            assert points.ndim == 2 and points.shape[1] in (2,3), \
+                '%s is not an array of 2d or 3d points' % repr(points)
+            coords = points
+        
+        if out is None:
+            out = np.empty(points.shape,dtype=np.result_type(points.dtype,np.float32))
+        assert out.shape == points.shape, '%s does not have shape %s' % (repr(out),points.shape)
+        result = out.reshape(coords.shape)
+        assert np.shares_memory(result,out), '%s is not contiguous' % repr(out)
+        
+        size = coords.shape[1]
+        np.matmul(coords,self._data[:size,:size].T,out=result)
+        result += self._data[:size,3]
+        return out
     
     def transform(self,value):
         """
@@ -288,14 +453,19 @@ class Matrix(object):
         :class:`Point3`, :class:`Vector2`, and :class:`Vector3`.  The value returned
         will have the same type as ``value``.
         
+        Value can also be an array or sequence of many points, in which case this method
+        is the same as :meth:`transform_points`.
+        
         :param value: the object to transform
-        :type value:  point or vector
+        :type value:  point or vector, or an array of points
         
         :return: The value  transformed by this matrix
-        :rtype:  ``type(value)``
+        :rtype:  ``type(value)``, or a NumPy array for an array of points
         
         """
         from .tuple import Tuple2, Tuple3
+        if isinstance(value,(np.ndarray,list,tuple)):
+            return self.transform_points(value)
         if isinstance(value,Tuple2):
             b = np.array([value.x,value.y,0,1], dtype=np.float32)
             tmp = np.dot(self._data,b)
@@ -24,6 +24,8 @@ class Point2(Tuple2):
     :vartype y: ``float``
     """
     
+    __slots__ = ()
+    
     # BUILT_IN METHODS
     def __init__(self, x=0, y=0):
         """
@@ -57,15 +59,9 @@ class Point2(Tuple2):
         """
         from .vector import Vector2
         if isinstance(other,Point2):
-            result = self.toVector()
-        elif isinstance(other,Vector2):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x += other.x
-        result.y += other.y
-        return result
+            return Vector2._make(self._x+other._x, self._y+other._y)
+        assert isinstance(other,Vector2), "%s is not a valid value" % repr(other)
+        return self._make(self._x+other._x, self._y+other._y)
     
     def __sub__(self, tail):
         """
@@ -82,16 +78,10 @@ class Point2(Tuple2):
         :rtype:  ``Point2`` or ``Vector2``
         """
         from .vector import Vector2
-        if isinstance(other,Point2):
-            result = self.toVector()
-        elif isinstance(other,Vector2):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x += other.x
-        result.y -= other.y
-        return result
+        if isinstance(tail,Point2):
+            return Vector2._make(self._x-tail._x, self._y-tail._y)
+        assert isinstance(tail,Vector2), "%s is not a valid value" % repr(tail)
+        return self._make(self._x-tail._x, self._y-tail._y)
     
     # PUBLIC METHODS
     def toVector(self):
@@ -100,7 +90,7 @@ class Point2(Tuple2):
         :rtype:  ``Vector2``
         """
         from .vector import Vector2
-        return Vector2(self.x,self.y)
+        return Vector2._make(self._x,self._y)
     
     def midpoint(self,other):
         """
@@ -165,6 +155,8 @@ class Point3(Tuple3):
     :vartype z: ``float``
     """
     
+    __slots__ = ()
+    
     # BUILT_IN METHODS
     def __init__(self, x=0, y=0, z=0):
         """
@@ -201,16 +193,9 @@ class Point3(Tuple3):
         """
         from .vector import Vector3
         if isinstance(other,Point3):
-            result = self.toVector()
-        elif isinstance(other,Vector2):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x += other.x
-        result.y += other.y
-        result.z += other.z
-        return result
+            return Vector3._make(self._x+other._x, self._y+other._y, self._z+other._z)
+        assert isinstance(other,Vector3), "%s is not a valid value" % repr(other)
+        return self._make(self._x+other._x, self._y+other._y, self._z+other._z)
     
     def __sub__(self, tail):
         """
@@ -227,17 +212,10 @@ class Point3(Tuple3):
         :rtype:  ``Point3`` or ``Vector3``
         """
         from .vector import Vector3
-        if isinstance(other,Point2):
-            result = self.toVector()
-        elif isinstance(other,Vector3):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x -= other.x
-        result.y -= other.y
-        result.z -= other.z
-        return result
+        if isinstance(tail,Point3):
+            return Vector3._make(self._x-tail._x, self._y-tail._y, self._z-tail._z)
+        assert isinstance(tail,Vector3), "%s is not a valid value" % repr(tail)
+        return self._make(self._x-tail._x, self._y-tail._y, self._z-tail._z)
     
     # PUBLIC METHODS
     def toVector(self):
@@ -246,7 +224,7 @@ class Point3(Tuple3):
         :rtype:  ``Vector3``
         """
         from .vector import Vector3
-        return Vector3(self.x,self.y,self.z)
+        return Vector3._make(self._x,self._y,self._z)
     
     def midpoint(self,other):
         """
@@ -19,6 +19,8 @@ class Tuple2(object):
     :vartype y: ``float``
     """
     
+    __slots__ = ('_x','_y')
+    
     # MUTABLE ATTRIBUTES
     @property
     def x(self):
@@ -67,6 +69,27 @@ class Tuple2(object):
         self.x = x
         self.y = y
     
+    @classmethod
+    def _make(cls, x, y):
+        """
+        Creates a new value without checking or converting the coordinates.
+        
+        This is the constructor for results of operations, whose coordinates are 
+        known to be floats.  It skips the type conversion of the attribute setters.
+        
+        :return: a new value (x,y) of this class.
+        
+        :param x: initial x value
+        :type x:  ``float``
+        
+        :param y: initial y value
+        :type y:  ``float``
+        """
+        result = cls.__new__(cls)
+        result._x = x
+        result._y = y
+        return result
+    
     def __str__(self):
         """
         :return: A readable string representation of this object. 
@@ -217,10 +240,7 @@ class Tuple2(object):
         :rtype:  ``type(self)``
         """
         assert isinstance(other,type(self)), "%s is not of type %s" % (repr(other), repr(type(self)))
-        result = self.copy()
-        result.x += other.x
-        result.y += other.y
-        return result
+        return self._make(self._x+other._x, self._y+other._y)
     
     def __iadd__(self, other):
         """
@@ -254,10 +274,7 @@ class Tuple2(object):
         :rtype:  ``type(self)``
         """
         assert isinstance(other,type(self)), "%s is not of type %s" % (repr(other), repr(type(self)))
-        result = self.copy()
-        result.x -= other.x
-        result.y -= other.y
-        return result
+        return self._make(self._x-other._x, self._y-other._y)
     
     def __isub__(self, other):
         """
@@ -296,10 +313,22 @@ class Tuple2(object):
         """
         from .matrix import Matrix
         assert isinstance(matrix,Matrix), "%s is not a matrix" % repr(matrix)
-        b = np.array([self.x,self.y,0,1], dtype=np.float32)
-        tmp = np.dot(matrix._data,b)
-        self.x = float(tmp[0])
-        self.y = float(tmp[1])
+        self._x, self._y = self._transformed_(matrix)
+    
+    def _transformed_(self,matrix):
+        """
+        Returns the coordinates of this object transformed by a matrix
+        
+        :param matrix: matrix to transform with
+        :type matrix:  :class:`Matrix`
+        
+        :return: the transformed coordinates
+        :rtype:  ``tuple`` of ``float``
+        """
+        m = matrix._data
+        x = self._x
+        y = self._y
+        return (float(m[0,0]*x+m[0,1]*y+m[0,3]), float(m[1,0]*x+m[1,1]*y+m[1,3]))
     
     def __mul__(self, value):
         """
@@ -320,15 +349,11 @@ class Tuple2(object):
         :rtype:  ``type(self)``
         """
         from .matrix import Matrix
-        result = self.copy()
         if type(value) in [int,float]:
-            result._imul_scalar_(value)
-        elif isinstance(value,Matrix):
-            result._imul_matrix_(value)
-        else:
-            assert False, "%s is not a valid value" % repr(value)
+            return self._make(*[value*x for x in self.list()])
         
-        return result
+        assert isinstance(value,Matrix), "%s is not a valid value" % repr(value)
+        return self._make(*self._transformed_(value))
     
     def __imul__(self, value):
         """
@@ -347,9 +372,10 @@ class Tuple2(object):
         
         :return: This object, newly modified
         """
+        from .matrix import Matrix
         if type(value) in [int,float]:
             self._imul_scalar_(value)
-        elif isinstance(value,GMatrix):
+        elif isinstance(value,Matrix):
             self._imul_matrix_(value)
         else:
             assert False, "%s is not a valid value" % repr(value)
@@ -370,7 +396,7 @@ class Tuple2(object):
         :return: the scalar multiple of ``self`` and ``scalar``
         :rtype:  ``type(self)``
         """
-        return self._mul_scalar_(scalar)
+        return self * scalar
     
     def __truediv__(self, scalar):
         """
@@ -387,10 +413,7 @@ class Tuple2(object):
         :rtype:  ``type(self)``
         """
         assert type(scalar) in [int,float], "%s is not a number" % repr(scalar)
-        result = self.copy()
-        result.x /= scalar
-        result.y /= scalar
-        return result
+        return self._make(self._x/scalar, self._y/scalar)
     
     def __itruediv__(self, scalar):
         """
@@ -485,8 +508,29 @@ class Tuple2(object):
         :return: A copy of this tuple
         :rtype:  ``type(self)``
         """
-        import copy
-        return copy.copy(self)
+        return self._make(self._x, self._y)
+    
+    def freeze(self):
+        """
+        Returns an immutable copy of this tuple.
+        
+        The copy is an instance of a subclass of ``type(self)``, so it has all of the 
+        same methods.  But it cannot be changed, and so it can be hashed (e.g. used as a 
+        key in a dictionary).  See :class:`Frozen`.
+        
+        :return: An immutable copy of this tuple
+        :rtype:  a subclass of ``type(self)``
+        """
+        if isinstance(self,Frozen):
+            return self
+        return _frozen_type(type(self))._make(self._x, self._y)
+    
+    def thaw(self):
+        """
+        :return: A mutable copy of this tuple (the opposite of :meth:`freeze`)
+        :rtype:  ``type(self)``
+        """
+        return self.copy()
     
     def list(self):
         """
@@ -548,6 +592,8 @@ class Tuple3(object):
     :vartype z: ``float``
     """
     
+    __slots__ = ('_x','_y','_z')
+    
     # MUTABLE ATTRIBUTES
     @property
     def x(self):
@@ -614,6 +660,31 @@ class Tuple3(object):
         self.y = y
         self.z = z
     
+    @classmethod
+    def _make(cls, x, y, z):
+        """
+        Creates a new value without checking or converting the coordinates.
+        
+        This is the constructor for results of operations, whose coordinates are 
+        known to be floats.  It skips the type conversion of the attribute setters.
+        
+        :return: a new value (x,y,z) of this class.
+        
+        :param x: initial x value
+        :type x:  ``float``
+        
+        :param y: initial y value
+        :type y:  ``float``
+        
+        :param z: initial z value
+        :type z:  ``float``
+        """
+        result = cls.__new__(cls)
+        result._x = x
+        result._y = y
+        result._z = z
+        return result
+    
     def __str__(self):
         """
         :return: A readable string representation of this object. 
@@ -749,11 +820,7 @@ class Tuple3(object):
         :rtype:  ``type(self)``
         """
         assert isinstance(other,type(self)), "%s is not of type %s" % (repr(other), repr(type(self)))
-        result = self.copy()
-        result.x += other.x
-        result.y += other.y
-        result.z += other.z
-        return result
+        return self._make(self._x+other._x, self._y+other._y, self._z+other._z)
     
     def __iadd__(self, other):
         """
@@ -788,11 +855,7 @@ class Tuple3(object):
         :rtype:  ``type(self)``
         """
         assert isinstance(other,type(self)), "%s is not of type %s" % (repr(other), repr(type(self)))
-        result = self.copy()
-        result.x -= other.x
-        result.y -= other.y
-        result.z -= other.z
-        return result
+        return self._make(self._x-other._x, self._y-other._y, self._z-other._z)
     
     def __isub__(self, other):
         """
@@ -833,11 +896,25 @@ class Tuple3(object):
         """
         from .matrix import Matrix
         assert isinstance(matrix,Matrix), "%s is not a matrix" % repr(matrix)
-        b = np.array([self.x,self.y,self.z,1], dtype=np.float32)
-        tmp = np.dot(matrix._data,b)
-        self.x = float(tmp[0])
-        self.y = float(tmp[1])
-        self.z = float(tmp[2])
+        self._x, self._y, self._z = self._transformed_(matrix)
+    
+    def _transformed_(self,matrix):
+        """
+        Returns the coordinates of this object transformed by a matrix
+        
+        :param matrix: matrix to transform with
+        :type matrix:  :class:`Matrix`
+        
+        :return: the transformed coordinates
+        :rtype:  ``tuple`` of ``float``
+        """
+        m = matrix._data
+        x = self._x
+        y = self._y
+        z = self._z
+        return (float(m[0,0]*x+m[0,1]*y+m[0,2]*z+m[0,3]),
+                float(m[1,0]*x+m[1,1]*y+m[1,2]*z+m[1,3]),
+                float(m[2,0]*x+m[2,1]*y+m[2,2]*z+m[2,3]))
     
     def __mul__(self, value):
         """
@@ -858,15 +935,11 @@ class Tuple3(object):
         :rtype:  ``type(self)``
         """
         from .matrix import Matrix
-        result = self.copy()
         if type(value) in [int,float]:
-            result._imul_scalar_(value)
-        elif isinstance(value,Matrix):
-            result._imul_matrix_(value)
-        else:
-            assert False, "%s is not a valid value" % repr(value)
+            return self._make(*[value*x for x in self.list()])
         
-        return result
+        assert isinstance(value,Matrix), "%s is not a valid value" % repr(value)
+        return self._make(*self._transformed_(value))
     
     def __imul__(self, value):
         """
@@ -885,9 +958,10 @@ class Tuple3(object):
         
         :return: This object, newly modified
         """
+        from .matrix import Matrix
         if type(value) in [int,float]:
             self._imul_scalar_(value)
-        elif isinstance(value,GMatrix):
+        elif isinstance(value,Matrix):
             self._imul_matrix_(value)
         else:
             assert False, "%s is not a valid value" % repr(value)
@@ -908,7 +982,7 @@ class Tuple3(object):
         :return: the scalar multiple of ``self`` and ``scalar``
         :rtype:  ``type(self)``
         """
-        return self._mul_scalar_(scalar)
+        return self * scalar
     
     def __truediv__(self, scalar):
         """
@@ -925,11 +999,7 @@ class Tuple3(object):
         :rtype:  ``type(self)``
         """
         assert type(scalar) in [int,float], "%s is not a number" % repr(scalar)
-        result = self.copy()
-        result.x /= scalar
-        result.y /= scalar
-        result.z /= scalar
-        return result
+        return self._make(self._x/scalar, self._y/scalar, self._z/scalar)
     
     def __itruediv__(self, scalar):
         """
@@ -1026,8 +1096,29 @@ class Tuple3(object):
         :return: A copy of this tuple
         :rtype:  ``type(self)``
         """
-        import copy
-        return copy.copy(self)
+        return self._make(self._x, self._y, self._z)
+    
+    def freeze(self):
+        """
+        Returns an immutable copy of this tuple.
+        
+        The copy is an instance of a subclass of ``type(self)``, so it has all of the 
+        same methods.  But it cannot be changed, and so it can be hashed (e.g. used as a 
+        key in a dictionary).  See :class:`Frozen`.
+        
+        :return: An immutable copy of this tuple
+        :rtype:  a subclass of ``type(self)``
+        """
+        if isinstance(self,Frozen):
+            return self
+        return _frozen_type(type(self))._make(self._x, self._y, self._z)
+    
+    def thaw(self):
+        """
+        :return: A mutable copy of this tuple (the opposite of :meth:`freeze`)
+        :rtype:  ``type(self)``
+        """
+        return self.copy()
     
     def list(self):
         """
@@ -1076,3 +1167,120 @@ class Tuple3(object):
 
 # Make 3-dimensions the default
 Tuple = Tuple3
+
+
+# #mark -
+class Frozen(object):
+    """
+    A mixin that makes a point or vector class immutable and hashable.
+    
+    You do not use this class directly.  Instead, call the method ``freeze`` on a point 
+    or vector to get an immutable copy.  That copy is an instance of a subclass of the 
+    original class (e.g. ``FrozenPoint2`` for a :class:`Point2`), so it can be used 
+    anywhere that the original can.
+    
+    The coordinates of a frozen value are set once, when it is created.  In-place 
+    operations like ``+=`` make a new value instead of changing it, just as they do for
+    the built-in ``tuple``.  Methods that change the value in place raise an error.
+    
+    Frozen values compare with exact equality, as equal values must have the same hash.
+    They are equal to mutable values of the same class with the same coordinates.
+    """
+    __slots__ = ()
+    
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute only if it has not been set before.
+        
+        :raise: ``AttributeError`` if the attribute is already set
+        """
+        if hasattr(self,name):
+            raise AttributeError('%s is immutable' % repr(self))
+        object.__setattr__(self,name,value)
+    
+    def __eq__(self, other):
+        """
+        :return: True if ``other`` is the same kind of value with the same coordinates
+        :rtype:  ``bool``
+        """
+        return isinstance(other,self._thawed) and self.list() == other.list()
+    
+    def __ne__(self, other):
+        """
+        :return: False if ``other`` is the same kind of value with the same coordinates
+        :rtype:  ``bool``
+        """
+        return not self == other
+    
+    def __hash__(self):
+        """
+        :return: A hash of this value and its class
+        :rtype:  ``int``
+        """
+        return hash((self._thawed,)+tuple(self.list()))
+    
+    def __iadd__(self, other):
+        return self+other
+    
+    def __isub__(self, other):
+        return self-other
+    
+    def __imul__(self, value):
+        return self*value
+    
+    def __itruediv__(self, scalar):
+        return self/scalar
+    
+    def thaw(self):
+        """
+        :return: A mutable copy of this value
+        :rtype:  the class that this value was frozen from
+        """
+        return self._thawed._make(*self.list())
+    
+    def __reduce__(self):
+        """
+        :return: How to rebuild this value when it is unpickled
+        :rtype:  ``tuple``
+        
+        The frozen classes are made at runtime, so pickle cannot find them by name.  
+        Instead, the value is rebuilt by freezing a value of the original class.
+        """
+        return (_refreeze,(self._thawed,tuple(self.list())))
+
+
+# The frozen subclass of each class, made the first time that it is needed
+_FROZEN_TYPES = {}
+
+def _frozen_type(cls):
+    """
+    Returns the frozen subclass of a point or vector class.
+    
+    :param cls: the class to freeze
+    :type cls:  a subclass of :class:`Tuple2` or :class:`Tuple3`
+    
+    :return: the frozen subclass of ``cls``
+    :rtype:  ``type``
+    """
+    try:
+        return _FROZEN_TYPES[cls]
+    except KeyError:
+        frozen = type('Frozen'+cls.__name__,(Frozen,cls),{'__slots__':(),'_thawed':cls,
+                                                        '__module__':cls.__module__})
+        _FROZEN_TYPES[cls] = frozen
+        return frozen
+
+def _refreeze(cls,coords):
+    """
+    Returns a frozen value, for unpickling.
+    
+    :param cls: the class the value was frozen from
+    :type cls:  a subclass of :class:`Tuple2` or :class:`Tuple3`
+    
+    :param coords: the coordinates of the value
+    :type coords:  ``tuple`` of numbers
+    
+    :return: the frozen value
+    :rtype:  the frozen subclass of ``cls``
+    """
+    return cls._make(*coords).freeze()
@@ -24,6 +24,8 @@ class Vector2(Tuple2):
     :vartype y: ``float``
     """
     
+    __slots__ = ()
+    
     # BUILT-IN METHODS
     def __init__(self, x=0, y=0):
         """
@@ -63,15 +65,9 @@ class Vector2(Tuple2):
         """
         from .point import Point2
         if isinstance(other,Point2):
-            result = self.toPoint()
-        elif isinstance(other,Vector2):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x += other.x
-        result.y += other.y
-        return result
+            return Point2._make(self._x+other._x, self._y+other._y)
+        assert isinstance(other,Vector2), "%s is not a valid value" % repr(other)
+        return self._make(self._x+other._x, self._y+other._y)
     
     def __sub__(self, tail):
         """
@@ -87,16 +83,10 @@ class Vector2(Tuple2):
         :rtype:  ``Point2`` or ``Vector2``
         """
         from .point import Point2
-        if isinstance(other,Point2):
-            result = self.toPoint()
-        elif isinstance(other,Vector2):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x -= other.x
-        result.y -= other.y
-        return result
+        if isinstance(tail,Point2):
+            return Point2._make(self._x-tail._x, self._y-tail._y)
+        assert isinstance(tail,Vector2), "%s is not a valid value" % repr(tail)
+        return self._make(self._x-tail._x, self._y-tail._y)
     
     
     # PUBLIC METHODS
@@ -106,7 +96,7 @@ class Vector2(Tuple2):
         :rtype:  ``Point2``
         """
         from .point import Point2
-        return Point2(self.x,self.y)
+        return Point2._make(self._x,self._y)
     
     def length(self):
         """
@@ -189,7 +179,7 @@ class Vector2(Tuple2):
             return 0
         return math.acos(self.dot(other)/(na*nb))
     
-    def rotate(angle):
+    def rotate(self,angle):
         """
         Rotates this vector by the angle (in radians) around the origin in place
         
@@ -205,13 +195,13 @@ class Vector2(Tuple2):
         :return: This object, newly modified
         """
         assert type(angle) in [int,float], "%s is not a number" % repr(angle)
+        a = math.radians(angle)
         ca = math.cos(a)
         cb = math.sin(a)
-        self.x = self.x*ca - self.y*cb
-        self.y = self.x*cb + self.y*ca
+        self.x, self.y = self._x*ca - self._y*cb, self._x*cb + self._y*ca
         return self
     
-    def rotation(angle):
+    def rotation(self,angle):
         """
         Rotates this vector by the angle (in radians) around the origin, producing a new object
         
@@ -229,12 +219,10 @@ class Vector2(Tuple2):
         :rtype:  ``type(self)``
         """
         assert type(angle) in [int,float], "%s is not a number" % repr(angle)
+        a = math.radians(angle)
         ca = math.cos(a)
         cb = math.sin(a)
-        result = self.copy()
-        result.x = self.x*ca - self.y*cb
-        result.y = self.x*cb + self.y*ca
-        return result
+        return self._make(self._x*ca - self._y*cb, self._x*cb + self._y*ca)
     
     def dot(self,other):
         """
@@ -273,10 +261,7 @@ class Vector2(Tuple2):
         :return: a 2D vector perpendicular to this one
         :rtype:  ``type(self)``
         """
-        result = self.copy()
-        result.x = self.y
-        result.y = -self.x
-        return result
+        return self._make(self._y, -self._x)
     
     def rperp(self):
         """
@@ -287,10 +272,7 @@ class Vector2(Tuple2):
         :return: a 2D vector perpendicular to this one
         :rtype:  ``type(self)``
         """
-        result = self.copy()
-        result.x = -self.y
-        result.y = self.x
-        return result
+        return self._make(-self._y, self._x)
     
     def project(self,other):
         """
@@ -348,6 +330,8 @@ class Vector3(Tuple3):
     :vartype z: ``float``
     """
     
+    __slots__ = ()
+    
     # BUILT-IN METHODS
     def __init__(self, x=0, y=0, z=0):
         """
@@ -391,16 +375,9 @@ class Vector3(Tuple3):
         """
         from .point import Point3
         if isinstance(other,Point3):
-            result = self.toPoint()
-        elif isinstance(other,Vector3):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x += other.x
-        result.y += other.y
-        result.z += other.z
-        return result
+            return Point3._make(self._x+other._x, self._y+other._y, self._z+other._z)
+        assert isinstance(other,Vector3), "%s is not a valid value" % repr(other)
+        return self._make(self._x+other._x, self._y+other._y, self._z+other._z)
     
     def __sub__(self, tail):
         """
@@ -416,17 +393,10 @@ class Vector3(Tuple3):
         :rtype:  ``Point3`` or ``Vector3``
         """
         from .point import Point3
-        if isinstance(other,Point3):
-            result = self.toPoint()
-        elif isinstance(other,Vector3):
-            result = self.copy()
-        else:
-            assert False, "%s is not a valid value" % repr(other)
-        
-        result.x -= other.x
-        result.y -= other.y
-        result.z -= other.z
-        return result
+        if isinstance(tail,Point3):
+            return Point3._make(self._x-tail._x, self._y-tail._y, self._z-tail._z)
+        assert isinstance(tail,Vector3), "%s is not a valid value" % repr(tail)
+        return self._make(self._x-tail._x, self._y-tail._y, self._z-tail._z)
     
     
     # PUBLIC METHODS
@@ -436,7 +406,7 @@ class Vector3(Tuple3):
         :rtype:  ``Point3``
         """
         from .point import Point3
-        return Point3(self.x,self.y,self.z)
+        return Point3._make(self._x,self._y,self._z)
     
     def length(self):
         """
@@ -552,11 +522,9 @@ class Vector3(Tuple3):
         :rtype:  ``Vector3``
         """
         assert (isinstance(other, Vector3)), "%s is not a valid vector" % repr(other)
-        result = self.copy()
-        result.x = (self.y * other.z) - (self.z * other.y)
-        result.y = (self.z * other.x) - (self.x * other.z)
-        result.z = (self.x * other.y) - (self.y * other.x)
-        return result
+        return self._make((self._y * other._z) - (self._z * other._y),
+                          (self._z * other._x) - (self._x * other._z),
+                          (self._x * other._y) - (self._y * other._x))
     
     def crossify(self,other):
         """
@@ -53,8 +53,8 @@ class Invaders(GameApp):
                 [one of STATE_INACTIVE, STATE_NEWWAVE, STATE_ACTIVE, STATE_PAUSED, STATE_CONTINUE, STATE_COMPLETE]
         _wave:  the subcontroller for a single wave, which manages the ships and aliens
                 [Wave, or None if there is no wave currently active]
-        _text:  the currently active message
-                [GLabel, or None if there is no message to display]
+        _text:  the name of the currently active message (a key of _messages)
+                [str, or None if there is no message to display]
 
     
     STATE SPECIFIC INVARIANTS: 
@@ -69,6 +69,21 @@ class Invaders(GameApp):
     documented here.
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+        _messages: the messages to display, by name [dict of str to GLabel]. The 
+                   names are 'prompt' (asking the player to press 'S', whose text is
+                   changed in place to show the lives left), 'gameOver' (when the 
+                   player runs out of lives) and 'winner' (when the player destroys
+                   every alien).
+        _display:  the objects that draw the wave on screen [WaveDisplay]
+    
+    The messages are only made once, in start, so that their text is not rendered
+    again every animation frame.  Attribute _text is either None or one of their names.
+    
+    The method update never draws anything, nor touches any Kivy object.  Instead, 
+    publish returns a snapshot of what is on screen (only names and numbers), which 
+    draw then draws with the messages and the display.  So the game can be updated on
+    its own thread (see the attribute threaded of GameApp) while the main thread, which
+    owns every GObject, draws the last snapshot.
     """
     
     # DO NOT MAKE A NEW INITIALIZER!
@@ -83,15 +98,22 @@ class Invaders(GameApp):
         You should use it to initialize any game specific attributes.
         
         This method should make sure that all of the attributes satisfy the given 
-        invariants. When done, it sets the _state to STATE_INACTIVE and create a message 
+        invariants. When done, it sets the _state to STATE_INACTIVE and picks a message 
         (in attribute _text) saying that the user should press to play a game.
         """
         assert isinstance(self.view,GView), 'self.view is not an instance of GView'
         assert isinstance(self.input,GInput), 'self.Input isnt an instance of GInput'
         self._state = STATE_INACTIVE
         self._wave = None
-        self._text = GLabel(text="Press 'S' to Start",x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
-        self._text.font_size = 100
+        self._messages = {
+            'prompt': GLabel(text="Press 'S' to Start",font_size = 100,
+                             x=GAME_WIDTH/2,y=GAME_HEIGHT/2),
+            'gameOver': GLabel(text="GAME \n OVER", fillcolor = 'red',
+                               font_size = 200,x=GAME_WIDTH/2,y=GAME_HEIGHT/2),
+            'winner': GLabel(text="WINNER \nWINNER \nCHICKEN \nDINNER\n",
+                             font_size = 100,x=GAME_WIDTH/2,y=GAME_HEIGHT/2)}
+        self._text = 'prompt'
+        self._display = WaveDisplay()
         
     
     def update(self,dt):
@@ -145,26 +167,36 @@ class Invaders(GameApp):
         if(self._state == STATE_NEWWAVE):
             self._text = None
             self._wave = Wave()
-            self.draw()
             self._state = STATE_ACTIVE
         if(self._state == STATE_ACTIVE):
             self._wave.update(self.input,dt)
             if(self._wave.getShip()==None):
                 self._state = STATE_PAUSED
         if(self._state == STATE_PAUSED):
-            self._text = GLabel(text="Press 'S' to Start\nLives left: "+\
-                    str(self._wave.getLives()),x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
-            self._text.font_size = 100
+            self._text = 'prompt'
             self._determineState()
         if(self._state >0):
             if(self._wave.getLives()==0):
-                self._text = GLabel(text="GAME \n OVER", fillcolor = 'red',
-                                font_size = 200,x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
+                self._text = 'gameOver'
             if(self._wave.aliensRemaining()==0):
                 self._state = STATE_COMPLETE
-                self._text = GLabel(text="WINNER \nWINNER \nCHICKEN \nDINNER\n",
-                                font_size = 100,x=GAME_WIDTH/2,y=GAME_HEIGHT/2)
+                self._text = 'winner'
+        
+        # Nothing moves on the message screens, so let the game loop slow down
+        self.idle = self._state in (STATE_INACTIVE, STATE_PAUSED, STATE_COMPLETE)
+        
+    
+    def publish(self):
+        """
+        Returns: a snapshot (text,lives,wave) of what to draw
         
+        The text is the name of the message to show (or None), lives is the number 
+        of lives left (or None if there is no wave), and wave is the state of the wave
+        (see the method getState in Wave), or None if there is no wave.
+        """
+        if(self._wave == None):
+            return (self._text,None,None)
+        return (self._text,self._wave.getLives(),self._wave.getState())
     
     def draw(self):
         """
@@ -177,15 +209,35 @@ class Invaders(GameApp):
         Wave. In order to draw them, you either need to add getters for these attributes 
         or you need to add a draw method to class Wave.  We suggest the latter.  See 
         the example subcontroller.py from class.
+        
+        This method only draws the latest snapshot (see publish), and never looks at 
+        the wave itself.
         """
-        if not self._text == None:
-            self._text.draw(self.view)
-        else:
+        text, lives, wave = self.latest
+        if not text == None:
+            if text == 'prompt' and lives != None:
+                self._showLives(lives)
             self.view.clear()
-            self._wave.draw(self._view)
+            self._messages[text].draw(self.view)
+        else:
+            self._display.draw(self.view,wave,self.alpha)
     
     
     # HELPER METHODS FOR THE STATES GO HERE
+    def _showLives(self,lives):
+        """
+        Changes the prompt to show the number of lives left
+        
+        The text is only changed (and so rendered again) if the number has changed.
+        
+        Parameter lives: the number of lives left
+        Precondition: lives is an int >= 0
+        """
+        prompt = self._messages['prompt']
+        text = "Press 'S' to Start\nLives left: "+str(lives)
+        if(prompt.text != text):
+            prompt.text = text
+    
     def _determineState(self):
         """
         Determines the current state and assigns it to self.state
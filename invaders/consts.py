@@ -126,4 +126,7 @@ except:
 NUM_STATES = 6
 
 # Image file of the ship
-SHIP_IMAGE = 'ship.png'
\ No newline at end of file
+SHIP_IMAGE = 'ship.png'
+# Whether to update the game on its own thread, drawing snapshots of it on the main
+# thread (see the attribute threaded of GameApp)
+SIMULATION_THREAD = False
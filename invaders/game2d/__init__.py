@@ -10,7 +10,12 @@ Date:   August 1, 2017 (Python 3 version)
 from .gobject import GObject, GScene
 from .grectangle import GRectangle, GEllipse, GImage, GLabel
 from .gsprite import GSprite
+from .gbatch import GSpriteBatch
 from .gpath import GPath, GTriangle, GPolygon
 from .gview import GInput, GView
+from .raster import SoftwareRenderer
+from .capture import FrameCapture, FrameWriter, PNGWriter, RawWriter
+from .perf import FrameStats, PerfOverlay
+from .worker import SnapshotBuffer, SimulationThread
 from .sound import Sound, SoundLibrary
 from .app import GameApp
\ No newline at end of file
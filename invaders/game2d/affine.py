@@ -0,0 +1,188 @@
+"""
+A module to support fast 2D affine transforms.
+
+The class :class:`Matrix` in the cornell package is a 4x4 NumPy matrix.  That is the
+right thing to hand to OpenGL, but it is a lot of machinery for a 2D game that only
+needs to find the bounding box of a rotated object, or to check if a point is inside of
+it.  Every call allocates NumPy arrays, and inverting the matrix is a general 4x4 solve.
+
+The class in this module is a 2D affine transform stored as six floats.  Composing,
+inverting and applying it are all closed-form, so they are a handful of float operations
+with no allocation beyond the result.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+import math
+
+
+class Affine(object):
+    """
+    A class representing a 2D affine transform.
+
+    The transform is the 2x3 matrix::
+
+        | a  c  tx |
+        | b  d  ty |
+
+    which sends the point (x,y) to (a*x+c*y+tx, b*x+d*y+ty).  Objects of this class are
+    treated as immutable; all of the methods return new objects.
+
+    INSTANCE ATTRIBUTES:
+        a:  the x-coordinate of the image of (1,0) (before translation) [float]
+        b:  the y-coordinate of the image of (1,0) (before translation) [float]
+        c:  the x-coordinate of the image of (0,1) (before translation) [float]
+        d:  the y-coordinate of the image of (0,1) (before translation) [float]
+        tx: the x-coordinate of the translation [float]
+        ty: the y-coordinate of the translation [float]
+    """
+
+    # BUILT-IN METHODS
+    def __init__(self,a=1.0,b=0.0,c=0.0,d=1.0,tx=0.0,ty=0.0):
+        """
+        Creates a new affine transform (the identity by default)
+
+        :param a: the x-coordinate of the image of (1,0) (before translation)
+        :type a:  ``float``
+
+        :param b: the y-coordinate of the image of (1,0) (before translation)
+        :type b:  ``float``
+
+        :param c: the x-coordinate of the image of (0,1) (before translation)
+        :type c:  ``float``
+
+        :param d: the y-coordinate of the image of (0,1) (before translation)
+        :type d:  ``float``
+
+        :param tx: the x-coordinate of the translation
+        :type tx:  ``float``
+
+        :param ty: the y-coordinate of the translation
+        :type ty:  ``float``
+        """
+        self.a  = a
+        self.b  = b
+        self.c  = c
+        self.d  = d
+        self.tx = tx
+        self.ty = ty
+
+    def __repr__(self):
+        """
+        :return: An unambiguous string representation of this transform
+        :rtype:  ``str``
+        """
+        return 'Affine(%r,%r,%r,%r,%r,%r)' % (self.a,self.b,self.c,self.d,self.tx,self.ty)
+
+    def __mul__(self,other):
+        """
+        Returns the composition of this transform with other.
+
+        The result applies other first, and this transform second.
+
+        :param other: the transform to apply first
+        :type other:  :class:`Affine`
+
+        :return: the composed transform
+        :rtype:  :class:`Affine`
+        """
+        return Affine(self.a*other.a+self.c*other.b, self.b*other.a+self.d*other.b,
+                      self.a*other.c+self.c*other.d, self.b*other.c+self.d*other.d,
+                      self.a*other.tx+self.c*other.ty+self.tx,
+                      self.b*other.tx+self.d*other.ty+self.ty)
+
+
+    # CONSTRUCTORS
+    @classmethod
+    def compose(cls,x,y,angle,sx,sy):
+        """
+        Returns the transform that scales, then rotates, then translates.
+
+        This is the transform of a :class:`GObject` with center (x,y), the given angle
+        and the given scale.  It is the same as the product of a translation, a rotation
+        and a scale matrix, but computed directly.
+
+        :param x: the x-coordinate of the translation
+        :type x:  ``float``
+
+        :param y: the y-coordinate of the translation
+        :type y:  ``float``
+
+        :param angle: the angle of rotation in degrees (counter-clockwise)
+        :type angle:  ``float``
+
+        :param sx: the horizontal scale
+        :type sx:  ``float``
+
+        :param sy: the vertical scale
+        :type sy:  ``float``
+
+        :return: the composed transform
+        :rtype:  :class:`Affine`
+        """
+        if angle == 0.0:
+            return cls(sx,0.0,0.0,sy,x,y)
+
+        radians = math.radians(angle)
+        cos = math.cos(radians)
+        sin = math.sin(radians)
+        return cls(cos*sx,sin*sx,-sin*sy,cos*sy,x,y)
+
+
+    # PUBLIC METHODS
+    def determinant(self):
+        """
+        :return: the determinant of the linear part of this transform
+        :rtype:  ``float``
+        """
+        return self.a*self.d-self.b*self.c
+
+    def inverse(self):
+        """
+        Returns the inverse of this transform.
+
+        :raise: ``ZeroDivisionError`` if the transform is not invertible (e.g. it has a
+        scale of 0).
+
+        :return: the inverse transform
+        :rtype:  :class:`Affine`
+        """
+        det = self.a*self.d-self.b*self.c
+        return Affine(self.d/det, -self.b/det, -self.c/det, self.a/det,
+                      (self.c*self.ty-self.d*self.tx)/det, (self.b*self.tx-self.a*self.ty)/det)
+
+    def transform(self,x,y):
+        """
+        Returns the image of the point (x,y) under this transform.
+
+        :param x: the x-coordinate of the point
+        :type x:  ``float``
+
+        :param y: the y-coordinate of the point
+        :type y:  ``float``
+
+        :return: the transformed point
+        :rtype:  2-element ``tuple`` of ``float``
+        """
+        return (self.a*x+self.c*y+self.tx, self.b*x+self.d*y+self.ty)
+
+    def bounds(self,width,height):
+        """
+        Returns the bounding box of the image of a rectangle centered at the origin.
+
+        The bounding box is the smallest box, aligned with the axes, that contains all
+        four transformed corners.  It is computed directly, without transforming the
+        corners.
+
+        :param width: the width of the rectangle
+        :type width:  ``float`` >= 0
+
+        :param height: the height of the rectangle
+        :type height:  ``float`` >= 0
+
+        :return: the bounding box as (left,bottom,right,top)
+        :rtype:  4-element ``tuple`` of ``float``
+        """
+        hw = (abs(self.a)*width+abs(self.c)*height)/2.0
+        hh = (abs(self.b)*width+abs(self.d)*height)/2.0
+        return (self.tx-hw, self.ty-hh, self.tx+hw, self.ty+hh)
@@ -7,17 +7,28 @@ The primary class for 2D game support.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-# Basic Kivy Modules
-import kivy
-import kivy.app
-
-# Lower-level kivy modules to support animation
-from kivy.config import Config
-from kivy.clock  import Clock
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import App, Config, Clock
+else:
+    # Basic Kivy Modules
+    import kivy
+    import kivy.app
+    from kivy.app import App
+    
+    # Lower-level kivy modules to support animation
+    from kivy.config import Config
+    from kivy.clock  import Clock
 
+from .perf import FrameStats, PerfOverlay
+from .worker import SnapshotBuffer, SimulationThread
 import os.path
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
 
-class GameApp(kivy.app.App):
+class GameApp(App):
     """
     A controller class for a simple game application.
     
@@ -39,6 +50,16 @@ class GameApp(kivy.app.App):
     # Class attribute for tracking textures (to reduce memory footprint)
     TEXTURE_CACHE = {}
     
+    # Class attribute for sharing the frames of filmstrips, keyed by (name,format)
+    FRAME_CACHE = {}
+    
+    # Class attributes for sharing rendered text, keeping the most recently used
+    TEXT_CACHE = OrderedDict()
+    TEXT_CACHE_SIZE = 32
+    
+    # Class attribute for the atlas of the Images folder (None if there is no atlas)
+    ATLAS = None
+    
     
     # MUTABLE ATTRIBUTES
     @property
@@ -50,6 +71,10 @@ class GameApp(kivy.app.App):
         achievable.  If you are having performance stuttering, you might want to drop
         this value to 30 FPS instead.
         
+        This is the rate at which the game loop runs.  The game is updated at the rate 
+        set by :attr:`tick` and drawn at the rate set by :attr:`draw_fps`, but never 
+        more often than this.
+        
         **Invariant**: Must be an int or float > 0.
         """
         return self._fps
@@ -58,12 +83,161 @@ class GameApp(kivy.app.App):
     def fps(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         assert value > 0, 'value %s is not positive' % repr(value)
-        Clock.unschedule(self._refresh)
         self._fps = value
-        Clock.schedule_interval(self._refresh,1.0/self._fps)
+        self._perf.fps = value
+        self._schedule()
+    
+    @property
+    def idle(self):
+        """
+        Whether the game is idle (nothing on screen is moving)
+        
+        A game should set this to True when it is waiting for the player, such as on a
+        menu or pause screen.  The game loop then slows down to :attr:`idle_fps`, so 
+        the game does not use a whole processor to draw a still screen.  Each idle 
+        frame calls :meth:`update` once and :meth:`draw` once.
+        
+        Any key press or release (or mouse click) ends idle mode, so the next frames
+        run at the full rate.  The game can then set this value to True again if it is
+        still waiting.  The value is False by default.
+        
+        If the game is :attr:`threaded`, an update on the simulation thread does not 
+        change this value itself.  It asks the main thread to change it on the next 
+        frame, as only the main thread may reschedule the game loop.
+        
+        **Invariant**: Must be a bool
+        """
+        return self._idle
+    
+    @idle.setter
+    def idle(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        if threading.current_thread() is not threading.main_thread():
+            if value != self._idle:
+                Clock.schedule_once(partial(self._set_idle,value))
+        elif value != self._idle:
+            self._idle = value
+            self._paced = False
+            if self._running:
+                self._schedule()
+    
+    @property
+    def idle_fps(self):
+        """
+        The number of frames-per-second while the game is :attr:`idle`
+        
+        A value of 0 means that the game loop stops entirely while idle, and only a 
+        key or mouse event starts it again.  By default this value is 4.
+        
+        **Invariant**: Must be an int or float >= 0.
+        """
+        return self._idlefps
+    
+    @idle_fps.setter
+    def idle_fps(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value >= 0, 'value %s is negative' % repr(value)
+        self._idlefps = value
+        if self._running and self._idle:
+            self._schedule()
+    
+    @property
+    def draw_fps(self):
+        """
+        The number of times per second to draw the game
+        
+        This may be lower than :attr:`fps`, such as to save time for updates on a 
+        slow machine.  Frames without a draw leave the last drawing on the screen.  
+        Setting this value to None (the default) draws every frame.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._fps if self._drawfps is None else self._drawfps
+    
+    @draw_fps.setter
+    def draw_fps(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._drawfps = value
+    
+    @property
+    def budget(self):
+        """
+        The number of seconds that the updates in a frame may take
+        
+        If the calls to :meth:`update` in a frame take longer than this, the game is 
+        falling behind, and the draw for that frame may be skipped (see 
+        :meth:`should_draw`).  Setting this value to None (the default) makes the 
+        budget a single frame, or 1/:attr:`fps` seconds.
+        
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return 1.0/self._fps if self._budget is None else self._budget
+    
+    @budget.setter
+    def budget(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        self._budget = value
+    
+    @property
+    def tick(self):
+        """
+        The number of seconds simulated by each call to :meth:`update`
+        
+        The game is simulated in fixed steps of this size, no matter how fast the 
+        window refreshes.  If the window refreshes faster than this, some frames do 
+        not update at all.  If it refreshes slower, a frame may call :meth:`update`
+        several times to catch up.  By default this value is 1/60 of a second.
+        
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._tick
+    
+    @tick.setter
+    def tick(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._tick = value
+    
+    @property
+    def catchup(self):
+        """
+        The maximum number of calls to :meth:`update` in a single frame
+        
+        If the game falls further behind than this, the extra time is thrown away.
+        The game slows down instead of spending more and more time catching up. By 
+        default this value is 5.
+        
+        **Invariant**: Must be an int > 0.
+        """
+        return self._catchup
+    
+    @catchup.setter
+    def catchup(self,value):
+        assert type(value) == int, 'value %s is not an int' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._catchup = value
     
     
     # IMMUTABLE PROPERTIES
+    @property
+    def alpha(self):
+        """
+        How far the current frame is between the last update and the next one.
+        
+        A value of 0 means the frame is exactly at the last update, while a value 
+        close to 1 means the next update is almost due.  Use this value in :meth:`draw` 
+        to interpolate moving objects (see :meth:`GObject.interpolate`) so that they 
+        move smoothly even when the window refreshes faster than :attr:`tick`.
+        
+        If the game is :attr:`threaded`, this is the time since the :attr:`latest` 
+        snapshot was published, as a fraction of :attr:`tick`.
+        
+        **Invariant**: Must be a float in 0..1.
+        """
+        return self._alpha
+    
     @property
     def width(self):
         """
@@ -102,10 +276,99 @@ class GameApp(kivy.app.App):
         Use this attribute to get information about the mouse and keyboard.  See the
         class :class:`GInput` for more information.
         
+        If the game is :attr:`threaded`, then an update on the simulation thread gets a 
+        frozen copy of the input instead (see :meth:`GInput.freeze`).  The main thread 
+        hands over a new copy after every key or mouse event, and the update reads the 
+        newest one when it starts.  So the input never changes during an update.
+        
         **Invariant**: Must be instance of :class:`GInput`
         """
+        if self._threaded and threading.current_thread() is not threading.main_thread():
+            return self._frozen
         return self._input
     
+    @property
+    def show_perf(self):
+        """
+        Whether to draw the frame statistics on top of the game.
+        
+        The statistics (see :attr:`perf`) are always measured.  This only controls
+        whether they are shown in the top left corner of the window.  The value is
+        False by default.
+        
+        **Invariant**: Must be a bool
+        """
+        return self._showperf
+    
+    @show_perf.setter
+    def show_perf(self,value):
+        assert type(value) == bool, 'value %s is not a bool' % repr(value)
+        self._showperf = value
+        if not value:
+            self._overlay = None
+    
+    @property
+    def perf(self):
+        """
+        The timings of the recent animation frames.
+        
+        Every frame is split into the phases 'clear', 'update', 'draw' and (with Kivy)
+        'submit', the time for Kivy to send the canvas to the screen.  Use the method
+        ``summary`` to get the statistics of each phase, such as for a benchmark.  See
+        :class:`FrameStats` for more information.
+        
+        If the game is :attr:`threaded`, the 'update' times are those of the simulation
+        thread, and include the calls to :meth:`publish`.
+        
+        **Invariant**: Must be instance of :class:`FrameStats`
+        """
+        return self._perf
+    
+    @property
+    def threaded(self):
+        """
+        Whether :meth:`update` runs on its own thread.
+        
+        In threaded mode, the game is updated on a simulation thread, every :attr:`tick`
+        seconds, no matter how long the drawing takes.  After each update, the thread
+        calls :meth:`publish` for a snapshot of the game, and :meth:`draw` (on the main
+        thread) draws the :attr:`latest` snapshot.  So :meth:`update` must not draw or 
+        change anything that is on screen, and :meth:`draw` must only use the snapshot.
+        Kivy objects (such as any :class:`GObject`) may only be made and changed on the
+        main thread, so the state that :meth:`update` changes should be plain data, and
+        every :class:`GObject` should belong to :meth:`draw`.  The update reads a frozen
+        copy of the :attr:`input`.
+        
+        This value is set by the keyword ``threaded`` and is False by default.
+        
+        **Immutable**: This value cannot be altered.
+        """
+        return self._threaded
+    
+    @property
+    def latest(self):
+        """
+        The newest snapshot returned by :meth:`publish`.
+        
+        This is what :meth:`draw` should draw.  It is the snapshot after the last 
+        update, or, if the game is :attr:`threaded`, the newest one that the simulation
+        thread has finished.
+        
+        **Immutable**: This value cannot be altered.
+        """
+        return self._latest
+    
+    @property
+    def capture(self):
+        """
+        The frame capture in progress, or None if the game is not being recorded.
+        
+        See :meth:`start_capture` for more information.
+        
+        **Invariant**: Must be a :class:`FrameCapture` or None.
+        """
+        return self._capture
+    
     # CLASS METHODS
     @classmethod
     def is_image(cls,name):
@@ -170,6 +433,9 @@ class GameApp(kivy.app.App):
         has already been loaded, it will return the cached texture.  Otherwise, it will
         load the texture and cache it before returning it.
         
+        If the image is in the atlas (see :meth:`build_atlas`), the texture is a region
+        of an atlas page instead of a texture of its own.
+        
         This method will crash if name is not a valid file.
         
         :param name: The file name
@@ -179,8 +445,16 @@ class GameApp(kivy.app.App):
         if name in cls.TEXTURE_CACHE:
             return cls.TEXTURE_CACHE[name]
         
+        if cls.ATLAS is not None and name in cls.ATLAS:
+            texture = cls.ATLAS.get_texture(name)
+            cls.TEXTURE_CACHE[name] = texture
+            return texture
+        
         try:
-            from kivy.core.image import Image
+            if HEADLESS:
+                from .headless import CoreImage as Image
+            else:
+                from kivy.core.image import Image
             texture = Image(name).texture
             cls.TEXTURE_CACHE[name] = texture
         except:
@@ -201,6 +475,9 @@ class GameApp(kivy.app.App):
         :type name:  ``str``
         """
         assert type(name) == str, '%s is not a valid texture name' % repr(name)
+        for key in [key for key in cls.FRAME_CACHE if key[0] == name]:
+            del cls.FRAME_CACHE[key]
+        
         if name in cls.TEXTURE_CACHE:
             texture = cls.TEXTURE_CACHE[name]
             del cls.TEXTURE_CACHE[name]
@@ -208,6 +485,145 @@ class GameApp(kivy.app.App):
         
         return None
     
+    @classmethod
+    def load_frames(cls,name,format):
+        """
+        Returns: The animation frames of a filmstrip, or None if it cannot be loaded
+        
+        The filmstrip is the texture for the given file name (see :meth:`load_texture`),
+        divided into a grid with the given (rows,columns).  The frames are the texture 
+        regions for each grid cell, arranged left-to-right, top-to-bottom.
+        
+        The frames are cached, so every sprite with the same file name and format
+        shares the same regions.
+        
+        :param name: The file name
+        :type name:  ``str``
+        
+        :param format: The filmstrip grid size
+        :type format:  2-element tuple of ``int`` > 0
+        """
+        key = (name,format)
+        if key in cls.FRAME_CACHE:
+            return cls.FRAME_CACHE[key]
+        
+        texture = cls.load_texture(name)
+        if texture is None:
+            return None
+        
+        rows, cols = format
+        width  = texture.width/cols
+        height = texture.height/rows
+        frames = []
+        for row in range(rows):
+            for col in range(cols):
+                tx = col*width
+                ty = row*height
+                frames.append(texture.get_region(int(tx),texture.height-int(ty)-int(height),
+                                                 int(width),int(height)))
+        
+        frames = tuple(frames)
+        cls.FRAME_CACHE[key] = frames
+        return frames
+    
+    @classmethod
+    def set_resource_path(cls,path):
+        """
+        Sets the folder containing the **Fonts**, **Sounds** and **Images** folders.
+        
+        This is done for you when the game is created.  You only need to call this 
+        method if you want to use the resources (e.g. create a :class:`GImage`) without 
+        a running game, such as in a headless simulation.
+        
+        :param path: The application directory
+        :type path:  ``str``
+        """
+        import os
+        # Always set these on GameApp, as the drawables look for them there
+        GameApp.fonts  = str(os.path.join(path, 'Fonts'))
+        GameApp.sounds = str(os.path.join(path, 'Sounds'))
+        GameApp.images = str(os.path.join(path, 'Images'))
+        
+        if HEADLESS:
+            from .headless import resource_add_path
+        else:
+            from kivy.resources import resource_add_path
+        resource_add_path(GameApp.fonts)
+        resource_add_path(GameApp.sounds)
+        resource_add_path(GameApp.images)
+    
+    @classmethod
+    def load_text(cls,text,font_name,font_size,bold,color,halign='center',cache=True):
+        """
+        Returns: The texture for the given text, or None if it cannot be rendered
+        
+        The text is rasterized with the given style.  The result is cached, so any 
+        label with the same text and style shares the texture.  The cache only keeps 
+        the ``TEXT_CACHE_SIZE`` most recently used textures; if the cache is full, 
+        it removes the one that was used the longest time ago.
+        
+        If ``cache`` is False, the text is always rasterized again, and the result is
+        not put in the cache.  Use this for text that is unlikely to be shown twice,
+        so it does not push out the textures that are.
+        
+        :param text: The text to render
+        :type text:  ``str``
+        
+        :param font_name: The font file name, or the name of a Kivy font
+        :type font_name:  ``str``
+        
+        :param font_size: The size of the text font in points
+        :type font_size:  ``int`` or ``float`` > 0
+        
+        :param bold: Whether to render the text in bold
+        :type bold:  ``bool``
+        
+        :param color: The text color
+        :type color:  4-element tuple of ``float`` in 0..1
+        
+        :param halign: The alignment of the lines within the text
+        :type halign:  one of 'left', 'right', or 'center'
+        
+        :param cache: Whether to use the text cache
+        :type cache:  ``bool``
+        """
+        key = (text,font_name,font_size,bold,color,halign)
+        if cache and key in cls.TEXT_CACHE:
+            cls.TEXT_CACHE.move_to_end(key)
+            return cls.TEXT_CACHE[key]
+        
+        if HEADLESS:
+            from .headless import CoreLabel
+        else:
+            from kivy.core.text import Label as CoreLabel
+        label = CoreLabel(text=text,font_name=font_name,font_size=font_size,bold=bold,
+                          color=color,halign=halign)
+        label.refresh()
+        texture = label.texture
+        if not cache:
+            return texture
+        
+        cls.TEXT_CACHE[key] = texture
+        while len(cls.TEXT_CACHE) > cls.TEXT_CACHE_SIZE:
+            cls.TEXT_CACHE.popitem(last=False)
+        return texture
+    
+    @classmethod
+    def build_atlas(cls,maxsize=1024):
+        """
+        Packs the images in the **Images** folder into a texture atlas.
+        
+        After this, :meth:`load_texture` returns a region of the atlas for any image 
+        in it, so images drawn together do not have to switch textures.  Images that
+        were already loaded keep their old textures.  This is done for you when the 
+        game is created.
+        
+        :param maxsize: The maximum width and height of an atlas page
+        :type maxsize:  ``int`` > 0
+        """
+        from .atlas import TextureAtlas
+        GameApp.ATLAS = TextureAtlas.from_folder(cls.images,maxsize)
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -232,22 +648,53 @@ class GameApp(kivy.app.App):
         w = keywords.pop('width', 0.0)
         h = keywords.pop('height', 0.0)
         f = keywords.pop('fps', 60.0)
+        t = keywords.pop('tick', 1/60.0)
+        c = keywords.pop('catchup', 5)
+        p = keywords.pop('show_perf', False)
+        d = keywords.pop('draw_fps', None)
+        b = keywords.pop('budget', None)
+        r = keywords.pop('threaded', False)
+        i = keywords.pop('idle_fps', 4)
 
         assert type(w) in [int,float], 'width %s is not a number' % repr(w)
         assert type(h) in [int,float], 'height %s is not a number' % repr(h)
         assert type(f) in [int,float], 'fps %s is not a number' % repr(value)
         assert f > 0, 'fps %s is not positive' % repr(value)
+        assert type(r) == bool, 'threaded %s is not a bool' % repr(r)
 
         self._gwidth = w
         self._gheight = h
+        self._running = False
+        self._idle = False
+        self.idle_fps = i
+        self._paced = False
         self._fps = f
+        self._perf = FrameStats(f)
+        self._overlay = None
+        self.show_perf = p
+        self.tick = t
+        self.catchup = c
+        self.draw_fps = d
+        self.budget = b
+        self._accum = 0.0
+        self._alpha = 0.0
+        self._since = 0.0
+        self._skipped = 0
+        self._capture = None
+        self._recorder = None
+        self._threaded = r
+        self._worker = None
+        self._snapshots = None
+        self._latest = None
+        self._inputs = None
+        self._frozen = None
         
         Config.set('graphics', 'width', str(self.width))
         Config.set('graphics', 'height', str(self.height))
         self._setpaths()
         
         # Tell Kivy to build the application
-        kivy.app.App.__init__(self,**keywords)
+        App.__init__(self,**keywords)
     
     
     # PUBLIC METHODS
@@ -261,7 +708,15 @@ class GameApp(kivy.app.App):
         from .gview import GInput, GView
         self._view = GView()
         self._view.size_hint = (1,1)
+        if HEADLESS:
+            # There is no window to size the view for us
+            self._view.size = (self.width,self.height)
+            self._view._reset()
+        else:
+            from kivy.core.window import Window
+            Window.bind(on_flip=self._flipped)
         self._input = GInput()
+        self._input._listener = self._wake
         self._input._register(self._view)
         return self.view
     
@@ -273,7 +728,7 @@ class GameApp(kivy.app.App):
         It should **never** be overridden.
         """
         Clock.schedule_once(self._bootstrap,-1)
-        kivy.app.App.run(self)
+        App.run(self)
     
     def stop(self):
         """
@@ -283,9 +738,56 @@ class GameApp(kivy.app.App):
         It should **never** be overridden.
         """
         import sys
-        kivy.app.App.stop(self)
+        self._stop_worker()
+        self.stop_capture()
+        App.stop(self)
         sys.exit(0)
     
+    def start_capture(self,writer,policy='drop',buffers=4):
+        """
+        Starts recording every frame drawn by the game.
+        
+        After each call to :meth:`draw`, the view is recorded and handed to a thread
+        (see :meth:`GView.snapshot`).  That thread draws the frame into a buffer with 
+        a :class:`SoftwareRenderer` and passes it to ``writer``.  So the frames are not
+        read back from the window, and recording costs the animation loop very little.
+        The buffers are reused, so there are never more than ``buffers`` frames waiting
+        to be written.  If they are all in use, the ``policy`` decides whether to drop 
+        the frame ('drop') or to wait for the writer ('block').
+        
+        :param writer: the writer to save the frames
+        :type writer:  :class:`FrameWriter`
+        
+        :param policy: what to do when the writer falls behind
+        :type policy:  one of 'drop' or 'block'
+        
+        :param buffers: the number of frame buffers
+        :type buffers:  ``int`` > 0
+        
+        :return: the capture, for its statistics
+        :rtype:  :class:`FrameCapture`
+        """
+        from .capture import FrameCapture
+        from .raster import SoftwareRenderer
+        self.stop_capture()
+        
+        width, height = int(round(self.view.width)), int(round(self.view.height))
+        self._recorder = SoftwareRenderer(width,height)
+        self._capture = FrameCapture(writer,width,height,policy,buffers)
+        self._capture.start()
+        return self._capture
+    
+    def stop_capture(self):
+        """
+        Stops recording frames, waiting for the frames in progress to be written.
+        
+        This does nothing if the game is not being recorded.
+        """
+        if not self._capture is None:
+            capture, self._capture = self._capture, None
+            self._recorder = None
+            capture.stop()
+    
     def start(self):
         """
         Initializes the game state, creating a new game.
@@ -302,7 +804,7 @@ class GameApp(kivy.app.App):
         """
         Updates the state of the game one animation frame.
         
-        This method is called 60x a second (depending on the ``fps``) to provide on-screen 
+        This method is called 60x a second (depending on the ``tick``) to provide on-screen 
         animation. Any code that moves objects or processes user input (keyboard or mouse)
         goes in this method.
         
@@ -310,20 +812,70 @@ class GameApp(kivy.app.App):
         that represent the current animation state, so that they can persist across
         animation frames.  These attributes should be initialized in `start`.
         
+        The game is simulated in fixed steps, so ``dt`` is always equal to ``tick``,
+        no matter how fast the window refreshes.
+        
+        If the game is :attr:`threaded`, this method is called on the simulation 
+        thread.  It must not draw anything or change anything on screen.
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
         pass
     
+    def publish(self):
+        """
+        Returns: a snapshot of everything that :meth:`draw` needs
+        
+        This method is called after the updates of each frame (and once after 
+        :meth:`start`), and the result becomes the :attr:`latest` snapshot.  If the 
+        game is :attr:`threaded`, it is called on the simulation thread after every 
+        update, and the snapshot is drawn while the game goes on updating.  So the 
+        snapshot must be immutable: it cannot share any object that :meth:`update` 
+        changes, and it should not hold any :class:`GObject`.  A tuple of numbers and 
+        strings (or of read-only NumPy arrays) is a good choice.
+        
+        By default this returns None.
+        """
+        return None
+    
     def draw(self):
         """
         Draws the game objects on the screen.
         
         Every single object that you draw will need to be an attribute of the ``GameApp``
         class.  This method should largely be a sequence of calls to ``self.view.draw()``.
+        Objects registered with ``self.view.add()`` are drawn without any calls here.
+        
+        This method may be called more often (or less often) than :meth:`update`.  Use 
+        the attribute ``alpha`` to draw moving objects between updates.
+        
+        A game that is :attr:`threaded` must draw the :attr:`latest` snapshot, and not
+        the objects changed by :meth:`update`.
         """
         pass
     
+    def should_draw(self,overrun,skipped):
+        """
+        Returns: True if the game should be drawn this frame; False to skip the draw
+        
+        This method is called whenever a draw is due (see :attr:`draw_fps`).  By 
+        default, the draw is skipped if the updates went over the :attr:`budget`, so 
+        that the next frame has more time to catch up.  But no more than 
+        :attr:`catchup` draws are skipped in a row, so the screen never freezes.
+        
+        Override this method to change the policy.  For example, a game that must 
+        always show every update would return True.
+        
+        :param overrun: the seconds the updates this frame went over the budget (this 
+            is negative if they were under the budget)
+        :type overrun:  ``float``
+        
+        :param skipped: the number of draws skipped in a row before this one
+        :type skipped:  ``int`` >= 0
+        """
+        return overrun <= 0 or skipped >= self._catchup
+    
     
     # HIDDEN METHODS
     def _bootstrap(self,dt):
@@ -333,11 +885,15 @@ class GameApp(kivy.app.App):
         This method is a callback-proxy for method `start`.  It handles important issues 
         behind the scenes, particularly with setting the FPS
         """
-        if (self.fps < 60):
-            Clock.schedule_interval(self._refresh,1.0/self.fps)
-        else:
-            Clock.schedule_interval(self._refresh,0)
+        self._running = True
+        self._schedule()
         self.start()
+        self._latest = self.publish()
+        if self._threaded:
+            self._snapshots = SnapshotBuffer(self._latest)
+            self._inputs = SnapshotBuffer(self._input.freeze())
+            self._worker = SimulationThread(self._simulate,self._interval(),self._catchup)
+            self._worker.start()
     
     def _refresh(self,dt):
         """
@@ -346,12 +902,190 @@ class GameApp(kivy.app.App):
         This method a callback-proxy for the methods `update` and `draw`.  It handles
         important issues behind the scenes, particularly with clearing the window.
         
+        The elapsed time is added to an accumulator, and `update` is called once for 
+        every `tick` in the accumulator (up to `catchup` times).  Whatever is left 
+        over becomes the interpolation factor `alpha` for `draw`.
+        
+        The view is only cleared and drawn when a draw is due (see :attr:`draw_fps`),
+        and :meth:`should_draw` agrees.  Otherwise the last drawing stays on screen.
+        The time of each step is recorded in :attr:`perf`.
+        
+        If the game is :attr:`threaded`, the updates happen on the simulation thread
+        instead, and this method only draws (see :meth:`_present`).
+        
         :param dt: time in seconds since last update
         :type dt:  ``int`` or ``float``
         """
-        self.view.clear()
-        self.update(dt)
+        if not self._worker is None:
+            self._present(dt)
+            return
+        
+        # Frames at the idle rate (or the first after a change) are not late
+        self._perf.start(self._paced and not self._idle)
+        self._paced = True
+        start = time.perf_counter()
+        if self._idle:
+            # Nothing is moving, so a single update and draw are enough
+            self._accum = self._tick
+            dt = max(dt,1.0/self.draw_fps)
+        else:
+            self._accum += min(dt,self._tick*self._catchup)
+        steps = 0
+        while self._accum >= self._tick and steps < self._catchup:
+            self.update(self._tick)
+            self._accum -= self._tick
+            steps += 1
+        if steps > 0:
+            self._latest = self.publish()
+        overrun = time.perf_counter()-start-self.budget
+        
+        # Drop any time we could not catch up on
+        if self._accum >= self._tick:
+            self._accum %= self._tick
+        self._alpha = self._accum/self._tick
+        
+        # Draw if it is time to (with half a frame of slack for a jittery clock)
+        interval = 1.0/self.draw_fps
+        self._since += dt
+        due = self._since >= interval-0.5/self._fps
+        if due and not self.should_draw(overrun,self._skipped):
+            self._skipped += 1
+            self._perf.skip()
+            due = False
+        self._perf.lap('update',not due)
+        if not due:
+            return
+        
+        self._since = min(max(self._since-interval,0.0),interval)
+        self._skipped = 0
+        self._draw_frame()
+    
+    def _present(self,dt):
+        """
+        Draws the newest snapshot from the simulation thread.
+        
+        This is the animation frame of a :attr:`threaded` game.  The updates happen on
+        the simulation thread, and their times are recorded there, so this only takes
+        the :attr:`latest` snapshot and draws it when a draw is due.  If the simulation
+        thread failed, its error is raised here.
+        
+        :param dt: time in seconds since last frame
+        :type dt:  ``int`` or ``float``
+        """
+        self._perf.start(self._paced and not self._idle)
+        self._paced = True
+        if not self._worker.error is None:
+            self._stop_worker()
+        if self._idle:
+            dt = max(dt,1.0/self.draw_fps)
+        
+        self._latest = self._snapshots.latest()
+        age = time.perf_counter()-self._snapshots.stamp
+        self._alpha = min(age/self._tick,1.0)
+        
+        interval = 1.0/self.draw_fps
+        self._since += dt
+        if self._since < interval-0.5/self._fps:
+            return
+        self._since = min(max(self._since-interval,0.0),interval)
+        self._draw_frame()
+    
+    def _draw_frame(self):
+        """
+        Clears the view and draws the game, along with the overlay and any capture.
+        """
+        self.view._clear_frame()
+        self._perf.lap('clear')
         self.draw()
+        if self._showperf:
+            # The overlay is made on first use, as the fonts need a running app
+            if self._overlay is None:
+                self._overlay = PerfOverlay(self._perf)
+            self._overlay.draw(self.view)
+        if not self._capture is None:
+            self._capture.submit(self.view.snapshot(self._recorder))
+        self._perf.lap('draw',HEADLESS)
+    
+    def _simulate(self):
+        """
+        Updates the game once and publishes a snapshot of it.
+        
+        This is the body of the loop on the simulation thread.  The update sees the
+        newest copy of the input handed over by the main thread.
+        """
+        start = time.perf_counter()
+        self._frozen = self._inputs.latest()
+        self.update(self._tick)
+        self._snapshots.publish(self.publish())
+        self._perf.record('update',time.perf_counter()-start)
+    
+    def _stop_worker(self):
+        """
+        Stops the simulation thread (if there is one).
+        
+        :raise: any exception raised on the simulation thread
+        """
+        if not self._worker is None:
+            worker, self._worker = self._worker, None
+            worker.stop()
+    
+    def _interval(self):
+        """
+        Returns: the seconds between updates, or None if the updates stop while idle
+        """
+        if not self._idle:
+            return self._tick
+        elif self._idlefps > 0:
+            return 1.0/self._idlefps
+        return None
+    
+    def _schedule(self):
+        """
+        Schedules the game loop at the full rate, or the idle rate if idle.
+        
+        A simulation thread is given its new rate at once.  This method must only be 
+        called on the main thread.
+        """
+        worker = self._worker
+        if not worker is None:
+            worker.interval = self._interval()
+        Clock.unschedule(self._refresh)
+        if not self._idle:
+            Clock.schedule_interval(self._refresh,1.0/self._fps)
+        elif self._idlefps > 0:
+            Clock.schedule_interval(self._refresh,1.0/self._idlefps)
+    
+    def _set_idle(self,value,dt):
+        """
+        Sets :attr:`idle` on the main thread, for an update on the simulation thread.
+        
+        :param value: the new value of idle
+        :type value:  ``bool``
+        
+        :param dt: time in seconds since this was scheduled
+        :type dt:  ``int`` or ``float``
+        """
+        self.idle = value
+    
+    def _wake(self):
+        """
+        Ends idle mode after a key or mouse event.
+        
+        This method is called by the input handler.  If there is a simulation thread,
+        it is first handed a copy of the new input state.
+        """
+        if not self._inputs is None:
+            self._inputs.publish(self._input.freeze())
+        self.idle = False
+    
+    def _flipped(self,window):
+        """
+        Records the time for Kivy to draw the canvas, once the frame is on screen.
+        
+        :param window: the window that was drawn
+        :type window:  ``kivy.core.window.Window``
+        """
+        self._perf.lap('submit',True)
     
     def _setpaths(self):
         """
@@ -364,13 +1098,6 @@ class GameApp(kivy.app.App):
         
         path = os.path.abspath(inspect.getfile(self.__class__))
         path = os.path.dirname(path)
-        
-        GameApp.fonts  = str(os.path.join(path, 'Fonts'))
-        GameApp.sounds = str(os.path.join(path, 'Sounds'))
-        GameApp.images = str(os.path.join(path, 'Images'))
-        
-        import kivy.resources
-        kivy.resources.resource_add_path(GameApp.fonts)
-        kivy.resources.resource_add_path(GameApp.sounds)
-        kivy.resources.resource_add_path(GameApp.images)
+        GameApp.set_resource_path(path)
+        GameApp.build_atlas()
 
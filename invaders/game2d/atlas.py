@@ -0,0 +1,379 @@
+"""
+A module to support texture atlases.
+
+Every texture switch breaks up a batch of drawing instructions.  A texture atlas avoids
+this by packing many small images into one (or a few) large textures.  Each image then
+becomes a named region of an atlas page, and anything that asks for the image by its
+file name gets that region instead of a texture of its own.
+
+The packing is done on the raw pixel data, using NumPy and a small PNG reader, so it
+does not need Kivy (or a window) at all.  The Kivy textures for the pages are only made
+when the first region is requested.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+from .headless import HEADLESS
+import numpy as np
+import struct
+import zlib
+import os
+
+# The number of channels for each PNG color type
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# The signature at the start of every PNG file
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def read_png(filename):
+    """
+    Returns: the pixels of a PNG file as a height x width x 4 array of RGBA bytes
+
+    The first row of the array is the top of the image.  Only 8-bit, non-interlaced
+    images are supported (which includes everything saved by most image editors).
+
+    :param filename: The full path of the PNG file
+    :type filename:  ``str``
+    """
+    with open(filename,'rb') as file:
+        data = file.read()
+    if data[:8] != _PNG_SIGNATURE:
+        raise ValueError('%s is not a PNG file' % repr(filename))
+
+    chunks  = []
+    palette = None
+    alpha   = None
+    pos = 8
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s',data[pos:pos+8])
+        body = data[pos+8:pos+8+length]
+        pos += length+12
+        if kind == b'IHDR':
+            width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB',body)
+        elif kind == b'PLTE':
+            palette = np.frombuffer(body,dtype=np.uint8).reshape(-1,3)
+        elif kind == b'tRNS':
+            alpha = body
+        elif kind == b'IDAT':
+            chunks.append(body)
+        elif kind == b'IEND':
+            break
+
+    if depth != 8 or interlace != 0 or not color in _PNG_CHANNELS:
+        raise ValueError('%s is not an 8-bit, non-interlaced PNG file' % repr(filename))
+
+    bpp = _PNG_CHANNELS[color]
+    raw = np.frombuffer(zlib.decompress(b''.join(chunks)),dtype=np.uint8)
+    raw = raw.reshape(height,width*bpp+1)
+    pixels = _unfilter(raw[:,1:],raw[:,0],bpp)
+
+    # Convert everything to RGBA
+    result = np.empty((height,width,4),dtype=np.uint8)
+    pixels = pixels.reshape(height,width,bpp)
+    if color == 6:
+        result[:] = pixels
+    elif color == 4:
+        result[:,:,:3] = pixels[:,:,:1]
+        result[:,:,3]  = pixels[:,:,1]
+    elif color == 3:
+        table = np.full((256,4),255,dtype=np.uint8)
+        table[:len(palette),:3] = palette
+        if alpha is not None:
+            table[:len(alpha),3] = np.frombuffer(alpha,dtype=np.uint8)
+        result[:] = table[pixels[:,:,0]]
+    else:
+        result[:,:,:3] = pixels
+        result[:,:,3] = 255
+        if alpha is not None:
+            key = np.frombuffer(alpha,dtype='>u2').astype(np.uint8)
+            result[np.all(pixels == key,axis=2),3] = 0
+    return result
+
+
+def write_png(filename,pixels):
+    """
+    Writes an array of RGBA bytes to a PNG file.
+
+    The first row of the array is the top of the image.  The rows are not filtered,
+    so the file is larger than one from an image editor, but it is quick to write.
+
+    :param filename: The full path of the PNG file
+    :type filename:  ``str``
+
+    :param pixels: The image pixels
+    :type pixels:  height x width x 4 array of ``uint8``
+    """
+    height, width = pixels.shape[:2]
+    rows = np.zeros((height,width*4+1),dtype=np.uint8)
+    rows[:,1:] = pixels.reshape(height,width*4)
+
+    def chunk(kind,body):
+        crc = zlib.crc32(kind+body) & 0xffffffff
+        return struct.pack('>I',len(body))+kind+body+struct.pack('>I',crc)
+
+    with open(filename,'wb') as file:
+        file.write(_PNG_SIGNATURE)
+        file.write(chunk(b'IHDR',struct.pack('>IIBBBBB',width,height,8,6,0,0,0)))
+        file.write(chunk(b'IDAT',zlib.compress(rows.tobytes())))
+        file.write(chunk(b'IEND',b''))
+
+
+def _unfilter(rows,filters,bpp):
+    """
+    Returns: the PNG scanlines with their filters undone
+
+    :param rows: The filtered scanlines (without the filter bytes)
+    :type rows:  2d array of ``uint8``
+
+    :param filters: The filter type of each scanline
+    :type filters:  array of ``uint8``
+
+    :param bpp: The number of bytes per pixel
+    :type bpp:  ``int`` > 0
+    """
+    height, stride = rows.shape
+    result = np.zeros((height+1,stride),dtype=np.uint8)
+    for y in range(height):
+        line  = rows[y]
+        prior = result[y].astype(np.int32)
+        kind  = filters[y]
+        if kind == 0:
+            result[y+1] = line
+        elif kind == 1:
+            result[y+1] = np.cumsum(line.reshape(-1,bpp),axis=0,dtype=np.uint8).reshape(-1)
+        elif kind == 2:
+            result[y+1] = line+result[y]
+        elif kind in (3,4):
+            out = np.zeros(stride+bpp,dtype=np.int32)
+            up  = np.zeros(stride+bpp,dtype=np.int32)
+            up[bpp:] = prior
+            for x in range(bpp,stride+bpp):
+                a = out[x-bpp]
+                b = up[x]
+                if kind == 3:
+                    out[x] = (line[x-bpp]+(a+b)//2) & 0xff
+                else:
+                    c = up[x-bpp]
+                    p = a+b-c
+                    pa, pb, pc = abs(p-a), abs(p-b), abs(p-c)
+                    pred = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                    out[x] = (line[x-bpp]+pred) & 0xff
+            result[y+1] = out[bpp:]
+        else:
+            raise ValueError('%s is not a PNG filter type' % repr(kind))
+    return result[1:]
+
+
+def pack(sizes,maxsize=1024,padding=1):
+    """
+    Returns: the positions of rectangles packed into as few pages as possible
+
+    This is a shelf packer.  The rectangles are sorted from tallest to shortest and
+    placed left to right in rows (shelves).  When a shelf is full, a new one starts
+    on top of the tallest rectangle in it.  When a page is full, a new page starts.
+
+    The result is a pair.  The first element is a list with the (page,x,y) position of
+    the top left corner of each rectangle, in the same order as ``sizes``.  Here y is
+    measured from the top of the page.  The second element is a list with the
+    (width,height) of each page, which is only as large as it needs to be.
+
+    :param sizes: The (width,height) of each rectangle
+    :type sizes:  ``list`` of pairs of ``int`` 0..maxsize
+
+    :param maxsize: The maximum width and height of a page
+    :type maxsize:  ``int`` > 0
+
+    :param padding: The empty space to leave around each rectangle
+    :type padding:  ``int`` >= 0
+    """
+    order = sorted(range(len(sizes)),key=lambda i: (-sizes[i][1],-sizes[i][0]))
+    places = [None]*len(sizes)
+    pages  = []
+
+    page = -1
+    x = y = shelf = 0
+    for i in order:
+        width, height = sizes[i]
+        assert width <= maxsize and height <= maxsize, '%s is too big to pack' % repr(sizes[i])
+        if x+width > maxsize:
+            x = 0
+            y += shelf+padding
+            shelf = 0
+        if page < 0 or y+height > maxsize:
+            pages.append([0,0])
+            page += 1
+            x = y = shelf = 0
+        places[i] = (page,x,y)
+        shelf = max(shelf,height)
+        pages[page][0] = max(pages[page][0],x+width)
+        pages[page][1] = max(pages[page][1],y+height)
+        x += width+padding
+
+    return (places,[tuple(size) for size in pages])
+
+
+# #mark -
+class TextureAtlas(object):
+    """
+    A class representing a collection of images packed into a few large textures.
+
+    Each image is a named region of an atlas page.  The pages are stored as arrays of
+    RGBA bytes, so an atlas can be built and inspected without Kivy.  The Kivy textures
+    for the pages are only created the first time :meth:`get_texture` is called.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def pages(self):
+        """
+        The pixels of each atlas page.
+
+        Like in a PNG file, the first row of each page is the top of the page.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a list of height x width x 4 arrays of ``uint8``.
+        """
+        return self._pages
+
+    @property
+    def names(self):
+        """
+        The names of the images in this atlas.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a list of ``str``.
+        """
+        return list(self._regions)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,images,maxsize=1024,padding=1):
+        """
+        Creates an atlas from the given images.
+
+        :param images: The pixels of each image, by name
+        :type images:  ``dict`` of ``str`` to height x width x 4 arrays of ``uint8``
+
+        :param maxsize: The maximum width and height of a page
+        :type maxsize:  ``int`` > 0
+
+        :param padding: The (transparent) space between images, to keep them from
+            bleeding into each other when they are scaled
+        :type padding:  ``int`` >= 0
+        """
+        names = list(images)
+        sizes = [(images[name].shape[1],images[name].shape[0]) for name in names]
+        places, pages = pack(sizes,maxsize,padding)
+
+        self._pages = [np.zeros((height,width,4),dtype=np.uint8) for (width,height) in pages]
+        self._regions = {}
+        for name, size, place in zip(names,sizes,places):
+            page, x, y = place
+            self._pages[page][y:y+size[1],x:x+size[0]] = images[name]
+            self._regions[name] = (page,x,y,size[0],size[1])
+        self._textures = None
+
+    def __contains__(self,name):
+        """
+        :return: True if the atlas has an image with the given name
+        :rtype:  ``bool``
+        """
+        return name in self._regions
+
+    def __len__(self):
+        """
+        :return: The number of images in this atlas
+        :rtype:  ``int``
+        """
+        return len(self._regions)
+
+
+    # CLASS METHODS
+    @classmethod
+    def from_folder(cls,path,maxsize=1024,padding=1):
+        """
+        Returns: an atlas of all of the PNG files in the given folder
+
+        Files that cannot be read (or are larger than a page) are left out.  The images
+        are named by their file names, without the folder.
+
+        :param path: The folder with the images
+        :type path:  ``str``
+
+        :param maxsize: The maximum width and height of a page
+        :type maxsize:  ``int`` > 0
+
+        :param padding: The (transparent) space between images
+        :type padding:  ``int`` >= 0
+        """
+        images = {}
+        for name in sorted(os.listdir(path)):
+            if name.lower().endswith('.png'):
+                try:
+                    pixels = read_png(os.path.join(path,name))
+                except (ValueError, zlib.error):
+                    continue
+                if pixels.shape[0] <= maxsize and pixels.shape[1] <= maxsize:
+                    images[name] = pixels
+        return cls(images,maxsize,padding)
+
+
+    # PUBLIC METHODS
+    def get_region(self,name):
+        """
+        Returns: the (page,x,y,width,height) of the image with the given name
+
+        Unlike :meth:`pack`, y is measured from the bottom of the page, as it is for
+        Kivy textures.
+
+        :param name: The image name
+        :type name:  ``str``
+        """
+        page, x, y, width, height = self._regions[name]
+        return (page,x,self._pages[page].shape[0]-y-height,width,height)
+
+    def get_pixels(self,name):
+        """
+        Returns: the pixels of the image with the given name
+
+        The result is a view into the atlas page, so it should not be modified.
+
+        :param name: The image name
+        :type name:  ``str``
+        """
+        page, x, y, width, height = self._regions[name]
+        return self._pages[page][y:y+height,x:x+width]
+
+    def get_texture(self,name):
+        """
+        Returns: the texture region for the image with the given name
+
+        :param name: The image name
+        :type name:  ``str``
+        """
+        if self._textures is None:
+            self._textures = [_make_texture(pixels) for pixels in self._pages]
+        page, x, y, width, height = self.get_region(name)
+        return self._textures[page].get_region(x,y,width,height)
+
+
+def _make_texture(pixels):
+    """
+    Returns: a texture with the given pixels
+
+    :param pixels: The texture pixels, with the top row first
+    :type pixels:  height x width x 4 array of ``uint8``
+    """
+    height, width = pixels.shape[:2]
+    if HEADLESS:
+        from .headless import Texture
+        return Texture(width,height,pixels=pixels)
+
+    from kivy.graphics.texture import Texture
+    texture = Texture.create(size=(width,height),colorfmt='rgba')
+    # Kivy textures start with the bottom row
+    texture.blit_buffer(np.ascontiguousarray(pixels[::-1]).tobytes(),colorfmt='rgba',bufferfmt='ubyte')
+    return texture
@@ -0,0 +1,412 @@
+"""
+A module to record the frames of a game to disk.
+
+Saving a frame is slow (compressing a PNG takes far longer than a game frame), so it
+cannot happen in the animation loop.  Neither can drawing the frame into an array of
+pixels, which takes several game frames in software.  Instead, the loop only records
+what to draw, and hands that to a writer thread through a bounded queue.  The writer
+draws the frame into a buffer and saves it.  The buffers come from a fixed pool, so
+recording does not allocate a new array every frame.
+
+If the writer cannot keep up, the pool runs out of buffers.  What happens then is the
+capture policy.  With the policy 'drop', the frame is skipped and the game goes on at
+full speed.  With the policy 'block', the game waits for the writer (backpressure), so
+every frame is saved but the game slows down.
+
+The frames can be saved as a sequence of PNG files (:class:`PNGWriter`) or as a single
+stream of raw RGBA frames (:class:`RawWriter`), which tools like ffmpeg can turn into
+a video.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+import numpy as np
+import threading
+import queue
+import os
+
+# The capture policies
+CAPTURE_POLICIES = ('drop', 'block')
+
+
+class FramePool(object):
+    """
+    A class representing a fixed set of reusable frame buffers.
+
+    Each buffer is a height x width x 4 array of RGBA bytes.  A buffer is taken with
+    :meth:`acquire` and returned with :meth:`release`.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def shape(self):
+        """
+        The shape of each buffer.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a (height,width,4) tuple of ``int``.
+        """
+        return self._shape
+
+    @property
+    def available(self):
+        """
+        The number of buffers that are not in use.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._free.qsize()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,width,height,count=4):
+        """
+        Creates a pool of buffers for frames of the given size.
+
+        :param width: the frame width in pixels
+        :type width:  ``int`` > 0
+
+        :param height: the frame height in pixels
+        :type height:  ``int`` > 0
+
+        :param count: the number of buffers
+        :type count:  ``int`` > 0
+        """
+        assert count > 0, 'count %s is not positive' % repr(count)
+        self._shape = (int(height),int(width),4)
+        self._count = count
+        self._free = queue.Queue()
+        for _ in range(count):
+            self._free.put(np.zeros(self._shape,dtype=np.uint8))
+
+    def __len__(self):
+        """
+        :return: The number of buffers (in use or not)
+        :rtype:  ``int``
+        """
+        return self._count
+
+
+    # PUBLIC METHODS
+    def acquire(self,block=True):
+        """
+        Returns: a free buffer, or None if there is none and block is False
+
+        :param block: whether to wait for a buffer to be released
+        :type block:  ``bool``
+        """
+        try:
+            return self._free.get(block)
+        except queue.Empty:
+            return None
+
+    def release(self,buffer):
+        """
+        Returns a buffer to the pool.
+
+        :param buffer: the buffer to return
+        :type buffer:  an array from :meth:`acquire`
+        """
+        self._free.put(buffer)
+
+
+# #mark - Writers
+
+class FrameWriter(object):
+    """
+    A class to save frames, one after the other.
+
+    This is the base class for the writers.  The methods are called on the writer
+    thread of a :class:`FrameCapture`, never on the animation loop.  A subclass must
+    implement :meth:`write`, and may implement :meth:`open` and :meth:`close`.
+    """
+
+    def open(self,width,height):
+        """
+        Prepares to write frames of the given size.
+
+        :param width: the frame width in pixels
+        :type width:  ``int`` > 0
+
+        :param height: the frame height in pixels
+        :type height:  ``int`` > 0
+        """
+        pass
+
+    def write(self,index,pixels):
+        """
+        Saves a single frame.
+
+        :param index: the frame number (frames that were dropped have no number)
+        :type index:  ``int`` >= 0
+
+        :param pixels: the frame, with the top row first
+        :type pixels:  height x width x 4 array of ``uint8``
+        """
+        raise NotImplementedError('%s does not implement write' % type(self).__name__)
+
+    def close(self):
+        """
+        Finishes writing frames.
+        """
+        pass
+
+
+class PNGWriter(FrameWriter):
+    """
+    A class to save frames as a sequence of PNG files in a folder.
+    """
+
+    def __init__(self,folder,pattern='frame%05d.png'):
+        """
+        Creates a writer for the given folder, which is made if it does not exist.
+
+        :param folder: the folder to save the frames in
+        :type folder:  ``str``
+
+        :param pattern: the file name of each frame, given the frame number
+        :type pattern:  ``str`` with a single ``%d`` format
+        """
+        self.folder  = folder
+        self.pattern = pattern
+
+    def open(self,width,height):
+        """
+        Makes the folder for the frames.
+        """
+        os.makedirs(self.folder,exist_ok=True)
+
+    def write(self,index,pixels):
+        """
+        Saves a frame as a PNG file.
+        """
+        from .atlas import write_png
+        write_png(os.path.join(self.folder,self.pattern % index),pixels)
+
+
+class RawWriter(FrameWriter):
+    """
+    A class to save frames as a single stream of raw RGBA bytes.
+
+    Every frame is width*height*4 bytes, with the top row first.  The stream has no
+    header, so you need the frame size and rate to play it.  For example, ffmpeg can
+    turn a stream of 800x700 frames at 60 fps into a video with::
+
+        ffmpeg -f rawvideo -pix_fmt rgba -s 800x700 -r 60 -i frames.raw video.mp4
+    """
+
+    def __init__(self,filename):
+        """
+        Creates a writer for the given file.
+
+        :param filename: the file to write (or a binary file object)
+        :type filename:  ``str`` or file
+        """
+        self.filename = filename
+        self._file = None
+
+    def open(self,width,height):
+        """
+        Opens the file for the stream.
+        """
+        if isinstance(self.filename,str):
+            self._file = open(self.filename,'wb')
+        else:
+            self._file = self.filename
+
+    def write(self,index,pixels):
+        """
+        Appends a frame to the stream.
+        """
+        self._file.write(pixels.data)
+
+    def close(self):
+        """
+        Closes the file (if the writer opened it).
+        """
+        if isinstance(self.filename,str) and self._file is not None:
+            self._file.close()
+        self._file = None
+
+
+# #mark -
+class FrameCapture(object):
+    """
+    A class to record frames on a background thread.
+
+    Each call to :meth:`submit` takes a buffer from the pool and puts it on the queue
+    for the writer thread, along with the function to fill it.  The writer fills the
+    buffer, saves the frame and returns the buffer to the pool.  As there are only as
+    many buffers as the pool holds, the queue can never hold more frames than that.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def policy(self):
+        """
+        What to do when there is no free buffer: 'drop' or 'block'.
+
+        **Immutable**: This value cannot be altered.
+        """
+        return self._policy
+
+    @property
+    def captured(self):
+        """
+        The number of frames handed to the writer.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._captured
+
+    @property
+    def dropped(self):
+        """
+        The number of frames skipped because the writer was behind.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._dropped
+
+    @property
+    def written(self):
+        """
+        The number of frames saved by the writer so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._written
+
+    @property
+    def running(self):
+        """
+        Whether the writer thread is running.
+
+        **Immutable**: This value cannot be altered.
+        """
+        return self._thread is not None
+
+
+    # BUILT-IN METHODS
+    def __init__(self,writer,width,height,policy='drop',buffers=4):
+        """
+        Creates (but does not start) a capture of frames of the given size.
+
+        :param writer: the writer to save the frames
+        :type writer:  :class:`FrameWriter`
+
+        :param width: the frame width in pixels
+        :type width:  ``int`` > 0
+
+        :param height: the frame height in pixels
+        :type height:  ``int`` > 0
+
+        :param policy: what to do when there is no free buffer
+        :type policy:  one of 'drop' or 'block'
+
+        :param buffers: the number of frame buffers
+        :type buffers:  ``int`` > 0
+        """
+        assert policy in CAPTURE_POLICIES, 'policy %s is not valid' % repr(policy)
+        self._writer = writer
+        self._policy = policy
+        self._pool   = FramePool(width,height,buffers)
+        self._queue  = queue.Queue(buffers+1)
+        self._thread = None
+        self._error  = None
+        self._captured = 0
+        self._dropped  = 0
+        self._written  = 0
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts the writer thread.
+        """
+        if self._thread is None:
+            height, width = self._pool.shape[:2]
+            self._writer.open(width,height)
+            self._thread = threading.Thread(target=self._run,name='FrameCapture',daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Waits for the writer to save the frames in the queue, then stops the thread.
+
+        :raise: any exception raised by the writer while saving the frames
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+            self._writer.close()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self,grab):
+        """
+        Captures a single frame.
+
+        The function ``grab`` is called later, on the writer thread, with a buffer from
+        the pool, and it must draw the frame into that buffer.  So it must not depend on
+        anything the game changes after this call (see :meth:`GView.snapshot`).  If
+        there is no free buffer, the frame is either dropped or this method waits for
+        one, depending on the policy.
+
+        If ``grab`` raises an exception, the frame is not saved, and the exception is
+        raised by :meth:`stop`.
+
+        :param grab: the function to draw the frame
+        :type grab:  callable taking a height x width x 4 array of ``uint8``
+
+        :return: True if the frame was captured; False if it was dropped
+        :rtype:  ``bool``
+        """
+        if self._thread is None or self._error is not None:
+            self._dropped += 1
+            return False
+
+        buffer = self._pool.acquire(self._policy == 'block')
+        if buffer is None:
+            self._dropped += 1
+            return False
+
+        self._queue.put((self._captured,grab,buffer))
+        self._captured += 1
+        return True
+
+
+    # HIDDEN METHODS
+    def _run(self):
+        """
+        Saves the frames in the queue until told to stop.
+
+        This is the body of the writer thread.  If a frame cannot be drawn or written,
+        the thread remembers the error (for :meth:`stop`) and keeps emptying the queue,
+        so the game is never left waiting for a buffer.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            index, grab, buffer = item
+            try:
+                if self._error is None:
+                    grab(buffer)
+                    self._writer.write(index,buffer)
+                    self._written += 1
+            except Exception as e:
+                self._error = e
+            finally:
+                self._pool.release(buffer)
@@ -0,0 +1,373 @@
+"""
+A module to support batched drawing of many images.
+
+Drawing a :class:`GImage` takes a handful of graphics instructions (a transform, a
+color and a textured rectangle).  That is fine for a few images, but it adds up quickly
+when there are hundreds of them.  This module draws all images that share a texture as
+a single triangle mesh.  Moving an image just changes a few numbers in the vertex array
+of the mesh, and it is always the same (small) number of instructions to draw the batch.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .gobject import GObject, shared_color
+from .app import GameApp
+import numpy as np
+
+# The x and y direction of each corner of a quad, counter-clockwise from bottom left
+_CORNER_X = np.array([-1,1,1,-1],dtype=np.float32)
+_CORNER_Y = np.array([-1,-1,1,1],dtype=np.float32)
+
+# The two triangles of a quad, as indices into its corners
+_QUAD = [0,1,2,2,3,0]
+
+
+class _MeshLayer(object):
+    """
+    A class representing all of the images in a batch that share a texture.
+
+    The vertex array has four vertices (one per corner) for every image, and each
+    vertex is a position followed by a texture coordinate.  The arrays are allocated
+    with extra room, and they double in size when they run out of room, so adding n
+    images takes O(n) time.  New images are only sent to the mesh by :meth:`commit`.
+
+    INSTANCE ATTRIBUTES:
+        mesh:     the mesh drawing the images [Mesh]
+        vertices: the vertex data [capacity x 4 x 4 array of float32]
+        indices:  the two triangles of each image, as vertex indices [capacity x 6 
+                  array of int]
+        sprites:  the batch index of each image in this layer, in the first count 
+                  entries [capacity array of int]
+        count:    the number of images in this layer [int >= 0]
+        sent:     the number of images whose triangles the mesh has [int >= 0]
+    """
+
+    __slots__ = ('mesh','vertices','indices','sprites','count','sent')
+
+    def __init__(self,texture,capacity=16):
+        """
+        Creates a new, empty layer for the given texture
+
+        :param texture: the texture shared by the images
+        :type texture:  ``Texture``
+
+        :param capacity: the initial number of images to make room for
+        :type capacity:  ``int`` > 0
+        """
+        self.vertices = np.zeros((capacity,4,4),dtype=np.float32)
+        self.indices  = np.zeros((capacity,6),dtype=int)
+        self.sprites  = np.zeros(capacity,dtype=int)
+        self.count = 0
+        self.sent  = 0
+        self.mesh = Mesh(vertices=self.vertices.reshape(-1),indices=[],
+                         mode='triangles',texture=texture)
+
+    def append(self,index,coords):
+        """
+        Returns: the position of a new image in this layer
+
+        The image is not drawn until the next :meth:`commit`.
+
+        :param index: the batch index of the image
+        :type index:  ``int`` >= 0
+
+        :param coords: the texture coordinates of the image corners
+        :type coords:  8-element sequence of ``float``
+        """
+        if self.count == len(self.vertices):
+            self.vertices = self._grow(self.vertices)
+            self.indices  = self._grow(self.indices)
+            self.sprites  = self._grow(self.sprites)
+
+        slot = self.count
+        self.vertices[slot,:,2:] = np.reshape(coords,(4,2))
+        self.indices[slot] = _QUAD
+        self.indices[slot] += 4*slot
+        self.sprites[slot] = index
+        self.count += 1
+        return slot
+
+    def commit(self):
+        """
+        Sends the vertex array (and any new triangles) to the mesh after it has changed.
+        """
+        if self.sent != self.count:
+            self.mesh.indices = self.indices[:self.count].reshape(-1).tolist()
+            self.sent = self.count
+        self.mesh.vertices = self.vertices.reshape(-1)
+
+    def _grow(self,array):
+        """
+        Returns: a copy of the array with twice as many rows
+
+        :param array: the array to grow
+        :type array:  NumPy array with ``count`` rows
+        """
+        grown = np.zeros((2*len(array),)+array.shape[1:],dtype=array.dtype)
+        grown[:self.count] = array[:self.count]
+        return grown
+
+
+# #mark -
+class GSpriteBatch(GObject):
+    """
+    A class representing a collection of images drawn together.
+
+    You add images to the batch with :meth:`add`, which returns the index of the new
+    image.  You then use this index to move, hide or show the image.  Images cannot be
+    removed from a batch, but a hidden image is not drawn.  The positions of the images
+    are relative to the position of the batch itself, which is (0,0) by default.
+
+    To add many images at once, use :meth:`extend`.  Each :meth:`add` copies the
+    position arrays and sends the vertices of the whole batch again, while
+    :meth:`extend` only does this once.
+
+    Images that share a texture (the same source file, or regions of the same atlas 
+    page) are drawn as one mesh, so a batch is only a few instructions no matter how 
+    many images it has.  If you define ``fillcolor``, the
+    batch will tint all of its images by the given color.
+
+    Unlike :class:`GImage`, the images cannot be rotated or scaled individually, and
+    :meth:`contains` treats the batch as a single (1x1) rectangle.
+    """
+
+    __slots__ = ('_layers','_order','_layer','_slot','_x','_y','_halfw','_halfh','_visible')
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def count(self):
+        """
+        The number of images in this batch (visible or not).
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return len(self._layer)
+
+
+    # BUILT-IN METHODS
+    def __init__(self,**keywords):
+        """
+        Creates a new, empty batch of images
+
+        This class supports the same keywords as :class:`GObject`, though ``width``,
+        ``height`` and ``linecolor`` have no effect on the drawing.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        self._defined = False
+        self._layers  = {}
+        self._order   = []
+        self._layer   = []
+        self._slot    = []
+        self._x = np.zeros(0,dtype=np.float32)
+        self._y = np.zeros(0,dtype=np.float32)
+        self._halfw = np.zeros(0,dtype=np.float32)
+        self._halfh = np.zeros(0,dtype=np.float32)
+        self._visible = np.zeros(0,dtype=bool)
+        GObject.__init__(self,**keywords)
+        self._reset()
+        self._defined = True
+
+
+    # PUBLIC METHODS
+    def add(self,source,x,y,width,height):
+        """
+        Adds a new (visible) image to this batch.
+
+        :param source: the image file, which must be in the **Images** directory
+        :type source:  ``str``
+
+        :param x: the x-coordinate of the image center
+        :type x:  ``int`` or ``float``
+
+        :param y: the y-coordinate of the image center
+        :type y:  ``int`` or ``float``
+
+        :param width: the width of the image
+        :type width:  ``int`` or ``float`` >= 0
+
+        :param height: the height of the image
+        :type height:  ``int`` or ``float`` >= 0
+
+        :return: the index of the new image
+        :rtype:  ``int``
+        """
+        return self.extend([source],[x],[y],[width],[height])[0]
+
+    def extend(self,sources,x,y,width,height):
+        """
+        Adds several new (visible) images to this batch.
+
+        Image i has the file sources[i], the center (x[i],y[i]) and the size
+        (width[i],height[i]).  The batch is only sent to the meshes once, so this
+        takes time proportional to the size of the batch.
+
+        :param sources: the image files, which must be in the **Images** directory
+        :type sources:  sequence of ``str``
+
+        :param x: the x-coordinates of the image centers
+        :type x:  sequence (or NumPy array) of ``len(sources)`` numbers
+
+        :param y: the y-coordinates of the image centers
+        :type y:  sequence (or NumPy array) of ``len(sources)`` numbers
+
+        :param width: the widths of the images
+        :type width:  sequence (or NumPy array) of ``len(sources)`` numbers >= 0
+
+        :param height: the heights of the images
+        :type height:  sequence (or NumPy array) of ``len(sources)`` numbers >= 0
+
+        :return: the indices of the new images
+        :rtype:  ``range``
+        """
+        count = len(sources)
+        assert len(x) == count and len(y) == count, 'positions do not match sources'
+        assert len(width) == count and len(height) == count, 'sizes do not match sources'
+        start = len(self._layer)
+        for pos in range(count):
+            source = sources[pos]
+            assert GameApp.is_image(source), '%s is not an image file' % repr(source)
+            texture = GameApp.load_texture(source)
+            assert texture is not None, 'Failed to load %s' % repr(source)
+
+            # Regions of the same texture (e.g. an atlas) share its id, and so a mesh
+            owner = texture.id
+            if not owner in self._layers:
+                self._layers[owner] = _MeshLayer(texture)
+                self._order.append(owner)
+                if self._defined:
+                    self._reset()
+
+            layer = self._layers[owner]
+            self._layer.append(layer)
+            self._slot.append(layer.append(start+pos,texture.tex_coords))
+
+        self._x = np.concatenate((self._x,np.asarray(x,dtype=np.float32)))
+        self._y = np.concatenate((self._y,np.asarray(y,dtype=np.float32)))
+        halfw = (np.asarray(width,dtype=float)/2.0).astype(np.float32)
+        halfh = (np.asarray(height,dtype=float)/2.0).astype(np.float32)
+        self._halfw = np.concatenate((self._halfw,halfw))
+        self._halfh = np.concatenate((self._halfh,halfh))
+        self._visible = np.concatenate((self._visible,np.ones(count,dtype=bool)))
+        self._update_all()
+        return range(start,start+count)
+
+    def move(self,index,x,y):
+        """
+        Moves the image with the given index.
+
+        :param index: the image index
+        :type index:  ``int`` 0..count-1
+
+        :param x: the new x-coordinate of the image center
+        :type x:  ``int`` or ``float``
+
+        :param y: the new y-coordinate of the image center
+        :type y:  ``int`` or ``float``
+        """
+        self._x[index] = x
+        self._y[index] = y
+        self._update(index)
+
+    def place(self,x,y):
+        """
+        Moves every image in this batch at once.
+
+        The position of image i is (x[i],y[i]).  This is much faster than calling
+        :meth:`move` on each image.
+
+        :param x: the new x-coordinates of the image centers
+        :type x:  sequence (or NumPy array) of ``count`` numbers
+
+        :param y: the new y-coordinates of the image centers
+        :type y:  sequence (or NumPy array) of ``count`` numbers
+        """
+        self._x[:] = x
+        self._y[:] = y
+        self._update_all()
+
+    def hide(self,index):
+        """
+        Stops drawing the image with the given index.
+
+        :param index: the image index
+        :type index:  ``int`` 0..count-1
+        """
+        self._visible[index] = False
+        self._update(index)
+
+    def show(self,index):
+        """
+        Resumes drawing the image with the given index.
+
+        :param index: the image index
+        :type index:  ``int`` 0..count-1
+        """
+        self._visible[index] = True
+        self._update(index)
+
+    def is_visible(self,index):
+        """
+        Checks whether the image with the given index is drawn.
+
+        :param index: the image index
+        :type index:  ``int`` 0..count-1
+
+        :return: True if the image is visible; False if it is hidden
+        :rtype:  ``bool``
+        """
+        return bool(self._visible[index])
+
+
+    # HIDDEN METHODS
+    def _update(self,index):
+        """
+        Recomputes the corners of a single image in its mesh.
+
+        A hidden image has all four corners at its center, so it has no area.
+
+        :param index: the image index
+        :type index:  ``int`` 0..count-1
+        """
+        layer = self._layer[index]
+        quad  = layer.vertices[self._slot[index]]
+        shown = self._visible[index]
+        quad[:,0] = self._x[index]+self._halfw[index]*shown*_CORNER_X
+        quad[:,1] = self._y[index]+self._halfh[index]*shown*_CORNER_Y
+        layer.commit()
+
+    def _update_all(self):
+        """
+        Recomputes the corners of every image, and sends each mesh its vertices once.
+        """
+        halfw = self._halfw*self._visible
+        halfh = self._halfh*self._visible
+        for owner in self._order:
+            layer = self._layers[owner]
+            ids = layer.sprites[:layer.count]
+            quads = layer.vertices[:layer.count]
+            quads[:,:,0] = self._x[ids,np.newaxis]+halfw[ids,np.newaxis]*_CORNER_X
+            quads[:,:,1] = self._y[ids,np.newaxis]+halfh[ids,np.newaxis]*_CORNER_Y
+            layer.commit()
+
+    def _reset(self):
+        """
+        Resets the drawing cache.
+        """
+        GObject._reset(self)
+        if not self._fillcolor is None:
+            self._cache.add(self._fillcolor)
+        else:
+            self._cache.add(shared_color((1,1,1,1)))
+        for owner in self._order:
+            self._cache.add(self._layers[owner].mesh)
+        self._cache.add(PopMatrix())
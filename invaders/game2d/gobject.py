@@ -8,9 +8,14 @@ These classes will not work unless you adhere to proper subclassing practices.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
 from cornell import Point2, Matrix
+from .affine import Affine
 
 def is_color(c):
     """
@@ -27,14 +32,38 @@ def is_color(c):
     :type c:  any
     """
     import cornell
-    if type(c) in [cornell.RGB, cornell.HSV]:
+    try:
+        cornell.glcolor(c)
         return True
+    except ValueError:
+        return False
+
+
+# The Color instructions shared by every object, by their RGBA tuple
+_COLOR_CACHE = {}
+
+def shared_color(c):
+    """
+    Returns a Kivy Color instruction for the given color value.
     
-    if type(c) in [tuple, list] and 3 <= len(c) <= 4:
-        from functools import reduce
-        return reduce(lambda x, y: x and y, map(lambda z: type(z) in [int, float] and 0 <= z <= 1, c))
+    The value is converted with ``cornell.glcolor``, which remembers the conversion of
+    every string and tuple.  Every object with the same color shares the same Color 
+    instruction, so setting a color is (usually) just two dictionary lookups.  The 
+    instruction must never be changed, as that would change every object using it.
+    
+    :return: the Color instruction for c
+    :rtype:  ``Color``
     
-    return type(c) == str and cornell.is_tkcolor(c)
+    :param c: The color value
+    :type c:  a value for which :func:`is_color` is True
+    """
+    import cornell
+    rgba = cornell.glcolor(c)
+    color = _COLOR_CACHE.get(rgba)
+    if color is None:
+        color = Color(*rgba)
+        _COLOR_CACHE[rgba] = color
+    return color
 
 
 def is_num_tuple(t,size):
@@ -90,6 +119,12 @@ class GObject(object):
     :class:`GTriangle`, :class:`GPolygon`, or :class:`GPath`.
     """
     
+    # The attributes are slots, which keeps every object small.  A subclass that
+    # does not define __slots__ gets a __dict__, so it can still add attributes.
+    __slots__ = ('_defined','_group','_cache','_trans','_offset','_rotate','_scale',
+                 '_width','_height','_fillcolor','_linecolor','_name','_pastx','_pasty',
+                 '_mtrue','_affine','_affinv','_aabb','_mstale','_matrix','_invrse')
+    
     # MUTABLE PROPERTIES 
     @property
     def x(self):
@@ -137,8 +172,9 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._width = float(value)
+        self._mtrue = False
         if self._defined:
-            self._reset()
+            self._resize()
     
     @property
     def height(self):
@@ -156,8 +192,9 @@ class GObject(object):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
         assert value > 0, '%s is not positive' % repr(value)
         self._height = float(value)
+        self._mtrue = False
         if self._defined:
-            self._reset()
+            self._resize()
     
     @property
     def scale(self):
@@ -203,9 +240,9 @@ class GObject(object):
     @angle.setter
     def angle(self,value):
         assert type(value) in [int,float], '%s is not a number' % repr(value)
-        diff = np.allclose([self._rotate.angle],[value])
-        self._rotate.angle = float(value)
-        if not diff:
+        value = float(value)
+        if value != self._rotate.angle:
+            self._rotate.angle = value
             self._mtrue = False
     
     @property
@@ -229,21 +266,10 @@ class GObject(object):
     
     @linecolor.setter
     def linecolor(self,value):
-        import cornell
         assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [cornell.RGB, cornell.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = cornell.RGB.CreateWebColor(value).glColor()
-            else:
-                value = cornell.RGB.CreateName(value).glColor()
-        
-        self._linecolor = None if value is None else Color(value[0],value[1],value[2],value[3])
+        self._linecolor = None if value is None else shared_color(value)
         if self._defined:
-            self._reset()
+            self._reline()
             
     @property
     def fillcolor(self):
@@ -267,21 +293,10 @@ class GObject(object):
     
     @fillcolor.setter
     def fillcolor(self,value):
-        import cornell
         assert value is None or is_color(value), '%s is not a valid color' % repr(value)
-        if type(value) in [tuple, list] and len(value) == 3:
-            value = list(value)+[1.0]
-        elif type(value) in [cornell.RGB, cornell.HSV]:
-            value = value.glColor()
-        elif type(value) == str:
-            if value[0] == '#':
-                value = cornell.RGB.CreateWebColor(value).glColor()
-            else:
-                value = cornell.RGB.CreateName(value).glColor()
-        
-        self._fillcolor = None if value is None else Color(value[0],value[1],value[2],value[3])
+        self._fillcolor = None if value is None else shared_color(value)
         if self._defined:
-            self._reset()
+            self._refill()
     
     @property
     def name(self):
@@ -313,18 +328,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.x-self.width/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self._bounds()[0]
     
     @left.setter
     def left(self,value):
@@ -343,18 +352,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.x+self.width/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self._bounds()[2]
     
     @right.setter
     def right(self,value):
@@ -373,18 +376,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.y+self.height/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self._bounds()[3]
     
     @top.setter
     def top(self,value):
@@ -404,18 +401,12 @@ class GObject(object):
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **invariant**: Value must be an ``int`` or ``float``.
         """
         if self._rotate.angle == 0.0:
             return self.y-self.height/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self._bounds()[1]
     
     
     @bottom.setter
@@ -436,7 +427,9 @@ class GObject(object):
         
         **invariant**: Either a :class:`Matrix` or ``None``
         """
-        if not self._mtrue or self._matrix is None:
+        if not self._mtrue:
+            self._build_affine()
+        if self._mstale:
             self._build_matrix()
         return self._matrix
     
@@ -450,7 +443,9 @@ class GObject(object):
         
         **invariant**: Either a :class:`Matrix` or ``None``
         """
-        if not self._mtrue or self._matrix is None:
+        if not self._mtrue:
+            self._build_affine()
+        if self._mstale:
             self._build_matrix()
         return self._invrse
     
@@ -479,10 +474,20 @@ class GObject(object):
         # Set the properties.
         self._defined = False
         
+        # The canvas slot for this object, which survives changes to the drawing cache
+        self._group = InstructionGroup()
+        
         # Create the Kivy transforms for position and size
         self._trans  = Translate(0,0,0)
+        self._offset = Translate(0,0,0)
         self._rotate = Rotate(angle=0,axis=(0,0,1))
         self._scale  = Scale(1,1,1)
+        self._mtrue  = False
+        
+        # The 4x4 matrices are made the first time that they are needed
+        self._matrix = None
+        self._invrse = None
+        self._mstale = True
         
         # Now update these with the keywords; size first
         try:
@@ -516,6 +521,9 @@ class GObject(object):
         
         # Add a name for debugging
         self.name = keywords['name'] if 'name' in keywords else None
+        
+        # Nothing to interpolate from yet
+        self.snapshot()
     
     def __str__(self):
         """
@@ -544,8 +552,6 @@ class GObject(object):
         
         By default, this method just checks the bounding box of the shape.
         
-        **Warning**: Using this method on a rotated object may slow down your framerate.
-        
         :param point: the point to check
         :type point: :class:`Point2` or a pair of numbers
         
@@ -559,9 +565,39 @@ class GObject(object):
         if self._rotate.angle == 0.0:
             return abs(point[0]-self.x) < self.width/2.0 and abs(point[1]-self.y) < self.height/2.0
         
-        p = self.matrix.inverse()._transform(point[0],point[1])
+        if not self._mtrue:
+            self._build_affine()
+        p = self._affinv.transform(point[0],point[1])
         return abs(p[0]) < self.width/2.0 and abs(p[1]) < self.height/2.0
     
+    def snapshot(self):
+        """
+        Records the current position as the previous simulation step.
+        
+        Call this at the start of an update, before moving the object.  See the method
+        :meth:`interpolate` for why you would want to do this.
+        """
+        self._pastx = self._trans.x
+        self._pasty = self._trans.y
+        self._offset.x = 0
+        self._offset.y = 0
+    
+    def interpolate(self,alpha):
+        """
+        Draws this object part of the way from its snapshot position to its position.
+        
+        When the window refreshes faster than the game updates, an object that moves 
+        every update will appear to stutter.  This method fixes that.  The object is 
+        drawn at the position ``alpha`` of the way from the position recorded by the 
+        last call to :meth:`snapshot` to its current position.  This only affects 
+        drawing; the attributes ``x`` and ``y`` are unchanged.
+        
+        :param alpha: the fraction of the way to the current position
+        :type alpha:  ``float`` in 0..1
+        """
+        self._offset.x = (self._pastx-self._trans.x)*(1-alpha)
+        self._offset.y = (self._pasty-self._trans.y)*(1-alpha)
+    
     def transform(self,point):
         """
         Transforms the point to the local coordinate system
@@ -578,11 +614,13 @@ class GObject(object):
         :rtype:  :class:`Point2`
         """
         if isinstance(point,Point2):
-            return self.inverse.transform(point)
-        else:
-            assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
-            p = self.inverse._transform(point[0],point[2])
-            return Point2(p[0],p[1])
+            point = (point.x,point.y)
+        assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
+        
+        if not self._mtrue:
+            self._build_affine()
+        p = self._affinv.transform(point[0],point[1])
+        return Point2._make(p[0],p[1])
     
     def draw(self, view):
         """
@@ -602,26 +640,118 @@ class GObject(object):
     def _reset(self):
         """
         Resets the drawing cache.
+        
+        The new cache replaces the old one in the canvas slot, so any view that this 
+        object is registered with (see :meth:`GView.add`) draws the new cache.
         """
         self._cache = InstructionGroup()
+        self._group.clear()
+        self._group.add(self._cache)
         self._cache.add(PushMatrix())
         self._cache.add(self._trans)
+        self._cache.add(self._offset)
         self._cache.add(self._rotate)
         self._cache.add(self._scale)
     
+    def _resize(self):
+        """
+        Updates the drawing cache after a change to the width or height.
+        
+        By default this rebuilds the cache with :meth:`_reset`.  Subclasses that keep 
+        handles to their instructions should override this to patch them in place.
+        """
+        self._reset()
+    
+    def _refill(self):
+        """
+        Updates the drawing cache after a change to the fill color.
+        
+        By default this rebuilds the cache with :meth:`_reset`.  Subclasses that keep 
+        handles to their instructions should override this to patch them in place.
+        """
+        self._reset()
+    
+    def _reline(self):
+        """
+        Updates the drawing cache after a change to the line color or line width.
+        
+        By default this rebuilds the cache with :meth:`_reset`.  Subclasses that keep 
+        handles to their instructions should override this to patch them in place.
+        """
+        self._reset()
+    
+    def _add_color(self,color):
+        """
+        Adds a color to the drawing cache, and returns the slot holding it.
+        
+        The slot is a group with just the given Color instruction.  As Color 
+        instructions are shared (see :func:`shared_color`), they cannot be changed.  To 
+        change the color later, use :meth:`_set_color` to swap the instruction in the slot.
+        
+        :param color: the color to add
+        :type color:  ``Color``
+        
+        :return: the slot holding the color
+        :rtype:  ``InstructionGroup``
+        """
+        slot = InstructionGroup()
+        slot.add(color)
+        self._cache.add(slot)
+        return slot
+    
+    def _set_color(self,slot,color):
+        """
+        Replaces the color in a slot created by :meth:`_add_color`.
+        
+        :param slot: the slot to change
+        :type slot:  ``InstructionGroup``
+        
+        :param color: the new color
+        :type color:  ``Color``
+        """
+        slot.clear()
+        slot.add(color)
+    
+    def _build_affine(self):
+        """
+        Builds the 2D transforms and the bounding box after a settings change.
+        
+        These are used for the bounds and for hit tests.  The (slower) 4x4 matrices 
+        are only rebuilt when they are asked for.
+        """
+        self._affine = Affine.compose(self._trans.x,self._trans.y,self._rotate.angle,
+                                      self._scale.x,self._scale.y)
+        self._affinv = self._affine.inverse()
+        self._aabb   = self._affine.bounds(self.width,self.height)
+        self._mstale = True
+        self._mtrue  = True
+    
+    def _bounds(self):
+        """
+        Returns the bounding box of this shape as (left,bottom,right,top).
+        
+        The box is cached until the position, size, angle or scale changes.
+        
+        :return: the bounding box of this shape
+        :rtype:  4-element ``tuple`` of ``float``
+        """
+        if not self._mtrue:
+            self._build_affine()
+        return self._aabb
+    
     def _build_matrix(self):
         """
         Builds the transform matrices after a settings change.
+        
+        The matrices are reused, so this does not allocate after the first time.
         """
-        self._matrix = Matrix()
-        self._matrix.translate(self._trans.x,self._trans.y)
-        self._matrix.rotate(self._rotate.angle)
-        self._matrix.scale(self._scale.x,self._scale.y)
-        self._invrse = Matrix()
-        self._invrse.scale(1.0/self._scale.x,1.0/self._scale.y)
-        self._invrse.rotate(-self._rotate.angle)
-        self._invrse.translate(-self._trans.x,-self._trans.y)
-        self._mtrue = True
+        if self._matrix is None:
+            self._matrix = Matrix()
+            self._invrse = Matrix()
+        args = (self._trans.x,self._trans.y,self._rotate.angle,self._scale.x,self._scale.y)
+        self._matrix.set_trs(*args)
+        self._invrse.set_trs_inverse(*args)
+        self._mstale = False
 
 
 # #mark -
@@ -643,6 +773,8 @@ class GScene(GObject):
     All objects stored in a ``GScene`` are drawn as if the point (x,y) is the origin.
     """
     
+    __slots__ = ('_children',)
+    
     # MUTABLE PROPERTIES
     @property
     def children(self):
@@ -755,11 +887,25 @@ class GScene(GObject):
     
     
     # HIDDEN METHODS
+    def _bounds(self):
+        """
+        Returns the bounding box of this scene as (left,bottom,right,top).
+        
+        The size of a scene depends on its children, which can change without the 
+        scene knowing.  So only the transform is cached, not the box.
+        
+        :return: the bounding box of this scene
+        :rtype:  4-element ``tuple`` of ``float``
+        """
+        if not self._mtrue:
+            self._build_affine()
+        return self._affine.bounds(self.width,self.height)
+    
     def _reset(self):
         """
         Resets the drawing cache
         """
         GObject._reset(self)
         for x in self.children:
-            self._cache.add(x._cache)
+            self._cache.add(x._group)
         self._cache.add(PopMatrix())
\ No newline at end of file
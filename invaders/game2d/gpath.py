@@ -8,8 +8,12 @@ Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 # Lower-level kivy modules to support animation
-from kivy.graphics import *
-from kivy.graphics.instructions import *
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
 from .gobject import GObject
 
 
@@ -104,6 +108,8 @@ class GPath(GObject):
     in the path, shifting the path accordingly.
     """
     
+    __slots__ = ('_points','_linewidth','_line','_lineslot')
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
@@ -139,7 +145,7 @@ class GPath(GObject):
         assert value >= 0, 'value %s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            self._reline()
     
     
     # IMMUTABLE PROPERTIES
@@ -255,11 +261,25 @@ class GPath(GObject):
         Resets the drawing cache
         """
         GObject._reset(self)
+        self._line = None
+        self._lineslot = None
         if not self._linecolor is None:
-            self._cache.add(self._linecolor)
-            line = Line(points=self.points,cap='round',joint='round',width=self.linewidth)
-            self._cache.add(line)
+            self._lineslot = self._add_color(self._linecolor)
+            self._line = Line(points=self.points,cap='round',joint='round',width=self.linewidth)
+            self._cache.add(self._line)
         self._cache.add(PopMatrix())
+    
+    def _reline(self):
+        """
+        Updates the drawing cache after a change to the line color or line width.
+        
+        The cache is only rebuilt if the line appears or disappears.
+        """
+        if self._lineslot is None or self._linecolor is None or self.linewidth == 0:
+            self._reset()
+        else:
+            self._set_color(self._lineslot,self._linecolor)
+            self._line.width = self.linewidth
 
 
 # #mark -
@@ -281,6 +301,8 @@ class GTriangle(GPath):
     `height` are immutable, and are computed directly from the points
     """
     
+    __slots__ = ('_fillslot',)
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
@@ -360,15 +382,26 @@ class GTriangle(GPath):
             # Need to tack on degenerate texture coords
             vertices += self.points[2*x:2*x+2]+(0,0)
         mesh = Mesh(vertices=vertices, indices=range(3), mode='triangle_strip')
-        self._cache.add(self._fillcolor)
+        self._fillslot = self._add_color(self._fillcolor)
         self._cache.add(mesh)
         
+        self._line = None
+        self._lineslot = None
         if self.linewidth > 0:
-            line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
+            self._lineslot = self._add_color(self._linecolor)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _refill(self):
+        """
+        Updates the drawing cache after a change to the fill color.
+        """
+        if self._fillcolor is None:
+            self._reset()
+        else:
+            self._set_color(self._fillslot,self._fillcolor)
 
 
 # #mark -
@@ -398,6 +431,8 @@ class GPolygon(GPath):
     are computed directly from the points
     """
     
+    __slots__ = ('_fillslot','_mesh','_source','_source_width','_source_height')
+    
     # MUTABLE PROPERTIES
     @property
     def points(self):
@@ -578,14 +613,19 @@ class GPolygon(GPath):
         GObject._reset(self)
         self._make_mesh()
         
-        self._cache.add(self._fillcolor)
+        self._fillslot = self._add_color(self._fillcolor)
         self._cache.add(self._mesh)
         
+        self._line = None
+        self._lineslot = None
         if self.linewidth > 0:
-            line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(points=self.points,joint='miter',close=True,width=self.linewidth)
+            self._lineslot = self._add_color(self._linecolor)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    # A polygon is filled just like a triangle
+    _refill = GTriangle._refill
 
 
@@ -8,11 +8,15 @@ to draw shapes.
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.uix.label import Label
-from kivy.uix.image import Image
-from .gobject import GObject
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+    from kivy.uix.image import Image
+from .gobject import GObject, shared_color, is_num_tuple
+from cornell import Point2
 from .app import GameApp
 
 class GRectangle(GObject):
@@ -29,6 +33,8 @@ class GRectangle(GObject):
     the border around the rectangle.  For all other properties, see the documentation
     for :class:`GObject`."""
     
+    __slots__ = ('_linewidth','_fill','_fillslot','_line','_lineslot')
+    
     # MUTABLE PROPERTIES 
     @property
     def linewidth(self):
@@ -47,7 +53,7 @@ class GRectangle(GObject):
         assert value >= 0, '%s is negative' % repr(value)
         self._linewidth = value
         if self._defined:
-            self._reset()
+            self._reline()
     
     
     # BUILT-IN METHODS
@@ -84,18 +90,58 @@ class GRectangle(GObject):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        # Keep the instructions so that changes can patch them in place
+        self._fill = None
+        self._fillslot = None
         if not self._fillcolor is None:
-            fill = Rectangle(pos=(x,y), size=(self.width, self.height))
-            self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._fill = Rectangle(pos=(x,y), size=(self.width, self.height))
+            self._fillslot = self._add_color(self._fillcolor)
+            self._cache.add(self._fill)
         
+        self._line = None
+        self._lineslot = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
-                        close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
+            self._lineslot = self._add_color(self._linecolor)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Updates the drawing cache after a change to the width or height.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width,self.height)
+        if not self._line is None:
+            self._line.rectangle = (x,y,self.width,self.height)
+    
+    def _refill(self):
+        """
+        Updates the drawing cache after a change to the fill color.
+        
+        The cache is only rebuilt if the interior appears or disappears.
+        """
+        if self._fillslot is None or self._fillcolor is None:
+            self._reset()
+        else:
+            self._set_color(self._fillslot,self._fillcolor)
+    
+    def _reline(self):
+        """
+        Updates the drawing cache after a change to the line color or line width.
+        
+        The cache is only rebuilt if the border appears or disappears.
+        """
+        if self._lineslot is None or self._linecolor is None or self.linewidth == 0:
+            self._reset()
+        else:
+            self._set_color(self._lineslot,self._linecolor)
+            self._line.width = self.linewidth
 
 
 # #mark -
@@ -112,6 +158,8 @@ class GEllipse(GRectangle):
     documentation of that class and :class:`GObject` for a complete list of attributes.
     """
     
+    __slots__ = ()
+    
     # BUILT-IN METHODS
     def __init__(self,**keywords):
         """
@@ -139,12 +187,10 @@ class GEllipse(GRectangle):
         This method is better than simple rectangle inclusion.  It checks that the point 
         is within the proper radius as well.
         
-        **Warning**: Using this method on a rotated object may slow down your framerate.
-        
         :param point: the point to check
-        :type point: :class:`GPoint`` or a pair of numbers
+        :type point: :class:`Point2`` or a pair of numbers
         """
-        if isinstance(point,GPoint):
+        if isinstance(point,Point2):
             point = (point.x,point.y)
         assert is_num_tuple(point,2), "%s is not a valid point" % repr(point)
         
@@ -154,7 +200,9 @@ class GEllipse(GRectangle):
             dx = (point[0]-self.x)*(point[0]-self.x)/(rx*rx)
             dy = (point[1]-self.y)*(point[1]-self.y)/(ry*ry)
         else:
-            p = self.matrix.inverse()._transform(point[0],point[1])
+            if not self._mtrue:
+                self._build_affine()
+            p = self._affinv.transform(point[0],point[1])
             dx = p[0]*p[0]/(rx*rx)
             dy = p[1]*p[1]/(ry*ry)
         
@@ -170,17 +218,33 @@ class GEllipse(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
+        self._fill = None
+        self._fillslot = None
         if not self._fillcolor is None:
-            fill = Ellipse(pos=(x,y), size=(self.width,self.height))
-            self._cache.add(self._fillcolor)
-            self._cache.add(fill)
+            self._fill = Ellipse(pos=(x,y), size=(self.width,self.height))
+            self._fillslot = self._add_color(self._fillcolor)
+            self._cache.add(self._fill)
         
+        self._line = None
+        self._lineslot = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(ellipse=(x,y,self.width,self.height),close=True,width=self.linewidth)
+            self._lineslot = self._add_color(self._linecolor)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Updates the drawing cache after a change to the width or height.
+        """
+        x = -self.width/2.0
+        y = -self.height/2.0
+        if not self._fill is None:
+            self._fill.pos  = (x,y)
+            self._fill.size = (self.width,self.height)
+        if not self._line is None:
+            self._line.ellipse = (x,y,self.width,self.height)
 
 
 # #mark -
@@ -205,6 +269,8 @@ class GImage(GRectangle):
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
     
+    __slots__ = ('_source','_texture')
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -220,7 +286,8 @@ class GImage(GRectangle):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
-            self._reset()
+            self._texture = GameApp.load_texture(value)
+            self._fill.texture = self._texture
     
     
     # BUILT-IN METHODS
@@ -258,19 +325,33 @@ class GImage(GRectangle):
         y = -self.height/2.0
         
         self._texture = GameApp.load_texture(self.source)
-        fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
-        if not self._fillcolor is None:
-            self._cache.add(self._fillcolor)
-        else:
-            self._cache.add(Color(1,1,1))
-        self._cache.add(fill)
+        self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        self._fillslot = self._add_color(self._tint())
+        self._cache.add(self._fill)
         
+        self._line = None
+        self._lineslot = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
+            self._lineslot = self._add_color(self._linecolor)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    def _tint(self):
+        """
+        Returns the color to draw the image with, which is white if there is no fillcolor.
+        """
+        return shared_color((1,1,1,1)) if self._fillcolor is None else self._fillcolor
+    
+    def _refill(self):
+        """
+        Updates the drawing cache after a change to the fill color.
+        
+        The image is always drawn, so this never rebuilds the cache.
+        """
+        self._set_color(self._fillslot,self._tint())
 
 
 # #mark -
@@ -296,7 +377,15 @@ class GLabel(GRectangle):
     to the font by filename, including the .ttf. If you give no name, it will use the 
     default Kivy font.  The `bold` attribute only works for the default Kivy font; for 
     other fonts you will need the .ttf file for the bold version of that font.  See the
-    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example."""
+    provided `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
+    
+    The rendered text is shared through :meth:`GameApp.load_text`, so labels with the 
+    same text and style are only rasterized once.  To change what a label says, set its
+    `text` instead of making a new label.  A label whose text is different every time
+    (such as a timer) should set `cached` to False, so it does not fill the cache."""
+    
+    __slots__ = ('_text','_fname','_fsize','_bold','_halign','_valign','_texture',
+                 '_hanchor','_vanchor','_ha','_hv','_cached')
     
     # MUTABLE PROPERTIES
     @property
@@ -311,8 +400,8 @@ class GLabel(GRectangle):
     def font_size(self,value):
         assert type(value) in [int,float], 'value %s is not a number' % repr(value)
         self._fsize = value
-        self._label.font_size = value
-        self._label.texture_update()
+        if self._defined:
+            self._reset()
     
     @property
     def font_name(self):
@@ -320,14 +409,15 @@ class GLabel(GRectangle):
         The file name for the .ttf file to use as a font
         
         **Invariant**: Must be a string referring to a .ttf file in folder Fonts"""
-        return self._label.font_name
+        return self._fname
     
     @font_name.setter
     def font_name(self,value):
         from .app import GameApp
         assert GameApp.is_font(value), 'value %s is not a font name' % repr(value)
-        self._label.font_name = value
-        self._label.texture_update()
+        self._fname = value
+        if self._defined:
+            self._reset()
     
     @property
     def bold(self):
@@ -339,14 +429,32 @@ class GLabel(GRectangle):
         `ComicSans.ttf` and `ComicSansBold.ttf` for an example.
         
         **Invariant**: Must be a boolean"""
-        return self._label.bold
+        return self._bold
 
     @bold.setter
     def bold(self,value):
         assert type(value) == bool, repr(value)+' is not a bool'
-        self._label.bold = value
-        self._label.texture_update()
+        self._bold = value
+        if self._defined:
+            self._reset()
 
+    @property
+    def cached(self):
+        """
+        Whether the rendered text is kept in the text cache of :class:`GameApp`.
+        
+        Set this to False for text that changes all of the time and is rarely shown
+        again, so that it does not push the text of other labels out of the cache.  
+        The value is True by default.
+        
+        **Invariant**: Must be a boolean"""
+        return self._cached
+    
+    @cached.setter
+    def cached(self,value):
+        assert type(value) == bool, repr(value)+' is not a bool'
+        self._cached = value
+    
     @property
     def text(self):
         """
@@ -356,14 +464,20 @@ class GLabel(GRectangle):
         lines in the presence of the escape character '\\n'. The `width` and `height` of 
         this label will grow to ensure that the text will fit in the rectangle.
         
+        Changing the text updates this label in place.  Nothing happens if the text is
+        the same as before, so it is safe to set this every animation frame.
+        
         **Invariant**: Must be a string"""
-        return self._label.text
+        return self._text
     
     @text.setter
     def text(self,value):
         assert type(value) == str, 'value %s is not a string' % repr(value)
-        self._label.text = value
-        self._label.texture_update()
+        if self._defined and value == self._text:
+            return
+        self._text = value
+        if self._defined:
+            self._reset()
     
     @property
     def halign(self):
@@ -385,7 +499,6 @@ class GLabel(GRectangle):
     def halign(self,value):
         assert value in ('left','right','center'), 'value %s is not a valid horizontal alignment' % repr(value)
         self._halign = value
-        self._label.halign = value
         if self._defined:
             self._reset()
     
@@ -409,7 +522,6 @@ class GLabel(GRectangle):
     def valign(self,value):
         assert value in ('top','middle','bottom'), 'value %s is not a valid vertical alignment' % repr(value)
         self._valign = value
-        self._label.valign = value
         if self._defined:
             self._reset()
     
@@ -458,18 +570,12 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the left
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.x-self.width/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return min(p0,p1,p2,p3)
+        return self._bounds()[0]
     
     @left.setter
     def left(self,value):
@@ -490,18 +596,12 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the right
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.x+self.width/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[0]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[0]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[0]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[0]
-        return max(p0,p1,p2,p3)
+        return self._bounds()[2]
     
     @right.setter
     def right(self,value):
@@ -522,18 +622,12 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the top
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
-        
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.y+self.height/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return max(p0,p1,p2,p3)
+        return self._bounds()[3]
     
     @top.setter
     def top(self,value):
@@ -554,17 +648,12 @@ class GLabel(GRectangle):
         Changing this value will shift the center of the object so that the bottom
         edge matches the new value.
         
-        **Warning**: Accessing this value on a rotated object may slow down your framerate.
         **Invariant**: Must be an int or float.
         """
         if self._rotate.angle == 0.0:
             return self.y-self.height/2.0
         
-        p0 = self.matrix._transform(self.x-self.width/2.0, self.y-self.height/2.0)[1]
-        p1 = self.matrix._transform(self.x+self.width/2.0, self.y-self.height/2.0)[1]
-        p2 = self.matrix._transform(self.x+self.width/2.0, self.y+self.height/2.0)[1]
-        p3 = self.matrix._transform(self.x-self.width/2.0, self.y+self.height/2.0)[1]
-        return min(p0,p1,p2,p3)
+        return self._bounds()[1]
     
     
     @bottom.setter
@@ -593,15 +682,16 @@ class GLabel(GRectangle):
         self._defined = False
         self._hanchor = 'center'
         self._vanchor = 'center'
+        self._texture = None
         
-        sanitized = {}
-        excludes  = ['linewidth','linecolor','fillcolor','halign','valign','left','bottom']
-        for key in keywords:
-            if not key in excludes:
-                sanitized[key] = keywords[key]
-        
-        self._label = Label(**sanitized)
-        self._label.size_hint = (None,None)
+        self.cached = keywords['cached'] if 'cached' in keywords else True
+        self.text = keywords['text'] if 'text' in keywords else ''
+        self.font_size = keywords['font_size'] if 'font_size' in keywords else 15
+        self.bold = keywords['bold'] if 'bold' in keywords else False
+        if 'font_name' in keywords:
+            self.font_name = keywords['font_name']
+        else:
+            self._fname = 'Roboto'
         
         self.linewidth = keywords['linewidth'] if 'linewidth' in keywords else 0.0
         self.halign = keywords['halign'] if 'halign' in keywords else 'center'
@@ -612,7 +702,6 @@ class GLabel(GRectangle):
             self.linecolor = (0,0,0,1)
         self._reset()
         self._defined = True
-        self._label.bind(texture_size=self._callback)
     
     def __str__(self):
         """
@@ -627,28 +716,22 @@ class GLabel(GRectangle):
                 % (s,repr(self.text),repr(self.x),repr(self.y),repr(self.angle))
     
     # HIDDEN METHODS
-    def _callback(self,instance=None,value=None):
-        """
-        A workaround to deal with parameter requirements for callbacks
-        """
-        if self._defined:
-            self._reset()
-    
     def _reset(self):
         """
         Resets the drawing cache.
         """
-        # Set up the label at the center.
-        self._label.size = self._label.texture_size
-        self._label.center = (0,0)
-        if self.linecolor:
-            self._label.color = self.linecolor
+        # Get the (shared) rendered text
+        color = tuple(self.linecolor) if self.linecolor else (1,1,1,1)
+        self._texture = GameApp.load_text(self._text,self._fname,self._fsize,
+                                          self._bold,color,self._halign,self._cached)
+        size = self._texture.size if self._texture else (0,0)
         
         # Resize the outside if necessary
+        defined = self._defined
         self._defined = False
-        self.width  = max(self.width, self._label.width)
-        self.height = max(self.height,self._label.height)
-        self._defined = True
+        self.width  = max(self.width, size[0])
+        self.height = max(self.height,size[1])
+        self._defined = defined
         
         # Reset the absolute anchor
         if self._hanchor == 'left':
@@ -662,17 +745,19 @@ class GLabel(GRectangle):
         elif self._vanchor == 'bottom':
             self._trans.y = self._hv+self.height/2.0
         
-        # Reset the label anchor.
+        # Reset the text anchor.
+        tx = -size[0]/2.0
         if self.halign == 'left':
-            self._label.x = -self.width/2.0
+            tx = -self.width/2.0
         elif self.halign == 'right':
-            self._label.right = self.width/2.0
+            tx = self.width/2.0-size[0]
         
-        # Reset the label anchor.
+        # Reset the text anchor.
+        ty = -size[1]/2.0
         if self.valign == 'top':
-            self._label.top = self.height/2.0
+            ty = self.height/2.0-size[1]
         elif self.valign == 'bottom':
-            self._label.bottom = -self.height/2.0
+            ty = -self.height/2.0
         
         GObject._reset(self)
         x = -self.width/2.0
@@ -683,7 +768,9 @@ class GLabel(GRectangle):
             self._cache.add(self._fillcolor)
             self._cache.add(fill)
         
-        self._cache.add(self._label.canvas)
+        # The text color is part of the texture
+        self._cache.add(Color(1,1,1,1))
+        self._cache.add(Rectangle(pos=(tx,ty),size=size,texture=self._texture))
         
         if self._linewidth > 0:
             line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
@@ -691,3 +778,25 @@ class GLabel(GRectangle):
             self._cache.add(line)
         
         self._cache.add(PopMatrix())
+    
+    def _resize(self):
+        """
+        Updates the drawing cache after a change to the width or height.
+        
+        The size of a label affects its anchors, so this rebuilds the cache.
+        """
+        self._reset()
+    
+    def _refill(self):
+        """
+        Updates the drawing cache after a change to the fill color.
+        """
+        self._reset()
+    
+    def _reline(self):
+        """
+        Updates the drawing cache after a change to the line color or line width.
+        
+        The line color is also the text color, so this rebuilds the cache.
+        """
+        self._reset()
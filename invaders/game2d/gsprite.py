@@ -9,9 +9,13 @@ by changing the current frame.
 Author: Walker M. White (wmw2)
 Date:   November 1, 2017 (Python 3 version)
 """
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from .grectangle import GRectangle, GObject
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+from .grectangle import GRectangle, GImage, GObject
 from .app import GameApp
 
 # #mark -
@@ -35,6 +39,8 @@ class GSprite(GRectangle):
     shapes.  However, the :meth:`contains` method still treats this shape as a  rectangle.
     """
     
+    __slots__ = ('_source','_format','_frame','_images','_texture')
+    
     # MUTABLE PROPERTIES
     @property
     def source(self):
@@ -50,7 +56,8 @@ class GSprite(GRectangle):
         assert value is None or GameApp.is_image(value), '%s is not an image file' % repr(value)
         self._source = value
         if self._defined:
-            self._reset()
+            self._load()
+            self._fill.texture = self._texture
     
     @property
     def count(self):
@@ -75,9 +82,9 @@ class GSprite(GRectangle):
         assert type(value) == int, '%s is not an int' % repr(value)
         assert value >= 0 and value < self.count, '%s is out of range' % repr(value)
         self._frame = value
-        if self._bounds:
+        if not self._fill is None:
             self._texture = self._images[self._frame]
-            self._bounds.texture = self._texture
+            self._fill.texture = self._texture
     
     
     # BUILT-IN METHODS
@@ -103,8 +110,8 @@ class GSprite(GRectangle):
         self.source  = keywords['source'] if 'source' in keywords else None
         self._setFormat(keywords['format'] if 'format' in keywords else (1,1))
         self._frame  = 0
-        self._images = [None]*self.count
-        self._bounds = None
+        self._images = None
+        self._fill = None
         self._texture = None
         GRectangle.__init__(self,**keywords)
         self._defined = True
@@ -122,6 +129,18 @@ class GSprite(GRectangle):
         assert value[0] > 0 and value[1] > 0, '%s does not have valid values' % repr(value)
         self._format = value
     
+    def _load(self):
+        """
+        Loads the frames of the filmstrip and sets the texture to the current frame.
+        
+        The frames are shared with every other sprite of this filmstrip.
+        """
+        self._images = GameApp.load_frames(self.source,self._format)
+        if self._images is None:
+            print('Failed to load',repr(self.source))
+            self._images = (None,)*self.count
+        self._texture = self._images[self._frame]
+    
     def _reset(self):
         """
         Resets the drawing cache.
@@ -130,33 +149,22 @@ class GSprite(GRectangle):
         x = -self.width/2.0
         y = -self.height/2.0
         
-        texture = GameApp.load_texture(self.source)
-        if texture:
-            width  = texture.width/self._format[1]
-            height = texture.height/self._format[0]
-            
-            ty = 0
-            for row in range(self._format[0]):
-                tx = 0
-                for col in range(self._format[1]):
-                    self._images[row*self._format[1]+col] = texture.get_region(int(tx),texture.height-int(ty)-int(height),int(width),int(height))
-                    tx += width
-                ty += width
-        else:
-            print('Failed to load',repr(self.source))
-        
-        self._texture = self._images[self._frame]
-        self._bounds = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
-        if not self._fillcolor is None:
-            self._cache.add(self._fillcolor)
-        else:
-            self._cache.add(Color(1,1,1))
-        self._cache.add(self._bounds)
+        self._load()
+        self._fill = Rectangle(pos=(x,y), size=(self.width, self.height),texture=self._texture)
+        self._fillslot = self._add_color(self._tint())
+        self._cache.add(self._fill)
         
+        self._line = None
+        self._lineslot = None
         if not self._linecolor is None and self.linewidth > 0:
-            line = Line(rectangle=(x,y,self.width,self.height),joint='miter',close=True,width=self.linewidth)
-            self._cache.add(self._linecolor)
-            self._cache.add(line)
+            self._line = Line(rectangle=(x,y,self.width,self.height),joint='miter',
+                              close=True,width=self.linewidth)
+            self._lineslot = self._add_color(self._linecolor)
+            self._cache.add(self._line)
         
         self._cache.add(PopMatrix())
+    
+    # A sprite is tinted just like an image
+    _tint   = GImage._tint
+    _refill = GImage._refill
 
@@ -9,10 +9,14 @@ Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
 # Basic Kivy Modules
-from kivy.graphics import *
-from kivy.graphics.instructions import *
-from kivy.uix.floatlayout import FloatLayout
-from kivy.metrics import dp
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+    from kivy.uix.floatlayout import FloatLayout
+    from kivy.metrics import dp
 
 from cornell import Point2
 
@@ -95,7 +99,7 @@ class GInput(object):
         if self._touch is None:
             return None
         
-        return Point2(self._touch.x/dp(1),self._touch.y/dp(1))
+        return Point2._make(self._touch.x/dp(1),self._touch.y/dp(1))
     
     @property
     def key_count(self):
@@ -144,6 +148,9 @@ class GInput(object):
         
         self._keystate = {}
         self._keycount = 0
+        
+        # The function to call on any key or mouse event (see GameApp.idle)
+        self._listener = None
     
     
     # PUBLIC METHODS
@@ -185,6 +192,28 @@ class GInput(object):
         """ 
         return not self._touch is None
     
+    def freeze(self):
+        """
+        Returns: a copy of the current input state that never changes
+        
+        The copy has the same keys held down and the same touch as this handler, but
+        it is not hooked up to the mouse or keyboard.  A threaded :class:`GameApp`
+        hands a copy like this to the simulation thread, so the input cannot change
+        in the middle of an update (or be read while the main thread changes it).
+        
+        :return: a frozen copy of this input handler
+        :rtype:  :class:`GInput`
+        """
+        copy = GInput()
+        copy._touch_enabled = self._touch_enabled
+        copy._keyboard_enabled = self._keyboard_enabled
+        copy._keystate = dict(self._keystate)
+        copy._keycount = self._keycount
+        if not self._touch is None:
+            # Only the position of the Kivy touch is ever read
+            copy._touch = Point2._make(self._touch.x,self._touch.y)
+        return copy
+    
     
     # HIDDEN METHODS
     def _register(self,view):
@@ -228,7 +257,7 @@ class GInput(object):
         """
         Enables keyboard events for this input handler
         """
-        if self._view is None:
+        if self._view is None or HEADLESS:
             return
         from kivy.core.window import Window
         self._keyboard = Window.request_keyboard(self._disable_keyboard, self._view, 'text')
@@ -239,7 +268,7 @@ class GInput(object):
         """
         Disables keyboard events for this input handler
         """
-        if self._view is None:
+        if self._view is None or self._keyboard is None:
             return
         self._keyboard.unbind(on_key_down=self._capture_key)
         self._keyboard.unbind(on_key_up=self._release_key)
@@ -268,6 +297,7 @@ class GInput(object):
         if not k in self._keystate or not self._keystate[k]:
             self._keycount += 1
         self._keystate[k] = True
+        self._notify()
         return True
     
     def _release_key(self, keyboard, keycode):
@@ -282,6 +312,7 @@ class GInput(object):
         """
         self._keystate[keycode[1]] = False
         self._keycount -= 1
+        self._notify()
         return True
     
     def _capture_touch(self,view,touch):
@@ -296,6 +327,7 @@ class GInput(object):
         """
         self._touch = touch
         #self._touch.grab(self)
+        self._notify()
     
     def _release_touch(self,view,touch):
         """
@@ -308,6 +340,14 @@ class GInput(object):
         :type touch:  ``kivy.input.motionevent.TouchEvent``
         """
         self._touch = None
+        self._notify()
+    
+    def _notify(self):
+        """
+        Tells the listener (if any) that there was a key or mouse event.
+        """
+        if not self._listener is None:
+            self._listener()
 
 
 # #mark -
@@ -315,9 +355,20 @@ class GView(FloatLayout):
     """
     A class representing a drawing window for a :class:`GameApp` application.
     
-    This is the class that you will use to draw shapes to the screen.  Simply pass your
-    :class:`GObject` instances to the :meth:`draw` method.  You must do this every 
-    animation frame, as the game is constantly clearing the window.
+    This is the class that you will use to draw shapes to the screen.  There are two 
+    ways to do this.  The simplest is to pass your :class:`GObject` instances to the 
+    :meth:`draw` method.  You must do this every animation frame, as the game is 
+    constantly clearing these shapes from the window.
+    
+    Alternatively, you can register an object with the view once using :meth:`add`.
+    The object stays on screen (and is redrawn as it moves or changes) until you take 
+    it away with :meth:`remove`.  This is much faster when there are a lot of objects
+    that rarely come and go, since the window does not have to be rebuilt each frame.
+    Registered objects are drawn underneath the objects passed to :meth:`draw`.
+    
+    The view can also be drawn without OpenGL.  If you give it a software renderer
+    as its :attr:`backend`, then :meth:`render` draws everything on the view into 
+    an array of pixels.  This works in headless mode, where there is no window.
     
     **You should never construct an object of this class**.  Creating a new instance
     of this class will not properly display it on the screen.  Instead, you should 
@@ -325,6 +376,24 @@ class GView(FloatLayout):
     See the documentation of that class for more information.
     """
     
+    # MUTABLE ATTRIBUTES
+    @property
+    def backend(self):
+        """
+        The software renderer used by :meth:`render`.
+        
+        This is None by default, in which case the view is only drawn by Kivy.  The
+        renderer is resized to fit the view when the view is rendered.
+        
+        **Invariant**: Must be a :class:`SoftwareRenderer` or None.
+        """
+        return self._backend
+    
+    @backend.setter
+    def backend(self,value):
+        self._backend = value
+    
+    
     # BUILT-IN METHODS
     def __init__(self):
         """
@@ -336,7 +405,11 @@ class GView(FloatLayout):
         :class:`GameApp`. See the documentation of that class for more information.
         """
         FloatLayout.__init__(self)
+        self._retained = InstructionGroup()
+        self._objects = set()
         self._frame = InstructionGroup()
+        self._backend = None
+        self._fbo = None
         self.bind(pos=self._reset)
         self.bind(size=self._reset)
         self._reset()
@@ -355,17 +428,179 @@ class GView(FloatLayout):
         """
         self._frame.add(cmd)
     
+    def add(self,obj):
+        """
+        Registers the given object with this view.
+        
+        The object is drawn every animation frame until it is removed with 
+        :meth:`remove` (or the view is cleared with :meth:`clear`).  You do not need to 
+        add it again when it moves or changes.  Adding an object that is already 
+        registered does nothing.
+        
+        You should not also draw a registered object with :meth:`GObject.draw`.
+        
+        :param obj: the object to register
+        :type obj:  :class:`GObject`
+        """
+        if not obj in self._objects:
+            self._objects.add(obj)
+            self._retained.add(obj._group)
+    
+    def remove(self,obj):
+        """
+        Unregisters the given object from this view.
+        
+        The object is no longer drawn.  Removing an object that is not registered does
+        nothing.
+        
+        :param obj: the object to unregister
+        :type obj:  :class:`GObject`
+        """
+        if obj in self._objects:
+            self._objects.remove(obj)
+            self._retained.remove(obj._group)
+    
+    def has(self,obj):
+        """
+        Checks whether the given object is registered with this view.
+        
+        :param obj: the object to check
+        :type obj:  :class:`GObject`
+        
+        :return: True if ``obj`` was added (and not removed) since the view was cleared
+        :rtype:  ``bool``
+        """
+        return obj in self._objects
+    
     def clear(self):
         """
         Clears the contents of the view.
         
-        This method is called for you automatically at the start of the animation
-        frame.  That way, you are not drawing images on top of one another.
+        This removes both the objects drawn this frame and any registered objects.  The
+        former are cleared for you automatically at the start of the animation frame, 
+        but registered objects are only removed when you call this method.
         """
+        self._objects.clear()
+        self._retained.clear()
         self._frame.clear()
     
+    def render(self,out=None):
+        """
+        Draws the contents of the view with the software renderer.
+        
+        The result is the view as an array of RGBA bytes, with the top row first (like
+        an image file).  If ``out`` is given, the pixels are written to it.  Otherwise 
+        a new array is allocated.
+        
+        :param out: the array to write to
+        :type out:  ``None`` or a height x width x 4 array of ``uint8``
+        
+        :return: the pixels of the view
+        :rtype:  height x width x 4 array of ``uint8``
+        """
+        assert not self._backend is None, 'The view does not have a software renderer'
+        width, height = int(round(self.width)), int(round(self.height))
+        if self._backend.size != (width,height):
+            self._backend.resize(width,height)
+        self._backend.render(self.canvas)
+        return self._backend.read(out)
+    
+    def grab(self,out=None):
+        """
+        Copies what is on the view into an array of pixels.
+        
+        If the view has a :attr:`backend`, this is the same as :meth:`render`.  
+        Otherwise, Kivy draws the view into an offscreen framebuffer, which is read
+        back.  In headless mode there is no Kivy, so the view must have a backend.
+        
+        Either way, this waits for the whole frame to be drawn.  To draw it later on 
+        another thread, use :meth:`snapshot` instead.
+        
+        :param out: the array to write to
+        :type out:  ``None`` or a height x width x 4 array of ``uint8``
+        
+        :return: the pixels of the view, with the top row first
+        :rtype:  height x width x 4 array of ``uint8``
+        """
+        if not self._backend is None:
+            return self.render(out)
+        assert not HEADLESS, 'A headless view needs a backend to be grabbed'
+        return self._grab_fbo(out)
+    
+    def snapshot(self,renderer):
+        """
+        Returns: a function that draws the view, as it is now, into an array of pixels
+        
+        The instructions on the view are recorded now, which is quick (see the method
+        :meth:`SoftwareRenderer.record`).  The function draws them when it is called, 
+        which is slow.  As the game cannot change what was recorded, the function can 
+        be called later, and on another thread.  It takes the array to write to, like
+        :meth:`render`, and returns it.
+        
+        The function draws with ``renderer``, so the functions made with one renderer
+        must be called one at a time.  For the same reason, the renderer should not be
+        the :attr:`backend` of the view.  It must be the size of the view.
+        
+        :param renderer: the renderer to record and draw with
+        :type renderer:  :class:`SoftwareRenderer`
+        
+        :return: the function to draw the view
+        :rtype:  callable taking a height x width x 4 array of ``uint8``
+        """
+        commands = renderer.record(self.canvas)
+        def draw(out):
+            renderer.replay(commands)
+            return renderer.read(out)
+        return draw
+    
     
     # HIDDEN METHODS
+    def _clear_frame(self):
+        """
+        Clears the objects drawn this frame, keeping the registered objects.
+        
+        This method is called by :class:`GameApp` before each call to ``draw``.
+        """
+        self._frame.clear()
+    
+    def _grab_fbo(self,out):
+        """
+        Draws the view into a Kivy framebuffer and copies the pixels to out.
+        
+        The canvas can only have one parent, so it is moved into the framebuffer for
+        the draw and then put back.  The framebuffer is kept for the next grab.
+        
+        :param out: the array to write to
+        :type out:  ``None`` or a height x width x 4 array of ``uint8``
+        """
+        import numpy as np
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers
+        size = (int(round(self.width)),int(round(self.height)))
+        if self._fbo is None or tuple(self._fbo.size) != size:
+            self._fbo = Fbo(size=size,with_stencilbuffer=True)
+            with self._fbo:
+                ClearColor(0,0,0,0)
+                ClearBuffers()
+                Translate(-self.x,-self.y,0)
+        
+        parent = self.parent.canvas if self.parent is not None else None
+        index  = parent.indexof(self.canvas) if parent is not None else -1
+        if index > -1:
+            parent.remove(self.canvas)
+        self._fbo.add(self.canvas)
+        self._fbo.draw()
+        self._fbo.remove(self.canvas)
+        if index > -1:
+            parent.insert(index,self.canvas)
+        
+        # Kivy textures start with the bottom row
+        pixels = np.frombuffer(self._fbo.texture.pixels,dtype=np.uint8)
+        pixels = pixels.reshape(size[1],size[0],4)[::-1]
+        if out is None:
+            return pixels.copy()
+        np.copyto(out,pixels)
+        return out
+    
     def _reset(self,obj=None,value=None):
         """
         Resets the view canvas in response to a resizing event
@@ -375,4 +610,5 @@ class GView(FloatLayout):
         self.canvas.add(Rectangle(pos=self.pos,size=self.size))
         # Work-around for Retina Macs
         self.canvas.add(Scale(dp(1),dp(1),dp(1)))
+        self.canvas.add(self._retained)
         self.canvas.add(self._frame)
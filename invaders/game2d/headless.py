@@ -0,0 +1,955 @@
+"""
+Pure-Python stand-ins for the Kivy interfaces used by this package.
+
+Setting the environment variable ``GAME2D_HEADLESS`` to 1 before importing game2d
+replaces the Kivy graphics instructions, widgets, clock and audio loader with the
+classes in this module.  They store the same attributes as their Kivy counterparts,
+but they never open a window or touch a GL context.  That means any game built on
+:class:`GObject` can be stepped in a tight loop on a machine with no display, which
+is what you want for regression tests, balance runs and benchmarks.
+
+Nothing is drawn in headless mode.  The instructions are simply recorded so that the
+rest of the package (bounds, collisions, animation frames) behaves exactly as it does
+with Kivy.  To turn the recorded instructions into pixels, give the view a
+:class:`SoftwareRenderer` (see :mod:`game2d.raster`).
+
+This module also provides :class:`VirtualInput`, a scriptable replacement for
+:class:`GInput`, and :class:`VirtualClock`, a clock whose time only advances when
+you tell it to.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+import os
+import os.path
+import struct
+import threading
+
+#: Whether game2d is running without Kivy
+HEADLESS = os.environ.get('GAME2D_HEADLESS','0') not in ('','0')
+
+# The names that replace the Kivy imports in the other modules of this package
+__all__ = ['Instruction', 'InstructionGroup', 'Canvas', 'PushMatrix', 'PopMatrix',
+           'Translate', 'Rotate', 'Scale', 'Color', 'Rectangle', 'Ellipse', 'Line',
+           'Mesh', 'Texture', 'TextureRegion', 'Image', 'FloatLayout', 'dp']
+
+
+# #mark - Resources
+
+# The search path for resource files (mirrors kivy.resources)
+_RESOURCE_PATHS = []
+
+def resource_add_path(path):
+    """
+    Adds a directory to the resource search path.
+
+    :param path: The directory to search
+    :type path:  ``str``
+    """
+    if not path in _RESOURCE_PATHS:
+        _RESOURCE_PATHS.append(path)
+
+
+def resource_find(name):
+    """
+    Returns: The full path of the given resource, or None if it cannot be found
+
+    :param name: The file name
+    :type name:  ``str``
+    """
+    if os.path.isabs(name):
+        return name if os.path.exists(name) else None
+    for path in _RESOURCE_PATHS:
+        full = os.path.join(path,name)
+        if os.path.exists(full):
+            return full
+    return name if os.path.exists(name) else None
+
+
+def png_size(filename):
+    """
+    Returns: The (width,height) of a PNG file
+
+    Only the file header is read, so this is very fast.
+
+    :param filename: The full path of the PNG file
+    :type filename:  ``str``
+    """
+    with open(filename,'rb') as file:
+        header = file.read(24)
+    assert header[:8] == b'\x89PNG\r\n\x1a\n', '%s is not a PNG file' % repr(filename)
+    return struct.unpack('>II',header[16:24])
+
+
+# #mark - Graphics Instructions
+
+class Instruction(object):
+    """
+    A class representing a single (recorded) graphics instruction.
+    """
+
+    def __init__(self,**keywords):
+        """
+        Creates a new instruction.
+
+        :param keywords: dictionary of keyword arguments
+        :type keywords:  keys are attribute names
+        """
+        for key in keywords:
+            setattr(self,key,keywords[key])
+
+
+class InstructionGroup(Instruction):
+    """
+    A class representing an ordered group of instructions.
+    """
+
+    @property
+    def children(self):
+        """
+        The list of instructions in this group.
+        """
+        return self._children
+
+    def __init__(self,**keywords):
+        """
+        Creates a new, empty instruction group.
+        """
+        self._children = []
+        Instruction.__init__(self,**keywords)
+
+    def add(self,c):
+        """
+        Adds an instruction to the end of this group.
+
+        :param c: The instruction to add
+        :type c:  :class:`Instruction`
+        """
+        self._children.append(c)
+
+    def insert(self,index,c):
+        """
+        Inserts an instruction at the given position.
+
+        :param index: The position to insert at
+        :type index:  ``int``
+
+        :param c: The instruction to add
+        :type c:  :class:`Instruction`
+        """
+        self._children.insert(index,c)
+
+    def remove(self,c):
+        """
+        Removes an instruction from this group.
+
+        :param c: The instruction to remove
+        :type c:  :class:`Instruction`
+        """
+        self._children.remove(c)
+
+    def indexof(self,c):
+        """
+        Returns: The position of the instruction in this group, or -1 if not present
+
+        :param c: The instruction to find
+        :type c:  :class:`Instruction`
+        """
+        for pos in range(len(self._children)):
+            if self._children[pos] is c:
+                return pos
+        return -1
+
+    def length(self):
+        """
+        Returns: The number of instructions in this group
+        """
+        return len(self._children)
+
+    def clear(self):
+        """
+        Removes all instructions from this group.
+        """
+        self._children = []
+
+
+class Canvas(InstructionGroup):
+    """
+    A class representing the canvas of a widget.
+    """
+    pass
+
+
+class PushMatrix(Instruction):
+    """
+    A class representing a push onto the matrix stack.
+    """
+    pass
+
+
+class PopMatrix(Instruction):
+    """
+    A class representing a pop from the matrix stack.
+    """
+    pass
+
+
+class Translate(Instruction):
+    """
+    A class representing a translation.
+    """
+
+    def __init__(self,x=0,y=0,z=0):
+        """
+        Creates a new translation by the given offset.
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Rotate(Instruction):
+    """
+    A class representing a rotation in degrees about an axis.
+    """
+
+    def __init__(self,angle=0,x=0,y=0,z=1,axis=None,origin=(0,0,0)):
+        """
+        Creates a new rotation about the given axis.
+        """
+        self.angle  = angle
+        self.axis   = tuple(axis) if axis else (x,y,z)
+        self.origin = origin
+
+
+class Scale(Instruction):
+    """
+    A class representing a scaling factor.
+    """
+
+    def __init__(self,x=1,y=1,z=1):
+        """
+        Creates a new scaling factor.
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Color(Instruction):
+    """
+    A class representing the current drawing color.
+    """
+
+    @property
+    def rgba(self):
+        """
+        The color as a list of 4 floats.
+        """
+        return list(self._rgba)
+
+    @rgba.setter
+    def rgba(self,value):
+        self._rgba = tuple(map(float,value))
+
+    @property
+    def rgb(self):
+        """
+        The color (ignoring the alpha) as a list of 3 floats.
+        """
+        return list(self._rgba[:3])
+
+    @rgb.setter
+    def rgb(self,value):
+        self._rgba = tuple(map(float,value))+self._rgba[3:]
+
+    @property
+    def a(self):
+        """
+        The alpha value.
+        """
+        return self._rgba[3]
+
+    @a.setter
+    def a(self,value):
+        self._rgba = self._rgba[:3]+(float(value),)
+
+    def __init__(self,*args,**keywords):
+        """
+        Creates a new color from 3 or 4 values.
+        """
+        self._rgba = (1.0,1.0,1.0,1.0)
+        if len(args) == 3:
+            self.rgba = tuple(args)+(1.0,)
+        elif len(args) == 4:
+            self.rgba = args
+        if 'rgba' in keywords:
+            self.rgba = keywords['rgba']
+        elif 'rgb' in keywords:
+            self.rgb  = keywords['rgb']
+
+
+class Rectangle(Instruction):
+    """
+    A class representing a (possibly textured) rectangle.
+    """
+
+    def __init__(self,pos=(0,0),size=(100,100),texture=None,source=None,**keywords):
+        """
+        Creates a new rectangle.
+        """
+        self.pos = tuple(pos)
+        self.size = tuple(size)
+        self.texture = texture
+        self.source = source
+        Instruction.__init__(self,**keywords)
+
+
+class Ellipse(Rectangle):
+    """
+    A class representing a (possibly textured) ellipse.
+    """
+    pass
+
+
+class Line(Instruction):
+    """
+    A class representing a line, rectangle outline or ellipse outline.
+    """
+
+    def __init__(self,points=(),rectangle=None,ellipse=None,width=1.0,close=False,**keywords):
+        """
+        Creates a new line.
+        """
+        self.points = tuple(points)
+        self.rectangle = rectangle
+        self.ellipse = ellipse
+        self.width = width
+        self.close = close
+        Instruction.__init__(self,**keywords)
+
+
+class Mesh(Instruction):
+    """
+    A class representing a triangle mesh.
+    """
+
+    def __init__(self,vertices=(),indices=(),mode='points',texture=None,fmt=None):
+        """
+        Creates a new mesh.
+        """
+        self.vertices = vertices
+        self.indices = indices
+        self.mode = mode
+        self.texture = texture
+        self.fmt = fmt
+
+
+# #mark - Textures
+
+class Texture(object):
+    """
+    A class representing an image texture.
+
+    Headless textures are not uploaded anywhere.  Their pixels are only read (from the
+    source file, if they have one) when something asks for them, such as a
+    :class:`SoftwareRenderer`.
+    """
+
+    @property
+    def size(self):
+        """
+        The texture size as a (width,height) pair.
+        """
+        return (self.width,self.height)
+
+    @property
+    def tex_coords(self):
+        """
+        The texture coordinates of the corners, counter-clockwise from the bottom left.
+        """
+        return (0.0,0.0,1.0,0.0,1.0,1.0,0.0,1.0)
+
+    @property
+    def pixels(self):
+        """
+        The texture pixels as a height x width x 4 array of RGBA bytes, or None.
+
+        The first row of the array is the top of the texture.  The value is None if the
+        texture has neither pixels of its own nor a source file.
+        """
+        if self._pixels is None and self.source:
+            from .atlas import read_png
+            self._pixels = read_png(self.source)
+        return self._pixels
+
+    # The id to give the next texture, like an OpenGL texture name
+    _next_id = 1
+
+    def __init__(self,width,height,source=None,pixels=None):
+        """
+        Creates a new texture of the given size.
+        """
+        self.width  = width
+        self.height = height
+        self.source = source
+        self.wrap = None
+        self._pixels = pixels
+        self.id = Texture._next_id
+        Texture._next_id += 1
+
+    def get_region(self,x,y,width,height):
+        """
+        Returns: a subregion of this texture
+
+        The origin is the bottom left corner of the texture, as in Kivy.
+        """
+        return TextureRegion(x,y,width,height,self)
+
+
+class TextureRegion(Texture):
+    """
+    A class representing a rectangular subregion of a texture.
+    """
+
+    def __init__(self,x,y,width,height,owner):
+        """
+        Creates a new region of the given texture.
+        """
+        Texture.__init__(self,width,height,owner.source)
+        self.id = owner.id
+        self.owner = owner
+        self.x = x
+        self.y = y
+
+    @property
+    def tex_coords(self):
+        """
+        The texture coordinates of the corners, counter-clockwise from the bottom left.
+        """
+        u0 = self.x/self.owner.width
+        v0 = self.y/self.owner.height
+        u1 = (self.x+self.width)/self.owner.width
+        v1 = (self.y+self.height)/self.owner.height
+        return (u0,v0,u1,v0,u1,v1,u0,v1)
+
+    @property
+    def pixels(self):
+        """
+        The pixels of this region (a view into the pixels of the texture it belongs to).
+        """
+        pixels = self.owner.pixels
+        if pixels is None:
+            return None
+        top = self.owner.height-self.y-self.height
+        return pixels[top:top+self.height,self.x:self.x+self.width]
+
+    def get_region(self,x,y,width,height):
+        """
+        Returns: a subregion of this region, relative to its bottom left corner.
+        """
+        return TextureRegion(self.x+x,self.y+y,width,height,self.owner)
+
+
+class CoreImage(object):
+    """
+    A class representing an image file (mirrors kivy.core.image.Image).
+    """
+
+    def __init__(self,name):
+        """
+        Loads the image with the given file name.
+        """
+        path = resource_find(name)
+        if path is None:
+            raise IOError('Cannot find the image %s' % repr(name))
+        width, height = png_size(path)
+        self.filename = path
+        self.texture = Texture(width,height,path)
+
+
+class CoreLabel(object):
+    """
+    A class representing rendered text (mirrors kivy.core.text.Label).
+
+    There is no font rasterizer in headless mode, so the texture size is estimated from
+    the font size and the number of characters.  Its pixels draw every character that
+    is not a space as a solid block in the text color, which is enough to see where
+    the text is (and to tell one string from another of a different shape).
+    """
+
+    @property
+    def texture(self):
+        """
+        The texture with the rendered text, or None if it has not been rendered.
+        """
+        return self._texture
+
+    def __init__(self,text='',font_size=12,font_name='Roboto',bold=False,
+                 color=(1,1,1,1),halign='left',**keywords):
+        """
+        Creates new (unrendered) text with the given options.
+        """
+        self.text = text
+        self.options = dict(keywords,font_size=font_size,font_name=font_name,bold=bold,
+                            color=color,halign=halign)
+        self._texture = None
+
+    def refresh(self):
+        """
+        Renders the text to a texture.
+        """
+        size  = self.options['font_size']
+        lines = self.text.split('\n')
+        width  = max(len(line) for line in lines)*size*0.6
+        height = len(lines)*size*1.2
+        self._texture = Texture(width,height,pixels=self._blocks(lines,width,height))
+
+    def _blocks(self,lines,width,height):
+        """
+        Returns: the pixels for the given lines of text, with a block per character
+
+        :param lines: The lines of text
+        :type lines:  ``list`` of ``str``
+
+        :param width: The texture width
+        :type width:  ``float`` >= 0
+
+        :param height: The texture height
+        :type height:  ``float`` >= 0
+        """
+        import numpy as np
+        rows = max(1,int(round(height)))
+        cols = max(1,int(round(width)))
+        pixels = np.zeros((rows,cols,4),dtype=np.uint8)
+        color = [int(round(255*c)) for c in tuple(self.options['color'])[:4]]
+        color += [255]*(4-len(color))
+
+        cellw = cols/float(max(len(line) for line in lines) or 1)
+        cellh = rows/float(len(lines))
+        for row, line in enumerate(lines):
+            # Line up the characters like the halign option
+            free = (len(max(lines,key=len))-len(line))*cellw
+            left = {'left': 0, 'right': free}.get(self.options['halign'],free/2.0)
+            top  = int(row*cellh+cellh*0.2)
+            bottom = int((row+1)*cellh-cellh*0.1)
+            for col, char in enumerate(line):
+                if not char.isspace():
+                    start = int(left+col*cellw+cellw*0.1)
+                    stop  = int(left+(col+1)*cellw-cellw*0.1)
+                    pixels[top:bottom,start:max(stop,start+1)] = color
+        return pixels
+
+
+# #mark - Widgets
+
+class FloatLayout(object):
+    """
+    A class representing a widget (mirrors the parts of kivy.uix that game2d uses).
+    """
+
+    @property
+    def center(self):
+        """
+        The center of this widget.
+        """
+        return (self.x+self.width/2.0,self.y+self.height/2.0)
+
+    @center.setter
+    def center(self,value):
+        self.x = value[0]-self.width/2.0
+        self.y = value[1]-self.height/2.0
+
+    @property
+    def right(self):
+        """
+        The right edge of this widget.
+        """
+        return self.x+self.width
+
+    @right.setter
+    def right(self,value):
+        self.x = value-self.width
+
+    @property
+    def top(self):
+        """
+        The top edge of this widget.
+        """
+        return self.y+self.height
+
+    @top.setter
+    def top(self,value):
+        self.y = value-self.height
+
+    @property
+    def bottom(self):
+        """
+        The bottom edge of this widget.
+        """
+        return self.y
+
+    @bottom.setter
+    def bottom(self,value):
+        self.y = value
+
+    @property
+    def pos(self):
+        """
+        The position of the bottom left corner.
+        """
+        return (self.x,self.y)
+
+    @pos.setter
+    def pos(self,value):
+        self.x, self.y = value
+
+    @property
+    def size(self):
+        """
+        The widget size as a (width,height) pair.
+        """
+        return (self.width,self.height)
+
+    @size.setter
+    def size(self,value):
+        self.width, self.height = value
+
+    def __init__(self,**keywords):
+        """
+        Creates a new widget.
+        """
+        self.x = 0
+        self.y = 0
+        self.width  = 100
+        self.height = 100
+        self.size_hint = (1,1)
+        self.canvas = Canvas()
+        self._bindings = {}
+        for key in keywords:
+            setattr(self,key,keywords[key])
+
+    def bind(self,**keywords):
+        """
+        Registers callbacks for events.  Headless widgets never fire them.
+        """
+        for key in keywords:
+            self._bindings.setdefault(key,[]).append(keywords[key])
+
+    def unbind(self,**keywords):
+        """
+        Unregisters callbacks for events.
+        """
+        for key in keywords:
+            if key in self._bindings and keywords[key] in self._bindings[key]:
+                self._bindings[key].remove(keywords[key])
+
+
+class Image(FloatLayout):
+    """
+    A class representing an image widget.
+    """
+
+    def __init__(self,source=None,**keywords):
+        """
+        Creates a new image widget for the given file.
+        """
+        FloatLayout.__init__(self,**keywords)
+        self.source  = source
+        self.texture = CoreImage(source).texture if source else None
+
+
+def dp(value):
+    """
+    Returns: The value in pixels (there are no high density displays in headless mode)
+    """
+    return value
+
+
+# #mark - Sound
+
+class _Sound(object):
+    """
+    A class representing a silent sound.
+    """
+
+    def __init__(self,source):
+        """
+        Creates a new silent sound.
+        """
+        self.source = source
+        self.volume = 1.0
+        self.loop = False
+        self.state = 'stop'
+
+    def play(self):
+        """
+        Plays the sound (which immediately finishes).
+        """
+        pass
+
+    def stop(self):
+        """
+        Stops the sound.
+        """
+        self.state = 'stop'
+
+
+class SoundLoader(object):
+    """
+    A class that loads silent sounds (mirrors kivy.core.audio.SoundLoader).
+    """
+
+    @staticmethod
+    def load(filename):
+        """
+        Returns: A silent sound for the given file, or None if it does not exist.
+        """
+        path = resource_find(filename)
+        return None if path is None else _Sound(path)
+
+
+# #mark - Application
+
+class Config(object):
+    """
+    A class that ignores configuration settings (mirrors kivy.config.Config).
+    """
+
+    @staticmethod
+    def set(section,key,value):
+        """
+        Ignores the given configuration setting.
+        """
+        pass
+
+
+class VirtualClock(object):
+    """
+    A class representing a clock whose time only advances on demand.
+
+    This class supports the same scheduling methods as the Kivy clock.  Scheduled
+    callbacks are only called by :meth:`tick`, which advances the time by a fixed
+    amount.  This makes simulations completely deterministic.
+
+    Like the Kivy clock, callbacks may be scheduled from any thread (such as the
+    simulation thread of a threaded game).  They are always called by :meth:`tick`.
+    """
+
+    @property
+    def time(self):
+        """
+        The number of (virtual) seconds since this clock was created.
+        """
+        return self._time
+
+    @property
+    def frames(self):
+        """
+        The number of times this clock has ticked.
+        """
+        return self._frames
+
+    def __init__(self):
+        """
+        Creates a new clock at time 0.
+        """
+        self._time = 0.0
+        self._frames = 0
+        self._events = []
+        self._lock = threading.Lock()
+
+    def get_time(self):
+        """
+        Returns: The current (virtual) time in seconds
+        """
+        return self._time
+
+    def schedule_once(self,callback,timeout=0):
+        """
+        Schedules the callback to be called once after the timeout.
+
+        :param callback: The function to call with the elapsed time
+        :type callback:  callable
+
+        :param timeout: The number of seconds to wait (negative means next tick)
+        :type timeout:  ``int`` or ``float``
+        """
+        with self._lock:
+            self._events.append([callback,self._time,max(timeout,0),False])
+
+    def schedule_interval(self,callback,timeout):
+        """
+        Schedules the callback to be called every timeout seconds.
+
+        A timeout of 0 means the callback is called every tick.
+
+        :param callback: The function to call with the elapsed time
+        :type callback:  callable
+
+        :param timeout: The number of seconds between calls
+        :type timeout:  ``int`` or ``float`` >= 0
+        """
+        with self._lock:
+            self._events.append([callback,self._time,timeout,True])
+
+    def unschedule(self,callback):
+        """
+        Removes all scheduled calls for the given callback.
+
+        :param callback: The function to remove
+        :type callback:  callable
+        """
+        with self._lock:
+            self._events = [e for e in self._events if e[0] != callback]
+
+    def tick(self,dt):
+        """
+        Advances the time by dt and calls any callbacks that are due.
+
+        :param dt: The number of seconds to advance
+        :type dt:  ``int`` or ``float`` > 0
+        """
+        self._time += dt
+        self._frames += 1
+        with self._lock:
+            events = list(self._events)
+        for event in events:
+            callback, last, timeout, repeat = event
+            # Allow for rounding, so that ticks of the interval never miss
+            if self._time-last >= timeout-1e-9:
+                if repeat:
+                    event[1] = self._time
+                else:
+                    with self._lock:
+                        self._events.remove(event)
+                callback(self._time-last)
+
+
+#: The shared virtual clock (mirrors kivy.clock.Clock)
+Clock = VirtualClock()
+
+
+class App(object):
+    """
+    A class representing an application without a window (mirrors kivy.app.App).
+    """
+
+    def __init__(self,**keywords):
+        """
+        Creates a new application.
+        """
+        self.root = None
+
+    def run(self):
+        """
+        Builds the application.
+
+        There is no event loop in headless mode. Call ``Clock.tick`` to run the
+        scheduled callbacks.
+        """
+        self.root = self.build()
+
+    def stop(self):
+        """
+        Stops the application.
+        """
+        pass
+
+
+# #mark - Input
+
+class VirtualInput(object):
+    """
+    A class representing scripted keyboard and mouse input.
+
+    This class has the same public interface as :class:`GInput`, so it can be passed
+    anywhere that a game expects the input handler.  Instead of listening to the
+    keyboard, keys are pressed and released with the methods :meth:`press` and
+    :meth:`release`.
+    """
+
+    @property
+    def touch(self):
+        """
+        The current (x,y) coordinate of the mouse, if pressed.
+
+        **Invariant**: Must be either a :class:`Point2` or None (if there is no touch).
+        """
+        return self._touch
+
+    @property
+    def key_count(self):
+        """
+        The number of keys currently held down.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return len(self._keys)
+
+    @property
+    def keys(self):
+        """
+        The list of keys that are currently held down.
+
+        **Invariant**: Must be a tuple of strings (possibly empty)
+        """
+        return tuple(self._keys)
+
+    def __init__(self):
+        """
+        Creates a new input handler with no keys held down.
+        """
+        self._keys = set()
+        self._touch = None
+
+    def is_key_down(self,key):
+        """
+        Checks wether the key is currently held down.
+
+        :param key: the key to test
+        :type key:  ``str``
+
+        :return: True if ``key`` is currently held down
+        :rtype:  ``bool``
+        """
+        return key in self._keys
+
+    def is_touch_down(self):
+        """
+        Checks wether the mouse is currently held down.
+
+        :return: True if the mouse is currently held down; False otherwise
+        :rtype:  ``bool``
+        """
+        return not self._touch is None
+
+    def press(self,*keys):
+        """
+        Holds down the given keys.
+
+        :param keys: the keys to press
+        :type keys:  ``str``
+        """
+        self._keys.update(keys)
+
+    def release(self,*keys):
+        """
+        Releases the given keys (or all keys if none are given).
+
+        :param keys: the keys to release
+        :type keys:  ``str``
+        """
+        if keys:
+            self._keys.difference_update(keys)
+        else:
+            self._keys.clear()
+
+    def touch_at(self,point):
+        """
+        Presses the mouse at the given point (or releases it if point is None).
+
+        :param point: the mouse position
+        :type point:  :class:`Point2` or ``None``
+        """
+        self._touch = point
@@ -0,0 +1,297 @@
+"""
+A module to measure where the time goes in each animation frame.
+
+Every frame of a :class:`GameApp` has the same phases: clearing the view, updating
+the game, drawing it, and (with Kivy) submitting the canvas to OpenGL.  The class
+:class:`FrameStats` times each phase with a monotonic clock and keeps the last few
+seconds of times, so you can ask for the median and the slow frames (the 95th and 99th
+percentile, and the worst) at any time.  It also counts the frames that missed the
+target frame rate.
+
+The class :class:`PerfOverlay` shows these statistics on top of the game.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+import numpy as np
+import threading
+import time
+
+# The phases of a frame, in order.  The phase 'frame' is the time between frames.
+FRAME_PHASES = ('clear', 'update', 'draw', 'submit', 'frame')
+
+
+class FrameStats(object):
+    """
+    A class to keep rolling timings of the phases of a frame.
+
+    A frame begins with :meth:`start`.  Each call to :meth:`lap` then records the time
+    since the last call (or since the start) as the time of the given phase.  Only the
+    last ``window`` times of each phase are kept, so the statistics are always for the
+    recent past.
+
+    A frame is dropped if it comes later than the target frame rate allows.  A frame
+    that took as long as three frames counts as two dropped frames.  A draw that the
+    game chose not to do (to catch up on updates) is counted as skipped instead.
+
+    The times may be recorded on one thread and read on another (a threaded
+    :class:`GameApp` records its updates on the simulation thread).  A lock guards the
+    rolling buffers, so a reader never sees a time half recorded.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def fps(self):
+        """
+        The target number of frames per second.
+
+        **Invariant**: Must be an int or float > 0.
+        """
+        return self._fps
+
+    @fps.setter
+    def fps(self,value):
+        assert type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value > 0, 'value %s is not positive' % repr(value)
+        self._fps = value
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def window(self):
+        """
+        The number of times kept for each phase.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._window
+
+    @property
+    def frames(self):
+        """
+        The number of frames started since the last reset.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._frames
+
+    @property
+    def dropped(self):
+        """
+        The number of frames dropped since the last reset.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._dropped
+
+    @property
+    def skipped(self):
+        """
+        The number of draws skipped since the last reset.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an int >= 0.
+        """
+        return self._skipped
+
+
+    # BUILT-IN METHODS
+    def __init__(self,fps=60,window=600):
+        """
+        Creates a new (empty) set of timings.
+
+        :param fps: the target number of frames per second
+        :type fps:  ``int`` or ``float`` > 0
+
+        :param window: the number of times to keep for each phase
+        :type window:  ``int`` > 0
+        """
+        assert window > 0, 'window %s is not positive' % repr(window)
+        self.fps = fps
+        self._window = window
+        self._times = dict((phase,np.zeros(window)) for phase in FRAME_PHASES)
+        self._lock = threading.Lock()
+        self.reset()
+
+
+    # PUBLIC METHODS
+    def reset(self):
+        """
+        Forgets all of the timings and the frame counts.
+        """
+        with self._lock:
+            self._counts = dict((phase,0) for phase in FRAME_PHASES)
+        self._frames  = 0
+        self._dropped = 0
+        self._skipped = 0
+        self._last = None
+        self._mark = None
+
+    def start(self,paced=True):
+        """
+        Starts timing a new frame.
+
+        This records the time since the previous frame started as the phase 'frame',
+        and counts any frames dropped in between.  Frames that are not expected at the
+        target rate (such as when the game is idle) should set ``paced`` to False, so
+        that they are not counted as dropped.
+
+        :param paced: whether the frame was expected at the target frame rate
+        :type paced:  ``bool``
+        """
+        now = time.perf_counter()
+        if not self._last is None:
+            elapsed = now-self._last
+            self.record('frame',elapsed)
+            late = int(elapsed*self._fps+0.5)-1
+            if paced and late > 0:
+                self._dropped += late
+        self._frames += 1
+        self._last = now
+        self._mark = now
+
+    def lap(self,phase,stop=False):
+        """
+        Records the time since the last lap (or the frame start) for a phase.
+
+        If ``stop`` is True, then no further laps are recorded until the next frame
+        starts.  Laps outside of a frame do nothing.
+
+        :param phase: the phase that just finished
+        :type phase:  one of ``FRAME_PHASES``
+
+        :param stop: whether this is the last lap of the frame
+        :type stop:  ``bool``
+        """
+        if self._mark is None:
+            return
+        now = time.perf_counter()
+        self.record(phase,now-self._mark)
+        self._mark = None if stop else now
+
+    def skip(self):
+        """
+        Counts a skipped draw.
+        """
+        self._skipped += 1
+
+    def record(self,phase,seconds):
+        """
+        Records a single time for a phase.
+
+        :param phase: the phase
+        :type phase:  one of ``FRAME_PHASES``
+
+        :param seconds: the time the phase took
+        :type seconds:  ``float`` >= 0
+        """
+        with self._lock:
+            count = self._counts[phase]
+            self._times[phase][count % self._window] = seconds
+            self._counts[phase] = count+1
+
+    def times(self,phase):
+        """
+        Returns: the recent times of a phase in seconds, oldest first
+
+        :param phase: the phase
+        :type phase:  one of ``FRAME_PHASES``
+        """
+        with self._lock:
+            count = self._counts[phase]
+            times = self._times[phase]
+            if count <= self._window:
+                return times[:count].copy()
+            start = count % self._window
+            return np.concatenate((times[start:],times[:start]))
+
+    def summary(self):
+        """
+        Returns: a dictionary of the recent statistics
+
+        The dictionary has the total 'frames', 'dropped' frames and 'skipped' draws, the
+        measured 'fps' (from the recent frame times), and an entry for each phase with a
+        timing.  The entry for a phase is a dictionary with the keys 'p50', 'p95', 'p99',
+        'worst' and 'mean', all in seconds.
+        """
+        result = {'frames': self._frames, 'dropped': self._dropped,
+                  'skipped': self._skipped, 'fps': 0.0}
+        for phase in FRAME_PHASES:
+            times = self.times(phase)
+            if len(times) == 0:
+                continue
+            p50, p95, p99 = np.percentile(times,(50,95,99))
+            result[phase] = {'p50': float(p50), 'p95': float(p95), 'p99': float(p99),
+                             'worst': float(times.max()), 'mean': float(times.mean())}
+        if 'frame' in result and result['frame']['mean'] > 0:
+            result['fps'] = 1.0/result['frame']['mean']
+        return result
+
+
+# #mark -
+class PerfOverlay(object):
+    """
+    A class to show the frame statistics on top of the game.
+
+    The overlay is a label in the top left corner of the view.  Changing the text of
+    a label renders it again, so the text is only changed every ``interval`` seconds.
+    The statistics are almost never the same twice, so the label does not use the
+    text cache, which is left for the text of the game.
+    """
+
+    def __init__(self,stats,interval=0.5,font_size=14):
+        """
+        Creates an overlay for the given statistics.
+
+        :param stats: the statistics to show
+        :type stats:  :class:`FrameStats`
+
+        :param interval: the seconds between changes to the text
+        :type interval:  ``int`` or ``float`` >= 0
+
+        :param font_size: the size of the text
+        :type font_size:  ``int`` or ``float`` > 0
+        """
+        from .grectangle import GLabel
+        self.stats = stats
+        self.interval = interval
+        self._label = GLabel(text=' ',font_size=font_size,halign='left',valign='top',
+                             linecolor=(1,1,1,1),fillcolor=(0,0,0,0.6),cached=False)
+        self._shown = None
+
+    def draw(self,view):
+        """
+        Draws the overlay in the top left corner of the view.
+
+        :param view: the view to draw to
+        :type view:  :class:`GView`
+        """
+        now = time.perf_counter()
+        if self._shown is None or now-self._shown >= self.interval:
+            self._label.text = self._text()
+            self._shown = now
+        self._label.left = 0
+        self._label.top  = view.height
+        self._label.draw(view)
+
+    def _text(self):
+        """
+        Returns: the text of the overlay for the current statistics
+        """
+        summary = self.stats.summary()
+        lines = ['%5.1f fps  %d dropped  %d skipped' % (summary['fps'],summary['dropped'],
+                                                       summary['skipped'])]
+        lines.append('%-7s %6s %6s %6s %6s' % ('ms','p50','p95','p99','worst'))
+        for phase in FRAME_PHASES:
+            if phase in summary:
+                times = summary[phase]
+                lines.append('%-7s %6.2f %6.2f %6.2f %6.2f' % (phase,1000*times['p50'],
+                             1000*times['p95'],1000*times['p99'],1000*times['worst']))
+        return '\n'.join(lines)
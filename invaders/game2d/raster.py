@@ -0,0 +1,650 @@
+"""
+A software rendering backend for game2d.
+
+Every drawable in this package draws itself by adding graphics instructions to the
+canvas of a :class:`GView`.  Kivy sends those instructions to OpenGL, which needs a
+window and a GPU.  The class in this module draws the same instructions with NumPy
+into an RGBA framebuffer instead.  That means a game can be rendered on a machine with
+no display, which is what you want for golden-image tests, thumbnails and benchmarks of
+the draw path.
+
+The renderer understands the instructions that game2d uses: the matrix stack
+(PushMatrix, PopMatrix, Translate, Rotate and Scale), Color, Rectangle, Ellipse, Line
+and Mesh.  Transforms are 2D affine transforms, textures are sampled with the nearest
+texel, and colors are alpha blended.  Lines are drawn as thick segments without joins,
+so wide lines have small notches at their corners.  It is not pixel-for-pixel the same
+as OpenGL, but it is close enough to see what is on the screen.
+
+Textures are read through their ``pixels`` attribute.  Headless textures (see
+:mod:`game2d.headless`) have NumPy pixels; Kivy textures have a byte string, which is
+read once and remembered.
+
+Drawing is split in two.  Recording walks the instructions into a display list, which
+is quick.  Replaying the list fills in the pixels, which is slow.  The list does not
+refer to anything the game can change, so a frame can be recorded in the animation
+loop and replayed on another thread.  This is how :class:`GameApp` records videos.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import *
+else:
+    from kivy.graphics import *
+    from kivy.graphics.instructions import *
+
+from .affine import Affine
+import numpy as np
+import math
+
+# The number of segments in the outline of an ellipse
+ELLIPSE_SEGMENTS = 32
+
+# The most textures to remember the pixels of before starting over
+_TEXTURE_CACHE_SIZE = 64
+
+
+class SoftwareRenderer(object):
+    """
+    A class to draw graphics instructions into an RGBA framebuffer.
+
+    To use a renderer with the game, assign it to the ``backend`` attribute of the
+    view and call :meth:`GView.render`.  You can also render any instruction (such as
+    the canvas of a view, or the drawing cache of a single object) directly with
+    :meth:`render`.
+
+    To draw on another thread, call :meth:`record` where you would call :meth:`render`,
+    and hand the result to :meth:`replay` on the other thread.
+
+    The framebuffer has the origin (0,0) at the bottom left corner, just like the game
+    window.  The pixels returned by :meth:`read` are in the usual image order, with the
+    top row first, so they can be saved with :meth:`save` or compared directly.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def background(self):
+        """
+        The color that :meth:`clear` fills the framebuffer with.
+
+        **Invariant**: Must be a 4-element tuple of floats in 0..1.
+        """
+        return self._background
+
+    @background.setter
+    def background(self,value):
+        import cornell
+        self._background = cornell.glcolor(value)
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def width(self):
+        """
+        The width of the framebuffer in pixels.
+
+        **Immutable**: This value cannot be altered, except by :meth:`resize`.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._buffer.shape[1]
+
+    @property
+    def height(self):
+        """
+        The height of the framebuffer in pixels.
+
+        **Immutable**: This value cannot be altered, except by :meth:`resize`.
+
+        **Invariant**: Must be an int > 0.
+        """
+        return self._buffer.shape[0]
+
+    @property
+    def size(self):
+        """
+        The framebuffer size as a (width,height) pair.
+
+        **Immutable**: This value cannot be altered, except by :meth:`resize`.
+        """
+        return (self._buffer.shape[1],self._buffer.shape[0])
+
+    @property
+    def pixels(self):
+        """
+        A copy of the framebuffer as RGBA bytes, with the top row first.
+
+        This allocates a new array.  Use :meth:`read` to reuse an array instead.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a height x width x 4 array of ``uint8``.
+        """
+        return self.read()
+
+
+    # BUILT-IN METHODS
+    def __init__(self,width,height,background=(1,1,1,1)):
+        """
+        Creates a new renderer with a framebuffer of the given size.
+
+        :param width: the framebuffer width in pixels
+        :type width:  ``int`` > 0
+
+        :param height: the framebuffer height in pixels
+        :type height:  ``int`` > 0
+
+        :param background: the color to clear the framebuffer to
+        :type background:  a color value (see :func:`cornell.glcolor`)
+        """
+        self.background = background
+        self._buffer = None
+        self._textures = {}
+        self.resize(width,height)
+
+
+    # PUBLIC METHODS
+    def resize(self,width,height):
+        """
+        Changes the size of the framebuffer, clearing it.
+
+        :param width: the framebuffer width in pixels
+        :type width:  ``int`` > 0
+
+        :param height: the framebuffer height in pixels
+        :type height:  ``int`` > 0
+        """
+        width  = max(1,int(round(width)))
+        height = max(1,int(round(height)))
+        if self._buffer is None or self._buffer.shape[:2] != (height,width):
+            self._buffer = np.empty((height,width,4),dtype=np.float32)
+            # The pixel centers, for the hit tests of the shapes
+            self._xs = np.arange(width,dtype=np.float32)+0.5
+            self._ys = np.arange(height,dtype=np.float32)+0.5
+        self.clear()
+
+    def clear(self,color=None):
+        """
+        Fills the framebuffer with a single color.
+
+        :param color: the color to fill with (the background color if None)
+        :type color:  a color value or None
+        """
+        if color is None:
+            self._buffer[:] = self._background
+        else:
+            import cornell
+            self._buffer[:] = cornell.glcolor(color)
+
+    def render(self,instruction,clear=True):
+        """
+        Draws a graphics instruction (and all of its children) into the framebuffer.
+
+        This is the same as calling :meth:`replay` on the result of :meth:`record`.
+
+        :param instruction: the instruction to draw
+        :type instruction:  an ``Instruction`` or ``InstructionGroup``
+
+        :param clear: whether to clear the framebuffer first
+        :type clear:  ``bool``
+        """
+        self.replay(self.record(instruction),clear)
+
+    def record(self,instruction):
+        """
+        Returns: the display list of a graphics instruction (and all of its children)
+
+        Drawing happens in two steps.  This method walks the instructions, working out
+        the transform and color of each shape, and copies what it needs to draw the
+        shape into a list.  Then :meth:`replay` fills in the shapes, which is the slow
+        step.  As the list shares nothing with the instructions that the game can
+        change, it can be replayed later, and on another thread.
+
+        This method never touches the framebuffer, so it can be called while another
+        thread replays an earlier list.  But only one thread may record at a time.
+
+        :param instruction: the instruction to record
+        :type instruction:  an ``Instruction`` or ``InstructionGroup``
+        """
+        self._matrix = Affine()
+        self._stack  = []
+        self._color  = (1.0,1.0,1.0,1.0)
+        commands = []
+        self._record(instruction,commands)
+        return commands
+
+    def replay(self,commands,clear=True):
+        """
+        Draws a display list into the framebuffer.
+
+        Only one thread may replay at a time.
+
+        :param commands: the display list to draw
+        :type commands:  a list returned by :meth:`record`
+
+        :param clear: whether to clear the framebuffer first
+        :type clear:  ``bool``
+        """
+        if clear:
+            self.clear()
+        for command in commands:
+            kind = command[0]
+            if kind == 'box':
+                self._fill_box(*command[1:])
+            elif kind == 'mesh':
+                self._fill_mesh(*command[1:])
+            elif kind == 'line':
+                self._stroke(*command[1:])
+
+    def read(self,out=None):
+        """
+        Returns: the framebuffer as RGBA bytes, with the top row first
+
+        If ``out`` is given, the pixels are written to it (and it is returned).
+        Otherwise this allocates a new array.
+
+        :param out: the array to write to
+        :type out:  ``None`` or a height x width x 4 array of ``uint8``
+        """
+        if out is None:
+            out = np.empty(self._buffer.shape,dtype=np.uint8)
+        np.multiply(self._buffer[::-1],255.0,out=out,casting='unsafe')
+        return out
+
+    def save(self,filename):
+        """
+        Saves the framebuffer to a PNG file.
+
+        :param filename: the full path of the PNG file
+        :type filename:  ``str``
+        """
+        from .atlas import write_png
+        write_png(filename,self.read())
+
+
+    # HIDDEN METHODS
+    def _record(self,instruction,commands):
+        """
+        Records a single instruction, recursing into groups.
+
+        :param instruction: the instruction to record
+        :type instruction:  an ``Instruction`` or ``InstructionGroup``
+
+        :param commands: the display list to add to
+        :type commands:  ``list``
+        """
+        if isinstance(instruction,InstructionGroup):
+            for child in instruction.children:
+                self._record(child,commands)
+        elif isinstance(instruction,Color):
+            self._color = tuple(instruction.rgba)
+        elif isinstance(instruction,PushMatrix):
+            self._stack.append(self._matrix)
+        elif isinstance(instruction,PopMatrix):
+            self._matrix = self._stack.pop()
+        elif isinstance(instruction,Translate):
+            self._matrix = self._matrix*Affine(tx=instruction.x,ty=instruction.y)
+        elif isinstance(instruction,Rotate):
+            self._rotate(instruction)
+        elif isinstance(instruction,Scale):
+            self._matrix = self._matrix*Affine(a=instruction.x,d=instruction.y)
+        elif isinstance(instruction,(Ellipse,Rectangle)):
+            x, y = instruction.pos
+            w, h = instruction.size
+            texture = instruction.texture
+            coords = None if texture is None else tuple(texture.tex_coords)
+            oval = isinstance(instruction,Ellipse)
+            commands.append(('box',self._matrix*Affine(w,0.0,0.0,h,x,y),self._color,
+                             self._texture(texture),coords,oval))
+        elif isinstance(instruction,Line):
+            points, close = _line_points(instruction)
+            commands.append(('line',self._matrix,self._color,points,close,
+                             instruction.width))
+        elif isinstance(instruction,Mesh):
+            if _mesh_triangles(instruction.mode) is not None:
+                commands.append(('mesh',self._matrix,self._color,
+                                 np.array(instruction.vertices,dtype=np.float64),
+                                 list(instruction.indices),instruction.mode,
+                                 self._texture(instruction.texture)))
+
+    def _rotate(self,rotate):
+        """
+        Applies a rotation about the z-axis to the current transform.
+
+        Rotations about any other axis leave the 2D transform unchanged.
+
+        :param rotate: the rotation
+        :type rotate:  ``Rotate``
+        """
+        axis = tuple(rotate.axis)
+        if axis[2] == 0 or rotate.angle == 0:
+            return
+        angle = rotate.angle if axis[2] > 0 else -rotate.angle
+        ox, oy = tuple(rotate.origin)[:2]
+        turn = Affine.compose(ox,oy,angle,1.0,1.0)*Affine(tx=-ox,ty=-oy)
+        self._matrix = self._matrix*turn
+
+    def _texture(self,texture):
+        """
+        Returns: the texture as a (pixels,repeat) pair, or None to draw in solid color
+
+        The pixels are those of :meth:`_texture_pixels`, and repeat is whether the
+        texture wraps around.  The result is None if there is no texture, or if it has
+        no pixels.
+
+        :param texture: the texture to look up
+        :type texture:  ``Texture`` or ``None``
+        """
+        if texture is None:
+            return None
+        pixels = self._texture_pixels(texture)
+        if pixels is None:
+            return None
+        return (pixels,getattr(texture,'wrap',None) == 'repeat')
+
+    def _fill_box(self,matrix,color,texture,coords,oval):
+        """
+        Fills the image of the unit square (or the circle inscribed in it).
+
+        The unit square is sent to the shape (in window coordinates) by ``matrix``.
+        The texture coordinates of the corners are (u0,v0,u1,v1,u2,v2,u3,v3), starting
+        at the bottom left and going counter-clockwise.
+
+        :param matrix: the transform from the unit square to the shape
+        :type matrix:  :class:`Affine`
+
+        :param color: the color to draw in (or to tint the texture with)
+        :type color:  4-element ``tuple`` of ``float``
+
+        :param texture: the texture to draw, if any
+        :type texture:  a pair from :meth:`_texture` or ``None``
+
+        :param coords: the texture coordinates of the corners
+        :type coords:  8-element ``tuple`` of ``float`` or ``None``
+
+        :param oval: whether to fill the inscribed ellipse instead of the square
+        :type oval:  ``bool``
+        """
+        # The bounds are for a square centered at the origin, so move to the center
+        window = self._window((matrix*Affine(tx=0.5,ty=0.5)).bounds(1.0,1.0))
+        if window is None or matrix.determinant() == 0:
+            return
+        (x0, y0, x1, y1) = window
+        inverse = matrix.inverse()
+        xs = self._xs[np.newaxis,x0:x1]
+        ys = self._ys[y0:y1,np.newaxis]
+        u = inverse.a*xs+inverse.c*ys+inverse.tx
+        v = inverse.b*xs+inverse.d*ys+inverse.ty
+        if oval:
+            mask = (u-0.5)**2+(v-0.5)**2 <= 0.25
+        else:
+            mask = (u >= 0) & (u < 1) & (v >= 0) & (v < 1)
+
+        texels = None
+        if texture is not None:
+            c = coords
+            tu = c[0]+(c[2]-c[0])*u+(c[6]-c[0])*v
+            tv = c[1]+(c[3]-c[1])*u+(c[7]-c[1])*v
+            texels = _sample(texture,tu,tv)
+        self._blend(window,mask,color,texels)
+
+    def _fill_triangle(self,points,coords,color,texture):
+        """
+        Fills a triangle (given in window coordinates).
+
+        :param points: the corners of the triangle
+        :type points:  3x2 array of ``float``
+
+        :param coords: the texture coordinates of the corners
+        :type coords:  3x2 array of ``float``
+
+        :param color: the color to draw in (or to tint the texture with)
+        :type color:  4-element ``tuple`` of ``float``
+
+        :param texture: the texture to draw, if any
+        :type texture:  a pair from :meth:`_texture` or ``None``
+        """
+        (ax, ay), (bx, by), (cx, cy) = points
+        area = (bx-ax)*(cy-ay)-(by-ay)*(cx-ax)
+        if area == 0:
+            return
+        bounds = (min(ax,bx,cx),min(ay,by,cy),max(ax,bx,cx),max(ay,by,cy))
+        window = self._window(bounds)
+        if window is None:
+            return
+        (x0, y0, x1, y1) = window
+
+        xs = self._xs[np.newaxis,x0:x1]
+        ys = self._ys[y0:y1,np.newaxis]
+        # The barycentric coordinates of each pixel center
+        wa = ((bx-xs)*(cy-ys)-(by-ys)*(cx-xs))/area
+        wb = ((cx-xs)*(ay-ys)-(cy-ys)*(ax-xs))/area
+        wc = 1.0-wa-wb
+        mask = (wa >= 0) & (wb >= 0) & (wc >= 0)
+
+        texels = None
+        if texture is not None:
+            tu = wa*coords[0][0]+wb*coords[1][0]+wc*coords[2][0]
+            tv = wa*coords[0][1]+wb*coords[1][1]+wc*coords[2][1]
+            texels = _sample(texture,tu,tv)
+        self._blend(window,mask,color,texels)
+
+    def _fill_mesh(self,matrix,color,vertices,indices,mode,texture):
+        """
+        Fills the triangles of a mesh.
+
+        The vertices are (x,y,u,v) as in game2d.  Only the triangle modes are drawn.
+
+        :param matrix: the transform from the mesh to window coordinates
+        :type matrix:  :class:`Affine`
+
+        :param color: the color to draw in (or to tint the texture with)
+        :type color:  4-element ``tuple`` of ``float``
+
+        :param vertices: the vertices of the mesh
+        :type vertices:  array of ``float``, four per vertex
+
+        :param indices: the vertex indices of the triangles
+        :type indices:  ``list`` of ``int``
+
+        :param mode: the mesh mode
+        :type mode:  ``str``
+
+        :param texture: the texture to draw, if any
+        :type texture:  a pair from :meth:`_texture` or ``None``
+        """
+        if len(indices) < 3:
+            return
+        vertices = vertices.reshape(-1,4)
+        m = matrix
+        points = np.empty((len(vertices),2))
+        points[:,0] = m.a*vertices[:,0]+m.c*vertices[:,1]+m.tx
+        points[:,1] = m.b*vertices[:,0]+m.d*vertices[:,1]+m.ty
+        for triangle in _mesh_triangles(mode)(indices):
+            self._fill_triangle(points[triangle],vertices[triangle,2:],color,texture)
+
+    def _stroke(self,matrix,color,points,close,width):
+        """
+        Draws a line as a sequence of thick segments.
+
+        :param matrix: the transform from the line to window coordinates
+        :type matrix:  :class:`Affine`
+
+        :param color: the color to draw in
+        :type color:  4-element ``tuple`` of ``float``
+
+        :param points: the points of the line
+        :type points:  ``list`` of (x,y) pairs
+
+        :param close: whether to join the last point to the first
+        :type close:  ``bool``
+
+        :param width: the line width
+        :type width:  ``float``
+        """
+        if len(points) < 2:
+            return
+        if close:
+            points = points+[points[0]]
+
+        half = width/2.0
+        for (ax, ay), (bx, by) in zip(points[:-1],points[1:]):
+            length = math.hypot(bx-ax,by-ay)
+            if length == 0:
+                continue
+            dx = (bx-ax)/length
+            dy = (by-ay)/length
+            # Square off the ends, so that corners are filled in
+            local = Affine((length+2*half)*dx,(length+2*half)*dy,-2*half*dy,2*half*dx,
+                           ax-half*dx+half*dy,ay-half*dy-half*dx)
+            self._fill_box(matrix*local,color,None,None,False)
+
+    def _window(self,bounds):
+        """
+        Returns: the pixels whose centers are in a bounding box, clipped to the framebuffer
+
+        The result is (x0,y0,x1,y1), with the ranges x0..x1-1 and y0..y1-1, or None if
+        no pixels are covered.
+
+        :param bounds: the box (left,bottom,right,top)
+        :type bounds:  4-element sequence of ``float``
+        """
+        left, bottom, right, top = bounds
+        x0 = max(int(math.floor(left+0.5)),0)
+        y0 = max(int(math.floor(bottom+0.5)),0)
+        x1 = min(int(math.ceil(right-0.5)),self.width)
+        y1 = min(int(math.ceil(top-0.5)),self.height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (x0,y0,x1,y1)
+
+    def _texture_pixels(self,texture):
+        """
+        Returns: the pixels of the texture that a texture (or region) belongs to
+
+        The pixels are floats in 0..1 with the top row first, or None if the texture
+        has no pixels.  They are remembered, as converting them is slow.
+
+        :param texture: the texture (or region)
+        :type texture:  ``Texture``
+        """
+        root = getattr(texture,'owner',None) or texture
+        entry = self._textures.get(id(root))
+        if entry is not None and entry[0] is root:
+            return entry[1]
+
+        pixels = getattr(root,'pixels',None)
+        if isinstance(pixels,bytes):
+            # Kivy textures start with the bottom row
+            pixels = np.frombuffer(pixels,dtype=np.uint8)
+            pixels = pixels.reshape(int(root.height),int(root.width),4)[::-1]
+        if pixels is not None:
+            pixels = pixels.astype(np.float32)/255.0
+
+        if len(self._textures) >= _TEXTURE_CACHE_SIZE:
+            self._textures.clear()
+        self._textures[id(root)] = (root,pixels)
+        return pixels
+
+    def _blend(self,window,mask,color,texels):
+        """
+        Blends a color (times the texels) into the framebuffer.
+
+        :param window: the pixels to blend into, as (x0,y0,x1,y1)
+        :type window:  4-element ``tuple`` of ``int``
+
+        :param mask: which pixels in the window are covered
+        :type mask:  2d array of ``bool``
+
+        :param color: the color to blend
+        :type color:  4-element ``tuple`` of ``float``
+
+        :param texels: the texture color of each pixel, if any
+        :type texels:  ``None`` or 3d array of ``float``
+        """
+        (x0, y0, x1, y1) = window
+        color = np.asarray(color,dtype=np.float32)
+        if texels is None:
+            source = np.broadcast_to(color,(y1-y0,x1-x0,4))
+        else:
+            source = texels*color
+        alpha = source[:,:,3]*mask
+        if not alpha.any():
+            return
+
+        target = self._buffer[y0:y1,x0:x1]
+        alpha = alpha[:,:,np.newaxis]
+        target[:,:,:3] += (source[:,:,:3]-target[:,:,:3])*alpha
+        target[:,:,3:] += (1.0-target[:,:,3:])*alpha
+
+
+# #mark - Helpers
+
+def _sample(texture,tu,tv):
+    """
+    Returns: the texels at the given texture coordinates, as floats in 0..1
+
+    :param texture: the texture to sample
+    :type texture:  a (pixels,repeat) pair from :meth:`SoftwareRenderer._texture`
+
+    :param tu: the horizontal texture coordinates
+    :type tu:  array of ``float``
+
+    :param tv: the vertical texture coordinates (0 is the bottom of the texture)
+    :type tv:  array of ``float``
+    """
+    pixels, repeat = texture
+    height, width = pixels.shape[:2]
+    cols = np.floor(tu*width).astype(np.intp)
+    rows = height-1-np.floor(tv*height).astype(np.intp)
+    if repeat:
+        cols %= width
+        rows %= height
+    else:
+        np.clip(cols,0,width-1,out=cols)
+        np.clip(rows,0,height-1,out=rows)
+    return pixels[rows,cols]
+
+
+def _mesh_triangles(mode):
+    """
+    Returns: a function that splits mesh indices into triangles, or None
+
+    The function takes a list of indices and returns a list of index triples.  There
+    is no function (the result is None) for meshes that are not made of triangles.
+
+    :param mode: the mesh mode
+    :type mode:  ``str``
+    """
+    if mode == 'triangles':
+        return lambda ids: [ids[pos:pos+3] for pos in range(0,len(ids)-2,3)]
+    elif mode == 'triangle_strip':
+        return lambda ids: [ids[pos:pos+3] for pos in range(len(ids)-2)]
+    elif mode == 'triangle_fan':
+        return lambda ids: [[ids[0],ids[pos],ids[pos+1]] for pos in range(1,len(ids)-1)]
+    return None
+
+
+def _line_points(line):
+    """
+    Returns: the points of a line as a list of (x,y) pairs, and whether it is closed
+
+    Lines can be given as points, as a rectangle or as an ellipse.
+
+    :param line: the line
+    :type line:  ``Line``
+    """
+    rectangle = getattr(line,'rectangle',None)
+    ellipse = getattr(line,'ellipse',None)
+    if rectangle:
+        x, y, w, h = tuple(rectangle)[:4]
+        return ([(x,y),(x+w,y),(x+w,y+h),(x,y+h)],True)
+    elif ellipse:
+        x, y, w, h = tuple(ellipse)[:4]
+        rx, ry = w/2.0, h/2.0
+        steps = [2*math.pi*k/ELLIPSE_SEGMENTS for k in range(ELLIPSE_SEGMENTS)]
+        return ([(x+rx+rx*math.cos(a),y+ry+ry*math.sin(a)) for a in steps],True)
+
+    flat = list(line.points)
+    return (list(zip(flat[0::2],flat[1::2])),bool(getattr(line,'close',False)))
@@ -6,7 +6,11 @@ This classes wrap the Kivy audio interface, making it simpler for students to us
 Author: Walker M. White (wmw2)
 Date:   August 1, 2017 (Python 3 version)
 """
-from kivy.core.audio import SoundLoader
+from .headless import HEADLESS
+if HEADLESS:
+    from .headless import SoundLoader
+else:
+    from kivy.core.audio import SoundLoader
 from .app import GameApp
 
 
@@ -0,0 +1,289 @@
+"""
+A module to run the game simulation on a background thread.
+
+Normally a :class:`GameApp` updates and draws the game on the same (main) thread, so a
+slow update delays the next drawing.  In threaded mode, the updates run on their own
+thread at a fixed rate (:class:`SimulationThread`).  After each update, the game
+publishes a snapshot of what there is to draw, and the main thread draws the newest
+complete snapshot.
+
+The two threads never share the game objects, and never wait on each other.  They
+only share the snapshots, which are handed over through a :class:`SnapshotBuffer`.
+A snapshot must be immutable (such as a tuple of numbers, or of read-only arrays), as
+the simulation thread keeps going while it is drawn.
+
+Author: Jason Huang
+Date:   October 18, 2026
+"""
+import threading
+import time
+
+
+class SnapshotBuffer(object):
+    """
+    A class to hand snapshots from one thread to another.
+
+    This is a triple buffer.  It has three slots: the one the writer publishes to (the
+    back slot), the one with the newest complete snapshot (the ready slot), and the one
+    the reader is drawing (the front slot).  Publishing a snapshot swaps the back and
+    ready slots, and reading swaps the ready and front slots if there is something new.
+    So the writer never waits for the reader to finish, the reader never sees a half
+    written snapshot, and the snapshot being drawn is never replaced in the middle of
+    a drawing.
+
+    The lock only guards the swaps, which take constant time.  It is never held while
+    the game is updated or drawn.
+    """
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def published(self):
+        """
+        The number of snapshots published so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._published
+
+    @property
+    def fresh(self):
+        """
+        Whether a newer snapshot is ready than the one last read.
+
+        **Immutable**: This value cannot be altered.
+        """
+        return self._fresh
+
+    @property
+    def stamp(self):
+        """
+        The time (from ``time.perf_counter``) that the last snapshot read was published.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be a ``float``.
+        """
+        return self._stamps[self._front]
+
+
+    # BUILT-IN METHODS
+    def __init__(self,snapshot=None):
+        """
+        Creates a buffer whose slots all hold the given snapshot.
+
+        :param snapshot: the snapshot to read until the first one is published
+        :type snapshot:  any immutable value
+        """
+        now = time.perf_counter()
+        self._slots  = [snapshot]*3
+        self._stamps = [now]*3
+        self._back  = 0
+        self._ready = 1
+        self._front = 2
+        self._fresh = False
+        self._published = 0
+        self._lock = threading.Lock()
+
+
+    # PUBLIC METHODS
+    def publish(self,snapshot):
+        """
+        Makes a snapshot the newest one, replacing any that was not read yet.
+
+        This method should only be called by the writer thread.
+
+        :param snapshot: the snapshot to publish
+        :type snapshot:  any immutable value
+        """
+        self._slots[self._back]  = snapshot
+        self._stamps[self._back] = time.perf_counter()
+        with self._lock:
+            self._back, self._ready = self._ready, self._back
+            self._fresh = True
+            self._published += 1
+
+    def latest(self):
+        """
+        Returns: the newest complete snapshot
+
+        If nothing was published since the last call, this is the same snapshot as
+        before.  This method should only be called by the reader thread.
+        """
+        if self._fresh:
+            with self._lock:
+                self._front, self._ready = self._ready, self._front
+                self._fresh = False
+        return self._slots[self._front]
+
+
+# #mark -
+class SimulationThread(object):
+    """
+    A class to call a function at a fixed rate on a background thread.
+
+    The function is called every ``interval`` seconds, measured from when each call
+    was due (not from when the last one ended), so the rate does not drift.  If a call
+    runs long, the next ones are made back to back until the thread catches up.  If it
+    falls more than ``catchup`` calls behind, the lost time is thrown away instead.
+
+    If the function raises an exception, the thread stops.  The exception is kept in
+    :attr:`error` and raised again by :meth:`stop`.
+    """
+
+    # MUTABLE PROPERTIES
+    @property
+    def interval(self):
+        """
+        The seconds between calls, or None to wait until :meth:`wake` is called.
+
+        Changing this value starts the next call at once, so the new rate is used
+        right away.
+
+        **Invariant**: Must be None or an int or float > 0.
+        """
+        return self._interval
+
+    @interval.setter
+    def interval(self,value):
+        assert value is None or type(value) in [int,float], 'value %s is not a number' % repr(value)
+        assert value is None or value > 0, 'value %s is not positive' % repr(value)
+        if value != self._interval:
+            self._interval = value
+            self._wakeup.set()
+
+
+    # IMMUTABLE PROPERTIES
+    @property
+    def ticks(self):
+        """
+        The number of calls made so far.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._ticks
+
+    @property
+    def dropped(self):
+        """
+        The number of times the thread fell too far behind and threw time away.
+
+        **Immutable**: This value cannot be altered.
+
+        **Invariant**: Must be an ``int`` >= 0.
+        """
+        return self._dropped
+
+    @property
+    def error(self):
+        """
+        The exception that stopped the thread, or None if there was none.
+
+        **Immutable**: This value cannot be altered.
+        """
+        return self._error
+
+    @property
+    def running(self):
+        """
+        Whether the thread is running.
+
+        **Immutable**: This value cannot be altered.
+        """
+        return self._thread is not None and self._error is None
+
+
+    # BUILT-IN METHODS
+    def __init__(self,step,interval,catchup=5):
+        """
+        Creates (but does not start) a thread to call ``step`` at a fixed rate.
+
+        :param step: the function to call
+        :type step:  callable with no arguments
+
+        :param interval: the seconds between calls (None to wait for :meth:`wake`)
+        :type interval:  ``int`` or ``float`` > 0, or None
+
+        :param catchup: the most calls the thread can fall behind before dropping time
+        :type catchup:  ``int`` > 0
+        """
+        assert catchup > 0, 'catchup %s is not positive' % repr(catchup)
+        self._step = step
+        self._catchup = catchup
+        self._wakeup = threading.Event()
+        self._interval = None
+        self.interval = interval
+        self._wakeup.clear()
+        self._thread = None
+        self._halt  = False
+        self._error = None
+        self._ticks = 0
+        self._dropped = 0
+
+
+    # PUBLIC METHODS
+    def start(self):
+        """
+        Starts the thread.
+        """
+        if self._thread is None:
+            self._halt = False
+            self._thread = threading.Thread(target=self._run,name='SimulationThread',daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """
+        Waits for the current call to finish, then stops the thread.
+
+        :raise: any exception raised by the function
+        """
+        if self._thread is not None:
+            self._halt = True
+            self._wakeup.set()
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def wake(self):
+        """
+        Makes the next call at once, instead of waiting for it to be due.
+        """
+        self._wakeup.set()
+
+
+    # HIDDEN METHODS
+    def _run(self):
+        """
+        Calls the function at the fixed rate until told to stop.
+
+        This is the body of the thread.
+        """
+        due = time.perf_counter()
+        while not self._halt:
+            try:
+                self._step()
+            except Exception as e:
+                self._error = e
+                return
+            self._ticks += 1
+
+            interval = self._interval
+            wait = None
+            if interval is not None:
+                now = time.perf_counter()
+                due += interval
+                if now-due > interval*self._catchup:
+                    # Too far behind to catch up, so start over from now
+                    self._dropped += 1
+                    due = now
+                wait = due-now
+            if wait is None or wait > 0:
+                if self._wakeup.wait(wait):
+                    self._wakeup.clear()
+                    due = time.perf_counter()
@@ -0,0 +1,214 @@
+"""
+Memory benchmark for the objects of Alien Invaders
+
+This module measures how much memory the sprites of a wave take: a full formation of
+aliens plus a number of bolts.  It compares three ways to store them.
+
+    dict:   one image or rectangle per sprite, with its attributes in a __dict__ (the
+            way every GObject was stored before the classes used __slots__)
+    slots:  the same objects, with the attributes in __slots__
+    game:   what the game makes now, which is a Formation of NumPy arrays, a BoltPool
+            of plain Bolt models, and a WaveDisplay whose aliens are one sprite batch
+
+For each of these, it reports the bytes per sprite in two ways:
+
+    object:  the size of the Python objects themselves (the object, plus its attribute
+             dictionary if it has one), without the drawing instructions they refer to.
+             For the game, this is the models (with the arrays of the formation), and
+             not the display.
+    total:   every byte allocated while building the sprites, as measured by tracemalloc
+
+The objects with a __dict__ are built here, by copying the attributes of the slotted
+objects into a plain object.  They refer to the same drawing instructions, so the dict
+total is the slots total plus the difference in the object sizes.
+
+Like simulate.py, this runs headless, so the drawing instructions are the stand-ins
+from game2d.headless and not Kivy objects.
+
+To run the benchmark from the command line, type
+
+    python invaders/membench.py [--bolts N]
+
+Jason Huang
+# DATE COMPLETED HERE
+"""
+import simulate
+import sys
+import gc
+import tracemalloc
+import numpy as np
+from consts import *
+from models import *
+from wave import WaveDisplay
+
+
+class SlottedAlien(GImage):
+    """
+    A class to represent a single alien as its own image.
+
+    This is how the aliens were stored before Formation.  The game no longer makes
+    these, so this class only exists as the one-object-per-alien baseline.
+
+    INSTANCE ATTRIBUTES:
+        _speed: the seconds between steps of this alien [float > 0]
+    """
+
+    __slots__ = ('_speed',)
+
+    def __init__(self,**keywords):
+        """
+        Initializes one alien
+
+        Calls GImage to create alien using keywords
+        """
+        super().__init__(**keywords)
+        self._speed = ALIEN_SPEED
+
+
+class DictObject(object):
+    """
+    A class for a plain object that keeps all of its attributes in a __dict__.
+    """
+    pass
+
+
+def slot_names(obj):
+    """
+    Returns: the names of the __slots__ of obj, including those of its base classes
+
+    Parameter obj: the object to look at
+    Precondition: obj is any object
+    """
+    names = []
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__',())
+        if isinstance(slots,str):
+            slots = (slots,)
+        names.extend(name for name in slots if not name in ('__dict__','__weakref__'))
+    return names
+
+
+def unslotted(obj):
+    """
+    Returns: a DictObject with the same attributes as the slotted object obj
+
+    Parameter obj: the object to copy
+    Precondition: obj is an object with __slots__
+    """
+    copy = DictObject()
+    for name in slot_names(obj):
+        if hasattr(obj,name):
+            copy.__dict__[name] = getattr(obj,name)
+    return copy
+
+
+def object_size(obj):
+    """
+    Returns: the bytes used by obj and its attribute dictionary (if any)
+
+    Parameter obj: the object to measure
+    Precondition: obj is any object
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj,'__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(build):
+    """
+    Returns: a tuple of the result of build() and the bytes allocated by the call
+
+    Parameter build: the function to measure
+    Precondition: build is a function with no arguments
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build()
+    total = tracemalloc.get_traced_memory()[0]-start
+    tracemalloc.stop()
+    return (result,total)
+
+
+def make_sprites(bolts):
+    """
+    Returns: a list of alien images for a full formation, followed by bolt rectangles
+
+    These are the sprites a wave would have if every alien and bolt were its own
+    object.  The bolts are the same rectangles that WaveDisplay draws.
+
+    Parameter bolts: the number of bolts to make
+    Precondition: bolts is an int >= 0
+    """
+    sprites = []
+    for row in range(ALIEN_ROWS):
+        source = ALIEN_IMAGES[(row//2) % len(ALIEN_IMAGES)]
+        for col in range(ALIENS_IN_ROW):
+            sprites.append(SlottedAlien(x=col*ALIEN_WIDTH,y=row*ALIEN_HEIGHT,
+                                        width=ALIEN_WIDTH,height=ALIEN_HEIGHT,
+                                        source=source))
+    sprites.extend(GRectangle(width=BOLT_WIDTH,height=BOLT_HEIGHT,fillcolor='red',
+                              linecolor='red') for _ in range(bolts))
+    return sprites
+
+
+def make_game(bolts):
+    """
+    Returns: the objects the game makes for a full formation and the given bolts
+
+    The result is a tuple of the Formation, the Ship, the BoltPool (with every bolt
+    fired) and a WaveDisplay that has drawn them.
+
+    Parameter bolts: the number of bolts to fire
+    Precondition: bolts is an int >= 0
+    """
+    aliens = Formation()
+    ship = Ship()
+    pool = BoltPool(bolts)
+    for pos in range(bolts):
+        pool.fire((pos+1)*GAME_WIDTH/(bolts+1),GAME_HEIGHT/2,'player')
+
+    # The same snapshot as Wave.getState
+    state = ((ship.x,ship.y)+ship.past,
+             tuple((bolt.x,bolt.y)+bolt.past for bolt in pool.getBolts()),
+             aliens.getState())
+    display = WaveDisplay()
+    display.draw(GView(),state)
+    return (aliens,ship,pool,display)
+
+
+def main():
+    """
+    Runs the benchmark with the command line arguments and prints the results
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='Measure the memory of game objects.')
+    parser.add_argument('--bolts',type=int,default=10,help='the number of bolts')
+    args = parser.parse_args()
+
+    # Warm the caches (textures, colors, text), which are shared by every object
+    make_sprites(1)
+    make_game(1)
+
+    sprites, total = measure(lambda : make_sprites(args.bolts))
+    count = len(sprites)
+    slots = sum(map(object_size,sprites))
+    dicts = sum(object_size(unslotted(sprite)) for sprite in sprites)
+
+    game, gtotal = measure(lambda : make_game(args.bolts))
+    aliens, ship, pool, display = game
+    models = sum(map(object_size,pool.getBolts()))+object_size(aliens)+object_size(ship)
+    models += sum(sys.getsizeof(value) for value in vars(aliens).values()
+                  if isinstance(value,np.ndarray))
+
+    print('%d sprites (%d aliens, %d bolts)' % (count,count-args.bolts,args.bolts))
+    print('%-7s %8s %8s %8s' % ('','dict','slots','game'))
+    print('%-7s %8.1f %8.1f %8.1f  bytes per sprite' % ('object:',dicts/count,slots/count,
+                                                        models/count))
+    print('%-7s %8.1f %8.1f %8.1f  bytes per sprite' % ('total:',(total+dicts-slots)/count,
+                                                        total/count,gtotal/count))
+
+
+if __name__ == '__main__':
+    main()
@@ -10,9 +10,9 @@ could just be an instance of GImage that you move across the screen. You only ne
 class when you add extra features to an object. So technically Bolt, which has a velocity, 
 is really the only model that needs to have its own class.
 
-With that said, we have included the subclasses for Ship and Aliens.  That is because
-there are a lot of constants in consts.py for initializing the objects, and you might
-want to add a custom initializer.  With that said, feel free to keep the pass underneath 
+With that said, we have included a subclass for Ship, and a Formation class that 
+stores every alien of a wave.  That is because there are a lot of constants in 
+consts.py for initializing the objects, and you might want to add a custom initializer.  With that said, feel free to keep the pass underneath 
 the class definitions if you do not want to do that.
 
 You are free to add even more models to this module.  You may wish to do this when you 
@@ -24,6 +24,7 @@ Jason Huang
 """
 from consts import *
 from game2d import *
+import numpy as np
 
 # PRIMARY RULE: Models are not allowed to access anything in any module other than 
 # consts.py.  If you need extra information from Gameplay, then it should be
@@ -31,7 +32,100 @@ from game2d import *
 # calls the method.
 
 
-class Ship(GImage):
+class Body(object):
+    """
+    A class to represent a box in the game that moves, without drawing it.
+    
+    A Ship or Bolt may be updated on the simulation thread of a threaded GameApp,
+    and Kivy objects can only be made and changed on the main thread.  So these 
+    models only store numbers, the same way Formation does, and WaveDisplay owns the
+    images and rectangles that show them.
+    
+    The attributes are named like the ones of GObject, so code that only looks at
+    the position and size works with either one.
+    
+    INSTANCE ATTRIBUTES:
+        x:      the x-coordinate of the center [float]
+        y:      the y-coordinate of the center [float]
+        width:  the width of the box [int or float > 0]
+        height: the height of the box [int or float > 0]
+        _pastx: the x-coordinate at the last call to snapshot [float]
+        _pasty: the y-coordinate at the last call to snapshot [float]
+    """
+    
+    __slots__ = ('x','y','width','height','_pastx','_pasty')
+    
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    @property
+    def left(self):
+        """
+        The left edge of the box (read-only)
+        """
+        return self.x-self.width/2.0
+    
+    @property
+    def right(self):
+        """
+        The right edge of the box (read-only)
+        """
+        return self.x+self.width/2.0
+    
+    @property
+    def past(self):
+        """
+        The (x,y) center at the last call to snapshot (read-only)
+        
+        A display interpolates from this position to the current one.
+        """
+        return (self._pastx,self._pasty)
+    
+    
+    # INITIALIZER TO CREATE A NEW BOX
+    def __init__(self,x,y,width,height):
+        """
+        Initializes a box with the given center and size
+        
+        Parameter x: the x-coordinate of the center
+        Precondition: x is an int or float
+        
+        Parameter y: the y-coordinate of the center
+        Precondition: y is an int or float
+        
+        Parameter width: the width of the box
+        Precondition: width is an int or float > 0
+        
+        Parameter height: the height of the box
+        Precondition: height is an int or float > 0
+        """
+        self.x = float(x)
+        self.y = float(y)
+        self.width = width
+        self.height = height
+        self.snapshot()
+    
+    
+    # METHODS TO TRACK MOVEMENT AND CHECK FOR POINTS
+    def snapshot(self):
+        """
+        Remembers the current position as the one to interpolate from
+        
+        Wave calls this before each update, like GameApp does for its GObjects.
+        """
+        self._pastx = self.x
+        self._pasty = self.y
+    
+    def contains(self,point):
+        """
+        Returns: True if the point is inside of the box
+        
+        Parameter point: the point to check
+        Precondition: point is a tuple (x,y) of ints or floats
+        """
+        return (abs(point[0]-self.x) < self.width/2.0 and 
+                abs(point[1]-self.y) < self.height/2.0)
+
+
+class Ship(Body):
     """
     A class to represent the game ship.
     
@@ -49,13 +143,15 @@ class Ship(GImage):
     Alien bolts. An easy way to keep this straight is for this class to have its own 
     collision method.
     
-    However, there is no need for any more attributes other than those inherited by
-    GImage. You would only add attributes if you needed them for extra gameplay
-    features (like animation). If you add attributes, list them below.
+    The ship is a Body, so it has no image.  WaveDisplay draws SHIP_IMAGE wherever 
+    the ship is.
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+        _movement: the distance the ship moves in each update [int or float > 0]
     """
     
+    __slots__ = ('_movement',)
+    
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
      
     # INITIALIZER TO CREATE A NEW SHIP
@@ -67,8 +163,7 @@ class Ship(GImage):
         
         """
         self._movement = SHIP_MOVEMENT
-        super().__init__(x=GAME_WIDTH/2,width = SHIP_WIDTH, height = SHIP_HEIGHT,
-                          bottom = SHIP_BOTTOM, source = SHIP_IMAGE)
+        super().__init__(GAME_WIDTH/2,SHIP_BOTTOM+SHIP_HEIGHT/2,SHIP_WIDTH,SHIP_HEIGHT)
 
 
     # METHODS TO MOVE THE SHIP AND CHECK FOR COLLISIONS
@@ -82,7 +177,7 @@ class Ship(GImage):
         Parameter input: the user input, used to control the ship and change state
         Precondition: instance of GInput; it is inherited from GameApp
         """
-        x = SHIP_MOVEMENT
+        x = self._movement
         if input.is_key_down('left'):
             if(self.x - SHIP_WIDTH/2 - x > 0):
                 self.x -= x
@@ -111,75 +206,14 @@ class Ship(GImage):
             return False
     
 
-class Alien(GImage):
-    """
-    A class to represent a single alien.
-    
-    At the very least, you want a __init__ method to initialize the alien dimensions.
-    These dimensions are all specified in consts.py.
-    
-    You also MIGHT want to add code to detect a collision with a bolt. We do not require
-    this.  You could put this method in Wave if you wanted to.  But the advantage of 
-    putting it here is that Ships and Aliens collide with different bolts.  Ships 
-    collide with Alien bolts, not Ship bolts.  And Aliens collide with Ship bolts, not 
-    Alien bolts. An easy way to keep this straight is for this class to have its own 
-    collision method.
-    
-    However, there is no need for any more attributes other than those inherited by
-    GImage. You would only add attributes if you needed them for extra gameplay
-    features (like giving each alien a score value). If you add attributes, list
-    them below.
-    
-    LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
-    """
-    
-    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
-    def getSpeed(self):
-        return self._speed
-    def setSpeed(self,speed):
-        self._speed = self._speed * speed
-    # INITIALIZER TO CREATE AN ALIEN
-    def __init__(self,**keywords):
-        """
-        Initializes one alien
-        
-        Calls GImage to create alien using keywords
-        """
-        super().__init__(**keywords)
-        self._speed = ALIEN_SPEED
-        
-    # METHOD TO CHECK FOR COLLISION (IF DESIRED)
-    def collides(self,bolt):
-        """
-        Returns: True if the bolt was fired by the player and collides with this alien
-            
-        Parameter bolt: The laser bolt to check
-        Precondition: bolt is of class Bolt
-        """
-        upleft = (bolt.left,bolt.y + bolt.height/2)
-        upright = (bolt.left,bolt.y - bolt.height/2)
-        botleft = (bolt.right,bolt.y + bolt.height/2)
-        botright = (bolt.right,bolt.y - bolt.height/2)
-        
-        if(bolt.name=='player' and (self.contains(upleft) or self.contains(upright)\
-                    or self.contains(botleft) or self.contains(botright))):
-            return True
-        else:
-            return False
-        
-        
-    
-
-    # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
-
-
-class Bolt(GRectangle):
+class Bolt(Body):
     """
     A class representing a laser bolt.
     
     Laser bolts are often just thin, white rectangles.  The size of the bolt is 
-    determined by constants in consts.py. We MUST subclass GRectangle, because we
-    need to add an extra attribute for the velocity of the bolt.
+    determined by constants in consts.py. We need a class for it, because we need to
+    add an extra attribute for the velocity of the bolt.  The bolt is a Body, so it
+    only stores numbers; WaveDisplay draws a red rectangle wherever the bolt is.
     
     The class Wave will need to look at these attributes, so you will need getters for 
     them.  However, it is possible to write this assignment with no setters for the 
@@ -187,7 +221,7 @@ class Bolt(GRectangle):
     is fired.
     
     In addition to the getters, you need to write the __init__ method to set the starting
-    velocity. This __init__ method will need to call the __init__ from GRectangle as a 
+    velocity. This __init__ method will need to call the __init__ from Body as a 
     helper.
     
     You also MIGHT want to create a method to move the bolt.  You move the bolt by adding
@@ -198,7 +232,13 @@ class Bolt(GRectangle):
         _velocity: The velocity in y direction [int or float]
     
     LIST MORE ATTRIBUTES (AND THEIR INVARIANTS) HERE IF NECESSARY
+        name:  who fired the bolt [None (not fired yet), 'player' or 'alien']
+        _slot: the position of this bolt in the live list of its BoltPool, or -1 if 
+            the bolt is not on screen [int]
     """
+    
+    __slots__ = ('name','_velocity','_slot')
+    
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
     def getVelocity(self):
         """
@@ -208,19 +248,39 @@ class Bolt(GRectangle):
         
         
     # INITIALIZER TO SET THE VELOCITY
-    def __init__(self,**keywords):
+    def __init__(self):
         """
         Initializes a Bolt
         
-        
+        The bolt is at the origin and has no owner until it is fired.
         """
-        
-        super().__init__(height = BOLT_HEIGHT, width = BOLT_WIDTH, fillcolor = 'red',
-                         linecolor = 'red',**keywords)
+        super().__init__(0,0,BOLT_WIDTH,BOLT_HEIGHT)
+        self.name = None
         self._velocity = BOLT_SPEED
+        self._slot = -1
         
         
     # ADD MORE METHODS (PROPERLY SPECIFIED) AS NECESSARY
+    def fire(self,x,y,name):
+        """
+        Moves this bolt to a new starting position and gives it a new owner
+        
+        The bolt is not interpolated from its old position.
+        
+        Parameter x: the x-coordinate of the bolt center
+        Precondition: x is an int or float
+        
+        Parameter y: the y-coordinate of the bolt center
+        Precondition: y is an int or float
+        
+        Parameter name: who fired the bolt
+        Precondition: name is 'player' or 'alien'
+        """
+        self.x = float(x)
+        self.y = float(y)
+        self.name = name
+        self.snapshot()
+    
     def isPlayerBolt(self):
         """
         Checks if the bolt is coming from the ship
@@ -242,4 +302,438 @@ class Bolt(GRectangle):
             return True
         return False
     
-# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
\ No newline at end of file
+# IF YOU NEED ADDITIONAL MODEL CLASSES, THEY GO HERE
+class BoltPool(object):
+    """
+    A class to recycle laser bolts.
+    
+    Instead of creating a new bolt for every shot, the pool creates a few bolts up 
+    front.  Firing a bolt takes a retired one and moves it into place, 
+    and retiring a bolt puts it back for later.  The pool only creates a new bolt if 
+    every bolt is already on screen.
+    
+    The bolts on screen are kept in a list.  Each bolt knows its position in that 
+    list, so a bolt is retired by moving the last bolt into its place.  That means 
+    retiring a bolt takes constant time, and you can retire bolts while looping over
+    the list, as long as you loop BACKWARDS.
+    
+    INSTANCE ATTRIBUTES:
+        _live:  the bolts currently on screen, in no particular order [list of Bolt]
+        _free:  the retired bolts ready to be fired again [list of Bolt]
+        _count: the number of bolts on screen for each name [dict of str to int]
+    """
+    
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getBolts(self):
+        """
+        Returns: the list of bolts on screen
+        
+        This is the list used by the pool, so do not modify it.  Use fire and retire
+        instead.
+        """
+        return self._live
+    
+    def count(self,name):
+        """
+        Returns: the number of bolts on screen fired by name
+        
+        Parameter name: who fired the bolts
+        Precondition: name is 'player' or 'alien'
+        """
+        return self._count[name]
+    
+    def __len__(self):
+        """
+        Returns: the number of bolts on screen
+        """
+        return len(self._live)
+    
+    
+    # INITIALIZER TO CREATE THE BOLTS
+    def __init__(self,size=4):
+        """
+        Initializes a pool with size retired bolts
+        
+        Parameter size: the number of bolts to create up front
+        Precondition: size is an int >= 0
+        """
+        self._live = []
+        self._free = [Bolt() for _ in range(size)]
+        self._count = {'player': 0, 'alien': 0}
+    
+    
+    # METHODS TO FIRE AND RETIRE BOLTS
+    def fire(self,x,y,name):
+        """
+        Returns: a bolt on screen at the given position
+        
+        Parameter x: the x-coordinate of the bolt center
+        Precondition: x is an int or float
+        
+        Parameter y: the y-coordinate of the bolt center
+        Precondition: y is an int or float
+        
+        Parameter name: who fired the bolt
+        Precondition: name is 'player' or 'alien'
+        """
+        bolt = self._free.pop() if self._free else Bolt()
+        bolt.fire(x,y,name)
+        bolt._slot = len(self._live)
+        self._live.append(bolt)
+        self._count[name] += 1
+        return bolt
+    
+    def retire(self,bolt):
+        """
+        Removes a bolt from the screen
+        
+        Parameter bolt: the bolt to retire
+        Precondition: bolt is a Bolt on screen (from this pool)
+        """
+        pos = bolt._slot
+        moved = self._live[-1]
+        self._live[pos] = moved
+        moved._slot = pos
+        self._live.pop()
+        bolt._slot = -1
+        self._count[bolt.name] -= 1
+        self._free.append(bolt)
+    
+    def retireAll(self):
+        """
+        Removes every bolt from the screen
+        """
+        for bolt in self._live:
+            bolt._slot = -1
+            self._free.append(bolt)
+        self._live = []
+        self._count = {'player': 0, 'alien': 0}
+
+
+class Formation(object):
+    """
+    A class to represent the grid of aliens in a wave.
+    
+    The aliens always march together, so there is no reason to move them one at a
+    time.  Instead, this class stores the state of every alien in NumPy arrays (one
+    array per attribute, with one entry per grid cell).  Marching, dropping and 
+    speeding up the aliens are each a single vectorized operation.
+    
+    The formation does not draw itself.  Instead, getState returns a snapshot of the
+    arrays, which WaveDisplay draws with a single sprite batch.  The snapshot is only
+    copied again after the aliens move or die, so it is usually the same object as
+    the last time, and the display can skip it.
+    
+    Row 0 is the top row, and column 0 is the leftmost column (the same as the old
+    2d list of aliens).  Dead aliens keep moving with the formation, so the grid
+    always stays regular.
+    
+    INSTANCE ATTRIBUTES:
+        _rows:   the number of rows in the grid [int > 0]
+        _cols:   the number of columns in the grid [int > 0]
+        _x:      the x-coordinate of each alien center [rows x cols array of float]
+        _y:      the y-coordinate of each alien center [rows x cols array of float]
+        _alive:  whether each alien is still alive [rows x cols array of bool]
+        _speed:  the seconds between steps for each alien [rows x cols array of float]
+        _image:  the index into ALIEN_IMAGES for each alien [read-only rows x cols 
+                 array of int]
+        _state:  the snapshot returned by getState, or None if the aliens have moved
+                 or died since it was made [tuple or None]
+    
+    The formation also keeps track of which cells are occupied.  These attributes are
+    only updated when an alien dies, so every query about them takes constant time.
+        _count:   the number of living aliens [int >= 0]
+        _inCol:   the number of living aliens in each column [list of int >= 0]
+        _bottom:  the lowest row with a living alien in each column, or -1 if the 
+                  column is empty [list of int]
+        _first:   the leftmost column with a living alien, or -1 if there are none [int]
+        _last:    the rightmost column with a living alien, or -1 if there are none [int]
+        _columns: the columns with a living alien, in no particular order [list of int]
+        _slot:    the position of each column in _columns, or -1 if the column is 
+                  empty [list of int]
+    """
+    
+    # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
+    def getRows(self):
+        """
+        Returns: the number of rows in the grid
+        """
+        return self._rows
+    
+    def getCols(self):
+        """
+        Returns: the number of columns in the grid
+        """
+        return self._cols
+    
+    def getSpeed(self):
+        """
+        Returns: the number of seconds between steps of the formation
+        
+        The aliens all march together, so this is the speed of any living alien.  If 
+        there are no living aliens, it is the speed the formation had (every cell is
+        sped up together, so the top left cell has it).
+        """
+        if self._first == -1:
+            return float(self._speed[0,0])
+        return float(self._speed[self._bottom[self._first],self._first])
+    
+    def getPosition(self,row,col):
+        """
+        Returns: the (x,y) center of the alien at the given cell
+        
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..rows-1
+        
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..cols-1
+        """
+        return (float(self._x[row,col]),float(self._y[row,col]))
+    
+    def isAlive(self,row,col):
+        """
+        Returns: True if the alien at the given cell is alive
+        
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..rows-1
+        
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..cols-1
+        """
+        return bool(self._alive[row,col])
+    
+    def isColumnEmpty(self,col):
+        """
+        Returns: True if there are no living aliens in the given column
+        
+        Parameter col: the column to check
+        Precondition: col is an int in 0..cols-1
+        """
+        return self._inCol[col] == 0
+    
+    def getBottom(self,col):
+        """
+        Returns: the lowest row with a living alien in the column, or -1 if it is empty
+        
+        Parameter col: the column to check
+        Precondition: col is an int in 0..cols-1
+        """
+        return self._bottom[col]
+    
+    def pickShooter(self,rng):
+        """
+        Returns: the (row,col) of a random alien at the bottom of a nonempty column
+        
+        Every nonempty column is equally likely.  This takes the same time no matter
+        how many columns are empty.
+        
+        Parameter rng: the random number generator to use
+        Precondition: rng is a random.Random and there is at least one living alien
+        """
+        col = self._columns[rng.randrange(len(self._columns))]
+        return (self._bottom[col],col)
+    
+    def count(self):
+        """
+        Returns: the number of living aliens
+        """
+        return self._count
+    
+    def getState(self):
+        """
+        Returns: a snapshot (x,y,alive,image) of the formation for drawing
+        
+        The snapshot holds read-only copies of the arrays _x, _y, _alive and _image, 
+        so it does not change when the aliens do.  It is only copied again after the 
+        aliens move or die.
+        """
+        if self._state is None:
+            x = self._x.copy()
+            y = self._y.copy()
+            alive = self._alive.copy()
+            for array in (x,y,alive):
+                array.flags.writeable = False
+            self._state = (x,y,alive,self._image)
+        return self._state
+    
+    def left(self):
+        """
+        Returns: the left edge of the leftmost living alien
+        
+        If there are no living aliens, this is the left edge of the whole grid.
+        """
+        # Every alien in a column has the same x-coordinate
+        col = 0 if self._first == -1 else self._first
+        return float(self._x[0,col])-ALIEN_WIDTH/2
+    
+    def right(self):
+        """
+        Returns: the right edge of the rightmost living alien
+        
+        If there are no living aliens, this is the right edge of the whole grid.
+        """
+        col = self._cols-1 if self._last == -1 else self._last
+        return float(self._x[0,col])+ALIEN_WIDTH/2
+    
+    
+    # INITIALIZER TO CREATE THE GRID OF ALIENS
+    def __init__(self,rows=ALIEN_ROWS,cols=ALIENS_IN_ROW):
+        """
+        Initializes a full grid of aliens at their starting positions
+        
+        Parameter rows: the number of rows of aliens
+        Precondition: rows is an int > 0
+        
+        Parameter cols: the number of aliens in each row
+        Precondition: cols is an int > 0
+        """
+        self._rows = rows
+        self._cols = cols
+        self._x = np.empty((rows,cols))
+        self._y = np.empty((rows,cols))
+        self.reset()
+        self._alive = np.ones((rows,cols),dtype=bool)
+        self._count = rows*cols
+        self._inCol = [rows]*cols
+        self._bottom = [rows-1]*cols
+        self._first = 0
+        self._last = cols-1
+        self._columns = list(range(cols))
+        self._slot = list(range(cols))
+        self._speed = np.full((rows,cols),ALIEN_SPEED)
+        
+        # The images change every two rows, counting up from the bottom row
+        image = (rows-1-np.arange(rows))//2 % len(ALIEN_IMAGES)
+        self._image = np.repeat(image[:,np.newaxis],cols,axis=1)
+        self._image.flags.writeable = False
+        self._state = None
+    
+    
+    # METHODS TO MOVE THE FORMATION
+    def reset(self):
+        """
+        Moves every alien back to its starting position
+        """
+        cols = np.arange(self._cols)
+        rows = np.arange(self._rows)
+        self._x[:,:] = (cols+1)*(ALIEN_H_SEP+ALIEN_WIDTH/2)+cols*ALIEN_WIDTH/2
+        self._y[:,:] = (GAME_HEIGHT-ALIEN_CEILING-ALIEN_HEIGHT/2
+                        -rows*(ALIEN_HEIGHT+ALIEN_V_SEP))[:,np.newaxis]
+        self._state = None
+    
+    def march(self,dx):
+        """
+        Moves every alien horizontally
+        
+        Parameter dx: the distance to move (positive is right)
+        Precondition: dx is an int or float
+        """
+        self._x += dx
+        self._state = None
+    
+    def drop(self,dy):
+        """
+        Moves every alien down
+        
+        Parameter dy: the distance to move (positive is down)
+        Precondition: dy is an int or float
+        """
+        self._y -= dy
+        self._state = None
+    
+    def speedUp(self,factor):
+        """
+        Multiplies the number of seconds between steps of every alien by factor
+        
+        Parameter factor: the factor to multiply by
+        Precondition: factor is a float in 0..1
+        """
+        self._speed *= factor
+    
+    def kill(self,row,col):
+        """
+        Removes the alien at the given cell
+        
+        Parameter row: the row of the alien
+        Precondition: row is an int in 0..rows-1
+        
+        Parameter col: the column of the alien
+        Precondition: col is an int in 0..cols-1
+        """
+        if not self._alive[row,col]:
+            return
+        self._alive[row,col] = False
+        self._state = None
+        
+        self._count -= 1
+        self._inCol[col] -= 1
+        if self._inCol[col] == 0:
+            self._bottom[col] = -1
+            self._removeColumn(col)
+        elif self._bottom[col] == row:
+            while not self._alive[row,col]:
+                row -= 1
+            self._bottom[col] = row
+        
+        # Move the edges inward past any empty columns
+        if self._count == 0:
+            self._first = -1
+            self._last = -1
+            return
+        while self._inCol[self._first] == 0:
+            self._first += 1
+        while self._inCol[self._last] == 0:
+            self._last -= 1
+    
+    def _removeColumn(self,col):
+        """
+        Removes an empty column from the list of nonempty columns
+        
+        The last column in the list is moved into its place, so this takes constant time.
+        
+        Parameter col: the column to remove
+        Precondition: col is an int in 0..cols-1 and is in the list of nonempty columns
+        """
+        pos = self._slot[col]
+        moved = self._columns[-1]
+        self._columns[pos] = moved
+        self._slot[moved] = pos
+        self._columns.pop()
+        self._slot[col] = -1
+    
+    
+    # METHOD TO CHECK FOR COLLISION
+    def collides(self,bolt):
+        """
+        Returns: the (row,col) of the alien hit by the bolt, or None if there is none
+        
+        Only bolts fired by the player can hit an alien.  A bolt hits an alien if any
+        corner of the bolt is inside of the alien.  If the bolt hits more than one
+        alien, this returns the first one (top to bottom, left to right).
+        
+        The grid is regular, so each corner of the bolt can only be inside of the
+        alien in the nearest grid cell.  We compute that cell directly from the 
+        position of the top left alien, so this method takes the same time no matter 
+        how many aliens there are.
+        
+        Parameter bolt: The laser bolt to check
+        Precondition: bolt is of class Bolt
+        """
+        if bolt.name != 'player':
+            return None
+        
+        x0 = float(self._x[0,0])
+        y0 = float(self._y[0,0])
+        top = bolt.y+bolt.height/2
+        bottom = bolt.y-bolt.height/2
+        
+        hit = None
+        for px, py in ((bolt.left,top),(bolt.left,bottom),(bolt.right,top),(bolt.right,bottom)):
+            row = int(round((y0-py)/(ALIEN_HEIGHT+ALIEN_V_SEP)))
+            col = int(round((px-x0)/(ALIEN_WIDTH+ALIEN_H_SEP)))
+            if (0 <= row < self._rows and 0 <= col < self._cols and self._alive[row,col]
+                and abs(px-self._x[row,col]) < ALIEN_WIDTH/2
+                and abs(py-self._y[row,col]) < ALIEN_HEIGHT/2):
+                if hit is None or (row,col) < hit:
+                    hit = (row,col)
+        return hit
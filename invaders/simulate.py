@@ -0,0 +1,223 @@
+"""
+Headless simulation driver for Alien Invaders
+
+This module plays a single wave of Alien Invaders without Kivy.  There is no window
+and no animation loop.  Instead, a Simulation object steps Wave.update in a tight loop
+with a fixed time step, using a virtual clock and a scripted input handler.  This lets
+us run thousands of frames per second for regression and balance testing.
+
+To run a simulation from the command line, type
+
+    python invaders/simulate.py [rows [perrow [speed]]] [--frames N] [--seed S]
+
+The optional rows, perrow and speed arguments are the same as for the game (see
+consts.py), and may come before or after the options.  The seed controls both the wave
+and the (random) autopilot that plays it, so the same seed always produces the same game.
+
+This module must be imported BEFORE anything imports game2d, as that is when game2d
+decides whether or not to use Kivy.
+
+Jason Huang
+October 18, 2026
+"""
+import os
+import sys
+import argparse
+os.environ.setdefault('GAME2D_HEADLESS','1')
+
+
+def parse_arguments():
+    """
+    Returns: the command line arguments, parsed
+    """
+    parser = argparse.ArgumentParser(description='Simulate a wave of Alien Invaders.')
+    parser.add_argument('rows',nargs='?',help='the number of rows of aliens (1..10)')
+    parser.add_argument('perrow',nargs='?',help='the number of aliens per row (1..15)')
+    parser.add_argument('speed',nargs='?',help='the seconds between alien steps (0..3)')
+    parser.add_argument('--frames',type=int,default=100000,help='the maximum number of frames')
+    parser.add_argument('--seed',type=int,default=0,help='the seed for the wave and autopilot')
+    return parser.parse_args()
+
+
+# consts.py reads the wave size from sys.argv by position when it is imported.  So a 
+# script parses the command line first, and leaves only the wave size for consts.py.
+if __name__ == '__main__':
+    ARGUMENTS = parse_arguments()
+    sys.argv[1:] = [value for value in (ARGUMENTS.rows,ARGUMENTS.perrow,ARGUMENTS.speed)
+                    if value is not None]
+
+import time
+import random
+from consts import *
+from game2d import *
+from game2d.headless import VirtualClock, VirtualInput
+from wave import *
+
+# The simulation needs the Images folder, but there is no GameApp to find it for us
+GameApp.set_resource_path(os.path.dirname(os.path.abspath(__file__)))
+GameApp.build_atlas()
+
+# The default length of a simulated frame in seconds
+FRAME_TIME = 1.0/60
+
+
+class Autopilot(object):
+    """
+    A class to play the game with random (but repeatable) key presses.
+
+    Every few frames the autopilot picks a new direction to hold (left, right or
+    neither), and it holds down the fire key some fraction of the time.  It is not a
+    good player, but it is a deterministic one.
+
+    INSTANCE ATTRIBUTES:
+        _random:   the random number generator for the key presses [random.Random]
+        _hold:     the number of frames left before changing direction [int >= 0]
+        _fire:     the probability of holding the fire key in a frame [float in 0..1]
+    """
+
+    def __init__(self,seed=None,fire=0.5):
+        """
+        Initializes an autopilot
+
+        Parameter seed: the seed for the key presses
+        Precondition: seed is None or an int
+
+        Parameter fire: the probability of holding the fire key in a frame
+        Precondition: fire is a float in 0..1
+        """
+        self._random = random.Random(seed)
+        self._hold = 0
+        self._fire = fire
+
+    def drive(self,input):
+        """
+        Presses and releases keys for the next frame
+
+        Parameter input: the input handler to press keys on
+        Precondition: input is a VirtualInput
+        """
+        if self._hold == 0:
+            input.release('left','right')
+            choice = self._random.randint(0,2)
+            if choice == 1:
+                input.press('left')
+            elif choice == 2:
+                input.press('right')
+            self._hold = self._random.randint(5,30)
+        self._hold -= 1
+
+        if self._random.random() < self._fire:
+            input.press('spacebar')
+        else:
+            input.release('spacebar')
+
+
+class Simulation(object):
+    """
+    A class to run a single wave without a window.
+
+    Each call to step advances the wave by one frame of exactly dt seconds, no matter
+    how long the frame actually takes to compute.
+
+    INSTANCE ATTRIBUTES:
+        _wave:   the wave being simulated [Wave]
+        _input:  the scripted input handed to the wave [VirtualInput]
+        _clock:  the simulated time [VirtualClock]
+        _pilot:  the player pressing the keys [Autopilot, or None for no player]
+        _dt:     the length of a frame in seconds [float > 0]
+    """
+
+    # GETTERS AND SETTERS
+    def getWave(self):
+        """
+        Returns: the wave being simulated
+        """
+        return self._wave
+
+    def getInput(self):
+        """
+        Returns: the input handler given to the wave
+        """
+        return self._input
+
+    def getClock(self):
+        """
+        Returns: the simulation clock
+        """
+        return self._clock
+
+
+    # INITIALIZER
+    def __init__(self,seed=None,dt=FRAME_TIME,pilot=True):
+        """
+        Initializes a new simulation
+
+        Parameter seed: the seed for the wave and the autopilot
+        Precondition: seed is None or an int
+
+        Parameter dt: the length of a frame in seconds
+        Precondition: dt is a float > 0
+
+        Parameter pilot: whether to play with the autopilot (otherwise no keys are
+        pressed unless you press them on the input handler yourself)
+        Precondition: pilot is a bool
+        """
+        self._wave  = Wave(seed)
+        self._input = VirtualInput()
+        self._clock = VirtualClock()
+        self._pilot = Autopilot(seed) if pilot else None
+        self._dt = dt
+
+
+    # METHODS TO RUN THE SIMULATION
+    def isOver(self):
+        """
+        Returns: True if the wave has been won or lost
+        """
+        return self._wave.getLives() == 0 or self._wave.aliensRemaining() == 0
+
+    def step(self):
+        """
+        Advances the simulation by a single frame
+        """
+        if self._pilot is not None:
+            self._pilot.drive(self._input)
+        self._wave.update(self._input,self._dt)
+        self._clock.tick(self._dt)
+
+    def run(self,frames):
+        """
+        Returns: a dictionary of statistics after running the simulation
+
+        The simulation runs for the given number of frames, or until the wave is over,
+        whichever comes first.
+
+        Parameter frames: the maximum number of frames to run
+        Precondition: frames is an int >= 0
+        """
+        start = time.perf_counter()
+        count = 0
+        while count < frames and not self.isOver():
+            self.step()
+            count += 1
+        wall = time.perf_counter()-start
+
+        return {'frames': count, 'simulated': self._clock.time, 'wall': wall,
+                'fps': count/wall if wall > 0 else float('inf'),
+                'lives': self._wave.getLives(), 'aliens': self._wave.aliensRemaining()}
+
+
+def main(args):
+    """
+    Runs a simulation with the command line arguments and prints the results
+
+    Parameter args: the command line arguments
+    Precondition: args is the result of parse_arguments
+    """
+    stats = Simulation(args.seed).run(args.frames)
+    print('%(frames)d frames (%(simulated).1f simulated seconds) in %(wall).3f seconds' % stats)
+    print('%(fps).0f frames per second; %(lives)d lives and %(aliens)d aliens left' % stats)
+
+
+if __name__ == '__main__':
+    main(ARGUMENTS)
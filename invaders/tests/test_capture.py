@@ -0,0 +1,122 @@
+"""
+Tests for recording the frames of a headless game
+
+These tests record a game of Alien Invaders.  They check that the recorded frames are
+the frames on the view, and that recording does not slow down the animation loop, as
+the frames are drawn on the writer thread.
+
+To run the tests from the command line, type
+
+    python -m pytest invaders/tests
+
+Jason Huang
+October 18, 2026
+"""
+import os
+import sys
+import time
+os.environ.setdefault('GAME2D_HEADLESS','1')
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# consts.py reads the wave size from the command line, which is pytest's here
+sys.argv[1:] = []
+
+import statistics
+from consts import *
+from game2d import *
+from game2d.headless import Clock
+from app import Invaders
+
+# The number of frames to time with and without recording
+FRAMES = 60
+
+# How much slower (in seconds) a recorded frame may be, as a part of the frame budget
+SLOWDOWN = 0.1/60
+
+# The game, shared by the tests as every game runs on the same clock
+_game = None
+
+
+class FrameList(FrameWriter):
+    """
+    A class to keep the frames written in a list.
+    """
+
+    def __init__(self):
+        """
+        Creates an empty list of frames.
+        """
+        self.frames = []
+
+    def write(self,index,pixels):
+        """
+        Adds a copy of the frame to the list.
+        """
+        self.frames.append(pixels.copy())
+
+
+def get_game():
+    """
+    Returns: a running headless game, in the middle of a wave
+    """
+    global _game
+    if _game is None:
+        _game = Invaders(width=GAME_WIDTH,height=GAME_HEIGHT)
+        _game.run()
+        play(3)
+        _game.input._capture_key(None,(0,'s'),'s',[])
+        play(3)
+        _game.input._release_key(None,(0,'s'))
+        _game.input._capture_key(None,(0,'spacebar'),'',[])
+        play(30)
+    return _game
+
+
+def play(frames,paced=False):
+    """
+    Returns: the seconds taken by each frame of the game
+
+    Parameter frames: the number of frames to play
+    Precondition: frames is an int >= 0
+
+    Parameter paced: whether to wait out the rest of each frame, like a real loop
+    Precondition: paced is a bool
+    """
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        Clock.tick(1/60)
+        times.append(time.perf_counter()-start)
+        if paced:
+            time.sleep(max(1/60-times[-1],0))
+    return times
+
+
+def test_frames():
+    game = get_game()
+    writer = FrameList()
+    capture = game.start_capture(writer,'block')
+    play(3)
+    game.stop_capture()
+    assert capture.captured == 3
+    assert capture.dropped == 0
+    assert len(writer.frames) == 3
+
+    # The last frame is still on the view
+    game.view.backend = SoftwareRenderer(game.view.width,game.view.height)
+    try:
+        assert (writer.frames[-1] == game.view.grab()).all()
+    finally:
+        game.view.backend = None
+
+
+def test_frame_time():
+    game = get_game()
+    plain = statistics.median(play(FRAMES,True))
+    capture = game.start_capture(FrameList())
+    try:
+        recorded = statistics.median(play(FRAMES,True))
+    finally:
+        game.stop_capture()
+    assert capture.written > 0
+    assert recorded-plain < SLOWDOWN
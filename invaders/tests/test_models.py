@@ -0,0 +1,156 @@
+"""
+Unit tests for the bolt pool and the alien formation
+
+These tests check the bookkeeping that the wave relies on: firing and retiring bolts
+(also while looping over them), collisions with the formation, and picking a shooter
+as the aliens die.
+
+To run the tests from the command line, type
+
+    python -m pytest invaders/tests
+
+Jason Huang
+October 18, 2026
+"""
+import os
+import sys
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# consts.py reads the wave size from the command line, which is pytest's here
+sys.argv[1:] = []
+
+import random
+import simulate
+from consts import *
+from models import *
+from wave import Wave
+from game2d.headless import VirtualInput
+
+
+def test_fire():
+    pool = BoltPool(2)
+    bolt = pool.fire(10,20,'player')
+    assert (bolt.x,bolt.y) == (10,20)
+    assert bolt.past == (10,20)
+    assert bolt.isPlayerBolt()
+    assert len(pool) == 1
+    assert pool.count('player') == 1
+    assert pool.count('alien') == 0
+    assert pool.getBolts() == [bolt]
+
+
+def test_reuse():
+    pool = BoltPool(1)
+    first = pool.fire(0,0,'player')
+    pool.retire(first)
+    assert len(pool) == 0
+    assert pool.count('player') == 0
+    # A retired bolt is fired again instead of making a new one
+    again = pool.fire(5,5,'alien')
+    assert again is first
+    assert again.isAlienBolt()
+    # The pool only grows when every bolt is on screen
+    extra = pool.fire(6,6,'alien')
+    assert extra is not first
+    assert pool.count('alien') == 2
+
+
+def test_retire_backwards():
+    pool = BoltPool()
+    for pos in range(6):
+        pool.fire(pos,0,'player' if pos % 2 == 0 else 'alien')
+    bolts = pool.getBolts()
+    for pos in range(len(bolts)-1,-1,-1):
+        if bolts[pos].isPlayerBolt():
+            pool.retire(bolts[pos])
+    assert sorted(bolt.x for bolt in pool.getBolts()) == [1,3,5]
+    assert pool.count('player') == 0
+    assert pool.count('alien') == 3
+    # Each bolt still knows its place in the list
+    for pos in range(len(bolts)):
+        assert bolts[pos]._slot == pos
+
+
+def test_retire_all():
+    pool = BoltPool()
+    for pos in range(3):
+        pool.fire(pos,0,'alien')
+    pool.retireAll()
+    assert len(pool) == 0
+    assert pool.count('alien') == 0
+    assert pool.fire(0,0,'player')._slot == 0
+
+
+def test_collides():
+    aliens = Formation(3,4)
+    x, y = aliens.getPosition(1,2)
+    bolt = Bolt()
+    bolt.fire(x,y,'player')
+    assert aliens.collides(bolt) == (1,2)
+    # Alien bolts pass through the aliens
+    bolt.fire(x,y,'alien')
+    assert aliens.collides(bolt) is None
+    # So does a bolt between two columns
+    bolt.fire(x+(ALIEN_WIDTH+ALIEN_H_SEP)/2,y,'player')
+    assert aliens.collides(bolt) is None
+    # And a bolt where an alien has died
+    aliens.kill(1,2)
+    bolt.fire(x,y,'player')
+    assert aliens.collides(bolt) is None
+
+
+def test_collides_edge():
+    aliens = Formation(3,4)
+    x, y = aliens.getPosition(0,0)
+    bolt = Bolt()
+    # The corner of the bolt is just inside of the alien
+    bolt.fire(x-ALIEN_WIDTH/2-BOLT_WIDTH/2+1,y,'player')
+    assert aliens.collides(bolt) == (0,0)
+    bolt.fire(x-ALIEN_WIDTH/2-BOLT_WIDTH/2-1,y,'player')
+    assert aliens.collides(bolt) is None
+
+
+def test_shooter():
+    aliens = Formation(3,4)
+    rng = random.Random(0)
+    for col in range(4):
+        assert aliens.getBottom(col) == 2
+    aliens.kill(2,1)
+    assert aliens.getBottom(1) == 1
+    for row in range(3):
+        for col in range(4):
+            if (row,col) != (0,3):
+                aliens.kill(row,col)
+    assert aliens.count() == 1
+    for _ in range(10):
+        assert aliens.pickShooter(rng) == (0,3)
+
+
+def test_last_alien():
+    aliens = Formation(2,2)
+    speed = aliens.getSpeed()
+    left = aliens.left()
+    right = aliens.right()
+    for row in range(2):
+        for col in range(2):
+            aliens.kill(row,col)
+    assert aliens.count() == 0
+    assert aliens.getSpeed() == speed
+    assert aliens.left() == left
+    assert aliens.right() == right
+
+
+def test_last_alien_wave():
+    wave = Wave(0)
+    aliens = wave._aliens
+    for row in range(aliens.getRows()):
+        for col in range(aliens.getCols()):
+            if (row,col) != (0,0):
+                aliens.kill(row,col)
+    # Hit the last alien in the same update that the aliens are due to shoot
+    x, y = aliens.getPosition(0,0)
+    wave._bolts.fire(x,y-BOLT_SPEED,'player')
+    wave._fireRate = 0
+    wave.update(VirtualInput(),0)
+    assert wave.aliensRemaining() == 0
+    assert wave._bolts.count('alien') == 0
@@ -0,0 +1,103 @@
+"""
+Golden-pixel tests for the software renderer of game2d
+
+These tests draw a small scene with the SoftwareRenderer (headless, so no window is
+needed) and check the colors of known pixels: the inside and outside of a filled box,
+a half transparent box blended over another, an ellipse, and a thick line.
+
+To run the tests from the command line, type
+
+    python -m pytest invaders/tests
+
+Jason Huang
+October 18, 2026
+"""
+import os
+import sys
+os.environ.setdefault('GAME2D_HEADLESS','1')
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from game2d import *
+
+# The size of the scene
+WIDTH  = 40
+HEIGHT = 30
+
+WHITE  = (255,255,255,255)
+RED    = (255,0,0,255)
+GREEN  = (0,255,0,255)
+BLACK  = (0,0,0,255)
+
+
+def render_scene():
+    """
+    Returns: the pixels of the test scene, with the top row first
+
+    The scene is a red box with a half transparent blue box over its right side, a
+    green circle, and a black line two pixels thick, all on a white background.
+    """
+    view = GView()
+    view.size = (WIDTH,HEIGHT)
+    view._reset()
+    view.backend = SoftwareRenderer(WIDTH,HEIGHT)
+    view.add(GRectangle(x=10,y=10,width=8,height=6,fillcolor='red'))
+    view.add(GRectangle(x=14,y=10,width=8,height=6,fillcolor=(0,0,1,0.5)))
+    view.add(GEllipse(x=30,y=20,width=10,height=10,fillcolor='green'))
+    view.add(GPath(points=[0,25,20,25],linewidth=2,linecolor='black'))
+    return view.render()
+
+
+def pixel(pixels,x,y):
+    """
+    Returns: the RGBA tuple of the pixel at (x,y), with y going up from the bottom
+
+    Parameter pixels: the rendered scene
+    Precondition: pixels is a HEIGHT x WIDTH x 4 array of uint8 with the top row first
+
+    Parameter x: the column of the pixel
+    Precondition: x is an int in 0..WIDTH-1
+
+    Parameter y: the row of the pixel, from the bottom
+    Precondition: y is an int in 0..HEIGHT-1
+    """
+    return tuple(int(value) for value in pixels[HEIGHT-1-y,x])
+
+
+def test_shape():
+    pixels = render_scene()
+    assert pixels.shape == (HEIGHT,WIDTH,4)
+    assert pixels.dtype == np.uint8
+
+
+def test_box():
+    pixels = render_scene()
+    assert pixel(pixels,7,10) == RED
+    assert pixel(pixels,7,12) == RED
+    assert pixel(pixels,5,10) == WHITE
+    assert pixel(pixels,7,14) == WHITE
+
+
+def test_blend():
+    pixels = render_scene()
+    # Half blue over red, and half blue over white
+    assert pixel(pixels,10,10) == (127,0,127,255)
+    assert pixel(pixels,16,10) == (127,127,255,255)
+    assert pixel(pixels,20,10) == WHITE
+
+
+def test_ellipse():
+    pixels = render_scene()
+    assert pixel(pixels,30,20) == GREEN
+    assert pixel(pixels,26,16) == GREEN
+    # The corner of the bounding box is outside of the circle
+    assert pixel(pixels,25,15) == WHITE
+
+
+def test_stroke():
+    pixels = render_scene()
+    assert pixel(pixels,5,24) == BLACK
+    assert pixel(pixels,5,25) == BLACK
+    assert pixel(pixels,5,26) == WHITE
+    assert pixel(pixels,5,23) == WHITE
+    assert pixel(pixels,25,25) == WHITE
@@ -0,0 +1,44 @@
+"""
+Regression tests for seeded headless simulations
+
+A seeded simulation plays the same game every time.  These tests pin how a few seeded
+games of the default wave end, so a change to the gameplay that alters the outcome
+shows up here.  If a change is meant to alter the outcome, update the numbers (from
+simulate.py) in the same commit and say why.
+
+To run the tests from the command line, type
+
+    python -m pytest invaders/tests
+
+Jason Huang
+October 18, 2026
+"""
+import os
+import sys
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# consts.py reads the wave size from the command line, which is pytest's here
+sys.argv[1:] = []
+
+import simulate
+from consts import *
+
+# The seed, and then the frames, lives and aliens left when the wave ends
+OUTCOMES = [(1,2872,0,30), (2,4237,0,15), (3,5003,0,9)]
+
+
+def test_default_wave():
+    assert (ALIEN_ROWS,ALIENS_IN_ROW) == (5,12)
+
+
+def test_outcomes():
+    for seed, frames, lives, aliens in OUTCOMES:
+        stats = simulate.Simulation(seed).run(100000)
+        assert (stats['frames'],stats['lives'],stats['aliens']) == (frames,lives,aliens)
+
+
+def test_repeatable():
+    first  = simulate.Simulation(7).run(500)
+    second = simulate.Simulation(7).run(500)
+    for key in ('frames','simulated','lives','aliens'):
+        assert first[key] == second[key]
@@ -0,0 +1,124 @@
+"""
+Unit tests for the snapshot buffer and the simulation thread of game2d
+
+These tests check that snapshots are handed from one thread to another whole and in
+order, and that the simulation thread can wait to be woken and reports its errors.
+
+To run the tests from the command line, type
+
+    python -m pytest invaders/tests
+
+Jason Huang
+October 18, 2026
+"""
+import os
+import sys
+import threading
+import time
+os.environ.setdefault('GAME2D_HEADLESS','1')
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game2d import *
+
+# The most seconds to wait for the other thread
+TIMEOUT = 5.0
+
+
+def wait_for(condition):
+    """
+    Returns: True if condition() became True within TIMEOUT seconds
+
+    Parameter condition: the condition to wait for
+    Precondition: condition is a function with no arguments that returns a bool
+    """
+    end = time.perf_counter()+TIMEOUT
+    while not condition():
+        if time.perf_counter() > end:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_latest_unchanged():
+    buffer = SnapshotBuffer('start')
+    assert buffer.latest() == 'start'
+    assert not buffer.fresh
+    snapshot = ('a',1)
+    buffer.publish(snapshot)
+    assert buffer.fresh
+    assert buffer.latest() is snapshot
+    # Nothing new, so the same snapshot again
+    assert not buffer.fresh
+    assert buffer.latest() is snapshot
+    assert buffer.latest() is snapshot
+    assert buffer.published == 1
+
+
+def test_latest_newest():
+    buffer = SnapshotBuffer()
+    for value in range(5):
+        buffer.publish(value)
+    assert buffer.latest() == 4
+    assert buffer.published == 5
+
+
+def test_slots_apart():
+    buffer = SnapshotBuffer((0,0))
+    count = 20000
+    def write():
+        for value in range(1,count+1):
+            buffer.publish((value,-value))
+    writer = threading.Thread(target=write)
+    writer.start()
+
+    last = 0
+    while writer.is_alive() or buffer.fresh:
+        value, check = buffer.latest()
+        # The slot being read is never the one being written (or about to be)
+        with buffer._lock:
+            assert sorted((buffer._back,buffer._ready,buffer._front)) == [0,1,2]
+        assert value == -check
+        assert value >= last
+        last = value
+    writer.join()
+    assert last == count
+
+
+def test_wake():
+    calls = []
+    worker = SimulationThread(lambda : calls.append(1),None)
+    worker.start()
+    try:
+        # The first call is made at once, and then the thread waits to be woken
+        assert wait_for(lambda : worker.ticks == 1)
+        time.sleep(0.05)
+        assert worker.ticks == 1
+        worker.wake()
+        assert wait_for(lambda : worker.ticks == 2)
+        # A new interval starts the calls again
+        worker.interval = 0.001
+        assert wait_for(lambda : worker.ticks > 5)
+    finally:
+        worker.stop()
+    assert not worker.running
+
+
+def test_error():
+    def step():
+        if len(calls) == 2:
+            raise ValueError('boom')
+        calls.append(1)
+    calls = []
+    worker = SimulationThread(step,0.001)
+    worker.start()
+    assert wait_for(lambda : worker.error is not None)
+    assert not worker.running
+    assert isinstance(worker.error,ValueError)
+    try:
+        worker.stop()
+        assert False, 'stop did not raise the error'
+    except ValueError as e:
+        assert str(e) == 'boom'
+    # The error is only raised once
+    assert worker.error is None
+    worker.stop()
@@ -18,6 +18,7 @@ Jason Huang
 from game2d import *
 from consts import *
 from models import *
+import numpy as np
 import random
 
 # PRIMARY RULE: Wave can only access attributes in models.py via getters/setters
@@ -43,9 +44,8 @@ class Wave(object):
     #UPDATE ME LATER
     INSTANCE ATTRIBUTES:
         _ship:   the player ship to control [Ship]
-        _aliens: the 2d list of aliens in the wave [rectangular 2d list of Alien or None] 
-        _bolts:  the laser bolts currently on screen [list of Bolt, possibly empty]
-        _dline:  the defensive line being protected [GPath]
+        _aliens: the grid of aliens in the wave [Formation]
+        _bolts:  the laser bolts currently on screen [BoltPool]
         _lives:  the number of lives left  [int >= 0]
         _time:   The amount of time since the last Alien "step" [number >= 0]
     
@@ -66,6 +66,13 @@ class Wave(object):
             [random int between 1 and BOLT_RATE]
         _alienMove: the amount of times the aliens have moved since the last bolt
             [int >= 0]
+        _random: the random number generator for this wave (used to pick which alien
+            fires and when) [random.Random]
+    
+    A wave does not draw itself.  Its objects only hold numbers (no Kivy objects), and
+    getState returns a snapshot of that state for a WaveDisplay to draw.  That way the
+    wave may be updated on another thread while the snapshot is drawn (see the 
+    attribute threaded of GameApp).
     """
     
     # GETTERS AND SETTERS (ONLY ADD IF YOU NEED THEM)
@@ -79,12 +86,7 @@ class Wave(object):
         """
         Return: the amount of aliens remaining
         """
-        remains = 0
-        for row in self._aliens:
-            for alien in row:
-                if(alien!=None):
-                    remains += 1
-        return remains
+        return self._aliens.count()
     
     def getLives(self):
         """
@@ -92,21 +94,43 @@ class Wave(object):
         """
         return self._lives
     
+    def getState(self):
+        """
+        Returns: a snapshot (ship,bolts,aliens) of the wave for drawing
+        
+        The ship is None if there is no ship, and otherwise a tuple (x,y,pastx,pasty) 
+        of its position now and at the start of the last update.  The bolts are a tuple
+        with such a position tuple for each bolt on screen.  The aliens are the state of
+        the formation (see Formation.getState).  The snapshot only has numbers and 
+        read-only arrays, so it does not change as the wave goes on.
+        """
+        ship = None
+        if(self._ship!=None):
+            ship = (self._ship.x,self._ship.y)+self._ship.past
+        bolts = tuple((bolt.x,bolt.y)+bolt.past for bolt in self._bolts.getBolts())
+        return (ship,bolts,self._aliens.getState())
+    
     
     # INITIALIZER (standard form) TO CREATE SHIP AND ALIENS
-    def __init__(self):
+    def __init__(self,seed=None):
         """
         Initializes a wave
+        
+        Each wave has its own random number generator.  Giving the same seed (and the
+        same input) to two waves makes them play out exactly the same way, which is
+        useful for headless simulations (see simulate.py).
+        
+        Parameter seed: the seed for the random number generator of this wave
+        Precondition: seed is None (seed from the system) or an int
         """
+        self._random = random.Random(seed)
         self._ship = Ship()
-        self._aliens = self._alienlist()
-        self._bolt = []
-        self._dline = GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE]\
-                                ,linewidth=2,linecolor='black')
+        self._aliens = Formation()
+        self._bolts = BoltPool()
         self._lives = SHIP_LIVES
         self._time = 0
         self._alienDirection = 'right'
-        self._fireRate = random.randint(1,BOLT_RATE)
+        self._fireRate = self._random.randint(1,BOLT_RATE)
         self._alienMove = 0
         
         
@@ -123,56 +147,41 @@ class Wave(object):
         """
         if(self._ship == None):
             self._ship = Ship()
+        self._ship.snapshot()
+        for bolt in self._bolts.getBolts():
+            bolt.snapshot()
         self._ship.moveShip(input)
         self._time += dt
         self._moveAlien()
-        if(self._bolt == [] or (self._isAlienBoltPresent() and len(self._bolt)<2)):
+        if(self._bolts.count('player') == 0):
             self._checkFireKey(input)
-        for bolt in self._bolt:
-            if(not bolt.isPlayerBolt() and not bolt.isAlienBolt()):
-                self._checkFireKey(input)
-            elif(bolt.isPlayerBolt() and self._checkCeiling(bolt)):
-                self._bolt.remove(bolt)
-            if(bolt.isAlienBolt() and self._checkFloor(bolt)):
-                self._bolt.remove(bolt)
-            if(bolt.name == 'alien' and self._ship.collides(bolt)):
-                self._bolt=[]
+        # Loop backwards so that retiring a bolt does not skip the next one
+        bolts = self._bolts.getBolts()
+        for pos in range(len(bolts)-1,-1,-1):
+            bolt = bolts[pos]
+            if(bolt.isPlayerBolt()):
+                if(self._checkCeiling(bolt)):
+                    self._retire(bolt)
+                else:
+                    self._alienCollides(bolt)
+            elif(self._checkFloor(bolt)):
+                self._retire(bolt)
+            elif(self._ship.collides(bolt)):
+                self._bolts.retireAll()
                 self._ship = None
-                for y in range(ALIEN_ROWS-1,-1,-1):
-                    for x in range(ALIENS_IN_ROW-1,-1,-1):
-                        if(self._aliens[y][x]!=None):
-                            self._aliens[y][x].x=(x+1)*(ALIEN_H_SEP+ALIEN_WIDTH/2)+x*ALIEN_WIDTH/2
-                            self._aliens[y][x].y=GAME_HEIGHT-ALIEN_CEILING-ALIEN_HEIGHT/2-y*(ALIEN_HEIGHT+ALIEN_V_SEP)
+                self._aliens.reset()
                 self._lives -= 1
-            self._alienCollides(bolt)
+                break
                 
+        # There is no one left to shoot if the last alien died this update
         if((self._alienMove == self._fireRate or self._fireRate==0) and\
-            not self._isAlienBoltPresent()):
+            not self._isAlienBoltPresent() and self._aliens.count() > 0):
             self._alienShoot()
-            self._fireRate = random.randint(0,BOLT_RATE)
+            self._fireRate = self._random.randint(0,BOLT_RATE)
             self._alienMove = 0
         # 18
         
     
-    # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
-    def draw(self,view):
-        """
-        Draws each alien in the list of aliens
-        
-        Parameter view: the game view, used in drawing (see examples from class)
-        Precondition: instance of GView; it is inherited from GameApp
-        """
-        for row in self._aliens:
-            for alien in row:
-                if(alien!=None):
-                    alien.draw(view)
-        self._dline.draw(view)
-        if(self._ship!=None):
-            self._ship.draw(view)
-        for bolt in self._bolt:
-            bolt.draw(view)
-        
-        
     # HELPER METHODS FOR UPDATE
     def _alienCollides(self,bolt):
         """
@@ -182,28 +191,25 @@ class Wave(object):
         Precondition: Bolt class 
         """
         # only checks if the bolt is a player bolt and not an alien bolt
-        if(bolt.name=='player'):
-            for row in range(ALIEN_ROWS):
-                for col in range(ALIENS_IN_ROW):
-                    if(self._aliens[row][col]!=None):
-                        if(self._aliens[row][col].collides(bolt)):
-                            self._aliens[row][col] = None
-                            self._bolt.remove(bolt)
-                            self._alienSpeedUp()
+        hit = self._aliens.collides(bolt)
+        if(hit!=None):
+            self._aliens.kill(hit[0],hit[1])
+            self._retire(bolt)
+            self._alienSpeedUp()
                             
         
     def _alienSpeedUp(self):
-        for row in self._aliens:
-            for alien in row:
-                if(alien!=None):
-                    alien.setSpeed(0.97)
+        """
+        Makes the remaining aliens march faster
+        """
+        self._aliens.speedUp(0.97)
     def _moveAlien(self):
         """
         Moves all the aliens with a helper function
         """
-        alienSpeed=self._alienAlive('right').getSpeed()
-        RisAtBorder = self._alienAlive('right').right + ALIEN_H_WALK > GAME_WIDTH
-        LisAtBorder = self._alienAlive('left').left - ALIEN_H_WALK < 0
+        alienSpeed=self._aliens.getSpeed()
+        RisAtBorder = self._aliens.right() + ALIEN_H_WALK > GAME_WIDTH
+        LisAtBorder = self._aliens.left() - ALIEN_H_WALK < 0
         if(self._time>alienSpeed and not RisAtBorder and self._alienDirection=='right'):
             self._moveAlienHelper(ALIEN_H_WALK,'right')
         elif(self._time>alienSpeed and not LisAtBorder and self._alienDirection == 'left'):
@@ -215,26 +221,6 @@ class Wave(object):
             if RisAtBorder:
                 self._alienDirection = 'left'
                 
-    def _alienAlive(self,direction):
-        """
-        helps with _moveAlien to check which side aliens are alive
-        if side aliens are dead, check the insides
-        
-        Parameter direction: The side to check
-        Precondition: str (either 'right' or 'left')
-        """
-        if(direction == 'right'):
-            for col in range(ALIENS_IN_ROW-1,-1,-1):
-                for row in range(ALIEN_ROWS):
-                    if(self._aliens[row][col]!=None):
-                        return self._aliens[row][col]
-        if(direction == 'left'):
-            for col in range(ALIENS_IN_ROW):
-                for row in range(ALIEN_ROWS):
-                    if(self._aliens[row][col]!=None):
-                        return self._aliens[row][col]
-        
-        
     def _moveAlienHelper(self,x,direction):
         """
         Moves the aliens right, left, or down, depending on where they are
@@ -246,20 +232,11 @@ class Wave(object):
         Precondition: str (either 'right','left','down')
         """
         if direction == 'right':
-            for row in self._aliens:
-                for alien in row:
-                    if(alien!=None):
-                        alien.x += x
+            self._aliens.march(x)
         if direction == 'left':
-            for row in self._aliens:
-                for alien in row:
-                    if(alien!=None):
-                        alien.x -= x
+            self._aliens.march(-x)
         if direction == 'down':
-            for row in self._aliens:
-                for alien in row:
-                    if(alien!=None):
-                        alien.y -= x
+            self._aliens.drop(x)
         self._time = 0
         if(not self._isAlienBoltPresent()):
             self._alienMove += 1
@@ -269,10 +246,7 @@ class Wave(object):
         """
         Checks if there's an alien bolt present on screen
         """
-        for bolt in self._bolt:
-            if bolt.name == 'alien':
-                return True
-        return False
+        return self._bolts.count('alien') > 0
     
 
     # HELPER METHODS 
@@ -281,7 +255,7 @@ class Wave(object):
         Checks if the player clicks 'space' or 'up'
         
         If player clicks either of those, this method will return add a player bolt
-        into the list self._bolt
+        into the pool self._bolts
         
         Parameter input: the user input, used to control the ship and change state
         Precondition: instance of GInput; it is inherited from GameApp
@@ -289,17 +263,24 @@ class Wave(object):
         curr_key = input.is_key_down('spacebar') or input.is_key_down('up')
         
         if(curr_key == True):
-            self._bolt.append(Bolt(x = self._ship.x ,\
-                                   y = self._ship.y + self._ship.height/2,\
-                                   name = 'player'))
+            self._bolts.fire(self._ship.x, self._ship.y + self._ship.height/2, 'player')
+        
+    
+    def _retire(self,bolt):
+        """
+        Takes a bolt off the screen and returns it to the pool self._bolts
         
+        Parameter bolt: the bolt to retire
+        Precondition: bolt is a Bolt on screen
+        """
+        self._bolts.retire(bolt)
     
     def _checkCeiling(self, bolt):
         """
         Returns True if player's bolt passes the ceiling
         
-        Parameter bolt_index: index at which the player's bolt as at in self._bolt
-        Precondition: bolt_index is an int >= 0
+        Parameter bolt: the player's bolt to check (and move)
+        Precondition: bolt is a Bolt
         """
         if(bolt.y - bolt.height/2 > GAME_HEIGHT):
             return True
@@ -312,8 +293,8 @@ class Wave(object):
         """
         Returns True if alien's bolt passes the floor
         
-        Parameter bolt_index: index at which the alien's bolt as at in self._bolt
-        Precondition: bolt_index is an int >= 0
+        Parameter bolt: the alien's bolt to check (and move)
+        Precondition: bolt is a Bolt
         """
         if(bolt.y + bolt.height/2 < 0):
             return True
@@ -324,60 +305,231 @@ class Wave(object):
 
     def _alienShoot(self):
         """
-        Procedure for an alien to create a bolt (put into self._bolt)
+        Procedure for an alien to fire a bolt (from the pool self._bolts)
         """
-        alien_str = self._pickAlien()
-        row = int(alien_str[:alien_str.index(',')])
-        col = int(alien_str[alien_str.index(',')+1:])
-        alien = self._aliens[row][col]
-        self._bolt.append(Bolt(x = alien.x,
-                               y = alien.y - alien.height/2,
-                               name = 'alien'))
+        row, col = self._pickAlien()
+        x, y = self._aliens.getPosition(row,col)
+        self._bolts.fire(x, y - ALIEN_HEIGHT/2, 'alien')
         
     def _pickAlien(self):
         """
-        Return: random alien to fire bolt
+        Return: the (row,col) of a random alien to fire a bolt
+        
+        Chooses a random column that has an alien inside, and picks the lowest 
+        row that has an alien in that column
+        """
+        return self._aliens.pickShooter(self._random)
+
+
+class WaveDisplay(object):
+    """
+    This class draws the snapshots of a wave.
+    
+    The display has its own ship image, bolt rectangles and alien images, which are 
+    only made and changed when it draws a snapshot (see Wave.getState).  It never 
+    looks at the wave itself, so the wave may be updated on another thread while the 
+    display draws.  The same display can draw every wave in a game, as a new wave is
+    just a new snapshot.
+    
+    The display registers its objects with the view (see GView.add) the first time it
+    draws, or if the view has been cleared since.  After that, it only adds and 
+    removes the objects that appeared or disappeared since the last draw.  The aliens
+    are a single sprite batch (in row-major order, so the alien at (row,col) is image
+    row*cols+col), which is only moved when the formation in the snapshot changes.
+    
+    INSTANCE ATTRIBUTES:
+        _dline:  the defense line [GPath]
+        _ship:   the image of the ship [GImage]
+        _onView: whether _ship is registered with the view [bool]
+        _bolts:  the rectangles for the bolts, of which the first _shown are 
+                 registered with the view [list of GRectangle]
+        _shown:  the number of bolts registered with the view [int >= 0]
+        _aliens: the images of the aliens [GSpriteBatch, or None before the first draw]
+        _alive:  which alien images are visible [array of bool, or None]
+        _placed: the formation state last copied to _aliens [tuple or None]
+    """
+    
+    # INITIALIZER TO CREATE THE DRAWING OBJECTS
+    def __init__(self):
+        """
+        Initializes a display with nothing on screen
+        
+        The display must be made on the main thread (such as in the method start of 
+        the application), as it makes Kivy objects and loads the image of the ship.
+        """
+        self._dline = GPath(points=[0,DEFENSE_LINE,GAME_WIDTH,DEFENSE_LINE]\
+                                ,linewidth=2,linecolor='black')
+        self._ship = GImage(width=SHIP_WIDTH,height=SHIP_HEIGHT,source=SHIP_IMAGE)
+        self._onView = False
+        self._bolts = [self._makeBolt() for _ in range(4)]
+        self._shown = 0
+        self._aliens = None
+        self._alive = None
+        self._placed = None
+    
+    
+    # DRAW METHOD TO DRAW THE SHIP, ALIENS, DEFENSIVE LINE AND BOLTS
+    def draw(self,view,state,alpha=1.0):
+        """
+        Draws a snapshot of a wave
+        
+        The aliens march in discrete steps, but the ship and the bolts move a little
+        every update.  They are drawn alpha of the way from where they were at the 
+        start of the last update to where they are now, so that they move smoothly
+        even if the screen refreshes faster than the game updates.
+        
+        Parameter view: the game view, used in drawing (see examples from class)
+        Precondition: instance of GView; it is inherited from GameApp
+        
+        Parameter state: the snapshot of the wave to draw
+        Precondition: state is a tuple returned by Wave.getState
+        
+        Parameter alpha: how far the frame is between the last update and the next
+        Precondition: alpha is a float in 0..1
+        """
+        if(not view.has(self._dline)):
+            self._show(view)
+        ship, bolts, aliens = state
+        self._drawAliens(view,aliens)
+        self._drawShip(view,ship,alpha)
+        self._drawBolts(view,bolts,alpha)
+    
+    
+    # HELPER METHODS FOR DRAW
+    def _show(self,view):
+        """
+        Registers the defense line and the aliens with the view
+        
+        The view has been cleared, so nothing else is registered any more.  The ship 
+        and the bolts are registered again when they are drawn.
+        
+        Parameter view: the game view, used in drawing (see examples from class)
+        Precondition: instance of GView; it is inherited from GameApp
+        """
+        if(self._aliens!=None):
+            view.add(self._aliens)
+        view.add(self._dline)
+        self._onView = False
+        self._shown = 0
+    
+    def _drawAliens(self,view,aliens):
+        """
+        Moves the alien images to the positions in the formation state
+        
+        Nothing happens if the state is the one drawn last time.
+        
+        Parameter view: the game view, used in drawing (see examples from class)
+        Precondition: instance of GView; it is inherited from GameApp
         
-        Chooses random column that has an alien inside
-        picks the lowest row that has an alien in that random column
+        Parameter aliens: the state of the formation
+        Precondition: aliens is a tuple returned by Formation.getState
+        """
+        if(aliens is self._placed):
+            return
+        x, y, alive, image = aliens
+        alive = alive.ravel()
+        if(self._aliens==None or self._aliens.count!=alive.size):
+            self._makeAliens(view,x,y,image)
+        for index in np.flatnonzero(alive!=self._alive):
+            if alive[index]:
+                self._aliens.show(index)
+            else:
+                self._aliens.hide(index)
+        self._alive = alive
+        self._aliens.place(x.ravel(),y.ravel())
+        self._placed = aliens
+    
+    def _makeAliens(self,view,x,y,image):
         """
-        col = random.randint(0,ALIENS_IN_ROW-1)
-        # chooses another col if the first col is empty
-        while(self._isColEmpty(col)): 
-            col = random.randint(0,ALIENS_IN_ROW-1)
-        for row in range(ALIEN_ROWS-1,-1,-1):
-            if(self._aliens[row][col]!=None):
-                return str(row)+','+str(col)
+        Replaces the alien images with a batch for a formation of a new size
+        
+        Parameter view: the game view, used in drawing (see examples from class)
+        Precondition: instance of GView; it is inherited from GameApp
+        
+        Parameter x: the x-coordinate of each alien center
+        Precondition: x is a rows x cols array of float
         
+        Parameter y: the y-coordinate of each alien center
+        Precondition: y is a rows x cols array of float
         
-    def _isColEmpty(self,col):
+        Parameter image: the index into ALIEN_IMAGES for each alien
+        Precondition: image is a rows x cols array of int
+        """
+        if(self._aliens!=None):
+            view.remove(self._aliens)
+        self._aliens = GSpriteBatch()
+        count = image.size
+        self._aliens.extend([ALIEN_IMAGES[index] for index in image.flat],x.ravel(),
+                            y.ravel(),[ALIEN_WIDTH]*count,[ALIEN_HEIGHT]*count)
+        self._alive = np.ones(image.size,dtype=bool)
+        view.add(self._aliens)
+    
+    def _drawShip(self,view,ship,alpha):
         """
-        Return: True if there's no alien in the whole column, False otherwise
+        Moves the ship image, adding it to or removing it from the view as needed
+        
+        Parameter view: the game view, used in drawing (see examples from class)
+        Precondition: instance of GView; it is inherited from GameApp
+        
+        Parameter ship: the position of the ship
+        Precondition: ship is None or a tuple (x,y,pastx,pasty) of numbers
+        
+        Parameter alpha: how far the frame is between the last update and the next
+        Precondition: alpha is a float in 0..1
+        """
+        if(ship==None):
+            if(self._onView):
+                view.remove(self._ship)
+                self._onView = False
+            return
+        self._place(self._ship,ship,alpha)
+        if(not self._onView):
+            view.add(self._ship)
+            self._onView = True
+    
+    def _drawBolts(self,view,bolts,alpha):
         """
-        for row in range(ALIEN_ROWS):
-            if(self._aliens[row][col]!=None):
-                return False
-        return True
+        Moves the bolt rectangles, adding them to or removing them from the view
+        
+        Parameter view: the game view, used in drawing (see examples from class)
+        Precondition: instance of GView; it is inherited from GameApp
+        
+        Parameter bolts: the position of each bolt
+        Precondition: bolts is a tuple of tuples (x,y,pastx,pasty) of numbers
+        
+        Parameter alpha: how far the frame is between the last update and the next
+        Precondition: alpha is a float in 0..1
+        """
+        while(len(self._bolts) < len(bolts)):
+            self._bolts.append(self._makeBolt())
+        for pos in range(len(bolts)):
+            self._place(self._bolts[pos],bolts[pos],alpha)
+            if(pos >= self._shown):
+                view.add(self._bolts[pos])
+        for pos in range(len(bolts),self._shown):
+            view.remove(self._bolts[pos])
+        self._shown = len(bolts)
     
+    def _makeBolt(self):
+        """
+        Returns: a new rectangle to draw a bolt
+        """
+        return GRectangle(width=BOLT_WIDTH,height=BOLT_HEIGHT,fillcolor='red',
+                          linecolor='red')
     
-    # helper function for __init__
-    def _alienlist(self):
-        """
-        Returns: a rectangular 2d list of aliens
-        """
-        list = []
-        partlist = []
-        count = 0 # keeps track of which image to use
-        for y in range(ALIEN_ROWS-1,-1,-1):
-            for x in range(ALIENS_IN_ROW-1,-1,-1):
-                partlist.insert(0,Alien(x=(x+1)*(ALIEN_H_SEP+ALIEN_WIDTH/2)+x*ALIEN_WIDTH/2,
-                    y=GAME_HEIGHT-ALIEN_CEILING-ALIEN_HEIGHT/2-y*(ALIEN_HEIGHT+ALIEN_V_SEP),
-                                         height=ALIEN_HEIGHT,
-                                         width=ALIEN_WIDTH,
-                                         source=ALIEN_IMAGES[count//2%len(ALIEN_IMAGES)]))
-            # increments count after every row filled
-            count += 1
-            list.insert(0,partlist)
-            partlist = []
-        return list
-        
\ No newline at end of file
+    def _place(self,obj,position,alpha):
+        """
+        Moves an object alpha of the way from its past position to its position
+        
+        Parameter obj: the object to move
+        Precondition: obj is a GObject
+        
+        Parameter position: the position now and at the start of the last update
+        Precondition: position is a tuple (x,y,pastx,pasty) of numbers
+        
+        Parameter alpha: how far the frame is between the last update and the next
+        Precondition: alpha is a float in 0..1
+        """
+        x, y, pastx, pasty = position
+        obj.x = pastx+(x-pastx)*alpha
+        obj.y = pasty+(y-pasty)*alpha